@@ -0,0 +1,66 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare two result files of the service benchmarks in tests/benchmarks.
+
+    python -m benchmarks.compare before.json after.json [--threshold 10]
+
+Prints the median of each benchmark in both runs and its change, and exits with 1 when any benchmark is
+slower than the threshold percentage, so a pipeline can fail on a regression.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path: str):
+    """Return the results of a benchmark file keyed by name."""
+    with open(path) as results_file:
+        return {result['name']: result for result in json.load(results_file)['results']}
+
+
+def compare(before: dict, after: dict, threshold: float):
+    """Print the change of every benchmark in both runs and return the names slower than the threshold."""
+    regressions = []
+    print(f'{"benchmark":<50} {"before us":>12} {"after us":>12} {"change":>9}')
+    for name in sorted(before.keys() | after.keys()):
+        if name not in before or name not in after:
+            print(f'{name:<50} {"only in " + ("after" if name in after else "before"):>35}')
+            continue
+        old, new = before[name]['median_us'], after[name]['median_us']
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = ' !'
+        print(f'{name:<50} {old:>12.1f} {new:>12.1f} {change:>+8.1f}%{flag}')
+    return regressions
+
+
+def run():
+    """Compare the files named on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percentage a median may grow by before it counts as a regression')
+    args = parser.parse_args()
+
+    regressions = compare(_load(args.before), _load(args.after), args.threshold)
+    if regressions:
+        print(f'\n{len(regressions)} benchmark(s) slower by more than {args.threshold}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,534 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Generate a synthetic dataset of production size for the auth and notify databases.
+
+At scale 1 the dataset holds a million users, 400 thousand orgs with their memberships, a million entities, most of
+them affiliated to orgs, 200 thousand invitations and, in the notify database, a million notifications. Sizes are
+skewed as in production: most orgs have one to three members, while a few hold thousands of members and
+affiliations, and a small share of the orgs are anonymous (director search) orgs of bcros users.
+
+The rows are written to temporary files and loaded with COPY in foreign key order, with ids following the largest id
+already in each table, so the generator can load into a database which already has data. Every value is drawn from
+random generators seeded from the seed, so a seed loaded into the same database gives the same rows each time. Codes
+are read from the code tables, which the migrations populate, and the authorizations index is rebuilt once at the end
+rather than by its triggers row by row.
+
+    python manage.py generate_data --seed 1 --scale 1 [--notify-database-url URL]
+
+The load test seeds its dataset with the generator, and so do the service benchmarks in tests/benchmarks.
+"""
+import datetime
+import random
+import tempfile
+import uuid
+from array import array
+
+import bcrypt
+
+from auth_api.models import Org as OrgModel
+from auth_api.utils.constants import InvitationStatus
+from auth_api.utils.enums import PaymentType
+from auth_api.utils.roles import ADMIN, MEMBER, OWNER, AccessType, InvitationType, Status, UserStatus
+
+
+PASSCODE = '111111111'
+
+# Row counts at scale 1; memberships and affiliations follow from the org sizes and the affiliated share.
+COUNTS = {
+    'users': 1000000,
+    'orgs': 400000,
+    'entities': 1000000,
+    'invitations': 200000,
+    'notifications': 1000000
+}
+
+LARGE_ORGS = 20
+LARGE_ORG_MEMBERS = 5000
+ANONYMOUS_USER_SHARE = 0.05
+STAFF_USER_SHARE = 0.002
+ANONYMOUS_ORG_SHARE = 0.02
+AFFILIATED_SHARE = 0.7
+LARGE_ORG_AFFILIATION_SHARE = 0.3
+
+# Preferred weights of the codes; codes missing from the code tables are left out, and codes which are not listed get
+# a small weight of their own.
+ORG_TYPES = {'BASIC': 0.75, 'PREMIUM': 0.2, 'IMPLICIT': 0.05}
+ORG_STATUSES = {'ACTIVE': 0.95, 'PENDING': 0.03, 'INACTIVE': 0.02}
+CORP_TYPES = {'BC': 0.55, 'NR': 0.3, 'CP': 0.15}
+MEMBERSHIP_STATUSES = {Status.ACTIVE.value: 0.9, Status.PENDING_APPROVAL.value: 0.06, Status.INACTIVE.value: 0.04}
+INVITATION_STATUSES = {InvitationStatus.PENDING.value: 0.5, InvitationStatus.ACCEPTED.value: 0.4, 'EXPIRED': 0.1}
+NOTIFICATION_STATUSES = {'DELIVERED': 0.9, 'PENDING': 0.05, 'FAILURE': 0.05}
+OTHER_CODE_WEIGHT = 0.01
+
+FIRST_NAMES = ('Alex', 'Avery', 'Blair', 'Casey', 'Charlie', 'Dana', 'Drew', 'Eden', 'Emerson', 'Finley', 'Harper',
+               'Hayden', 'Jamie', 'Jordan', 'Kai', 'Kendall', 'Logan', 'Morgan', 'Parker', 'Quinn', 'Reese', 'Riley',
+               'Rowan', 'Sage', 'Skyler', 'Taylor')
+LAST_NAMES = ('Anderson', 'Brown', 'Campbell', 'Chen', 'Clark', 'Fraser', 'Gill', 'Grewal', 'Lee', 'MacDonald',
+              'Martin', 'Mitchell', 'Nguyen', 'Patel', 'Roy', 'Sandhu', 'Singh', 'Smith', 'Taylor', 'Thompson',
+              'Tremblay', 'Wang', 'White', 'Wilson', 'Wong', 'Young')
+NAME_WORDS = ('Alpine', 'Arbutus', 'Cascade', 'Cedar', 'Coastal', 'Columbia', 'Fraser', 'Granite', 'Harbour',
+              'Island', 'Kootenay', 'Maple', 'Northern', 'Okanagan', 'Pacific', 'Peace', 'Salish', 'Skeena', 'Spruce',
+              'Summit', 'Thompson', 'Valley')
+NAME_NOUNS = ('Builders', 'Consulting', 'Farms', 'Foods', 'Holdings', 'Law', 'Logistics', 'Media', 'Mining',
+              'Properties', 'Services', 'Solutions', 'Supply', 'Technologies', 'Ventures')
+NAME_SUFFIXES = ('Ltd.', 'Inc.', 'Corp.', 'Co-op', 'LLP', 'Group')
+NOTIFICATION_SUBJECTS = ('Your business registry account', 'Invitation to join an account',
+                         'Your team member request was approved', 'Your role has changed',
+                         'Confirm your email address')
+
+BASE_DATE = datetime.datetime(2020, 6, 1)
+HISTORY_SECONDS = 3 * 365 * 24 * 3600
+
+_BCSC, _ANONYMOUS, _STAFF = 0, 1, 2
+# Tables whose triggers refresh the authorizations index; disabled during the load, and the index rebuilt after it.
+_INDEXED_TABLES = ('account_payment_settings', 'membership', 'affiliation')
+_BCRYPT_ALPHABET = './ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+
+
+def _copy_value(value):
+    """Return the value in the COPY text format."""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class _CopyFile:  # pylint: disable=too-few-public-methods
+    """Rows of a table written to a temporary file, to be loaded with COPY."""
+
+    def __init__(self, table: str, columns: tuple):
+        """Create an empty file for the columns of the table."""
+        self.table = table
+        self.columns = columns
+        self.rows = 0
+        self._file = tempfile.TemporaryFile('w+')
+
+    def write(self, *values):
+        """Write a row; the values are in the order of the columns."""
+        self._file.write('\t'.join(_copy_value(value) for value in values))
+        self._file.write('\n')
+        self.rows += 1
+
+    def copy(self, cursor):
+        """Load the rows into the table and discard the file."""
+        self._file.seek(0)
+        cursor.copy_expert(f'COPY {self.table} ({", ".join(self.columns)}) FROM STDIN', self._file)
+        self._file.close()
+
+
+class DataGenerator:  # pylint: disable=too-many-instance-attributes
+    """Generates the rows of one dataset and loads them over a DB-API (psycopg2) connection.
+
+    The generator does not commit; the caller commits, or rolls back, the transaction of the connection.
+    """
+
+    def __init__(self, connection, seed: int = 1, scale: float = 1.0,  # pylint: disable=too-many-arguments
+                 sample_size: int = 1000, large_orgs: int = None, large_org_members: int = None, **counts):
+        """Create a generator for the seed; counts override the COUNTS of the scale by name."""
+        self.connection = connection
+        self.seed = seed
+        self.counts = {name: max(1, int(count * scale)) for name, count in COUNTS.items()}
+        self.counts.update({name: count for name, count in counts.items() if count is not None})
+        self.large_orgs = min(large_orgs or max(1, int(LARGE_ORGS * min(scale, 1.0))), self.counts['orgs'])
+        self.large_org_members = large_org_members or max(2, min(LARGE_ORG_MEMBERS, self.counts['users'] // 4))
+        self.sample_size = sample_size
+        self.codes = {}
+        self.first_ids = {}
+        self._user_pools = {}
+        self._org_owners = array('l')
+        self._regular_orgs = array('l')
+        self._large_orgs = array('l')
+        self._anonymous_orgs = array('l')
+        self._sampled_users = {}
+        self.dataset = {'seed': seed, 'passcode': PASSCODE, 'counts': {}, 'users': [], 'large_orgs': [],
+                        'anonymous_org_owners': [], 'affiliated_entities': [], 'free_entities': []}
+
+    def _rng(self, table: str):
+        """Return a random generator of its own for each table, so changing one count leaves the others' rows."""
+        return random.Random(f'{self.seed}:{table}')
+
+    def _execute(self, sql: str, params=None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else None
+
+    def _load_codes(self):
+        """Read the codes of the code tables, failing if the codes the dataset needs are missing."""
+        codes = {
+            'org_type': [row[0] for row in self._execute('SELECT code FROM org_type')],
+            'org_status': [row[0] for row in self._execute('SELECT code FROM org_status')],
+            'corp_type': [row[0] for row in self._execute('SELECT code FROM corp_type')],
+            'membership_type': [row[0] for row in self._execute('SELECT code FROM membership_type')],
+            'membership_status': [row[0] for row in self._execute('SELECT id FROM membership_status_code')],
+            'user_status': [row[0] for row in self._execute('SELECT id FROM user_status_code')],
+            'invitation_status': [row[0] for row in self._execute('SELECT code FROM invitation_status')],
+            'invitation_type': [row[0] for row in self._execute('SELECT code FROM invitation_type')],
+            'payment_type': [row[0] for row in self._execute('SELECT code FROM payment_type ORDER BY "default" DESC, '
+                                                             'code')]
+        }
+        required = {
+            'org_status': ('ACTIVE',),
+            'membership_type': (OWNER, ADMIN, MEMBER),
+            'membership_status': (Status.ACTIVE.value,),
+            'user_status': (UserStatus.ACTIVE.value,),
+            'invitation_status': (InvitationStatus.PENDING.value,),
+            'invitation_type': (InvitationType.STANDARD.value,)
+        }
+        missing = [f'{table}.{code}' for table, table_codes in required.items()
+                   for code in table_codes if code not in codes[table]]
+        if missing or not codes['org_type'] or not codes['corp_type'] or not codes['payment_type']:
+            raise ValueError(f'Missing codes {", ".join(missing) or "org_type, corp_type, payment_type"}; '
+                             'run the migrations first')
+        terms = self._execute("SELECT version_id FROM documents WHERE type = 'termsofuse' "
+                              'ORDER BY version_id DESC LIMIT 1')
+        codes['terms_of_use_version'] = terms[0][0] if terms else None
+        self.codes = codes
+
+    def _first_id(self, table: str, connection=None):
+        """Return the id after the largest id of the table."""
+        with (connection or self.connection).cursor() as cursor:
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {table}')
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def _choices(codes, weights: dict):
+        """Return the codes and cumulative weights for random.choices, keeping the codes the table has."""
+        values = list(codes)
+        cum_weights, total = [], 0.0
+        for value in values:
+            total += weights.get(value, OTHER_CODE_WEIGHT)
+            cum_weights.append(total)
+        return values, cum_weights
+
+    @staticmethod
+    def _date(rng, after: datetime.datetime = None):
+        """Return a time in the history of the dataset, after the given time if one is passed."""
+        start = after or BASE_DATE - datetime.timedelta(seconds=HISTORY_SECONDS)
+        span = max(1, int((BASE_DATE - start).total_seconds()))
+        return start + datetime.timedelta(seconds=rng.randrange(span))
+
+    def _user_names(self, user_id: int):
+        """Return the first name, last name and email of a user, which only depend on the user id."""
+        first = FIRST_NAMES[user_id % len(FIRST_NAMES)]
+        last = LAST_NAMES[user_id // len(FIRST_NAMES) % len(LAST_NAMES)]
+        return first, last, f'{first}.{last}.{user_id}@example.com'.lower()
+
+    def _keycloak_guid(self, user_id: int):
+        """Return the keycloak guid of a user; unique for each user id and seed."""
+        return uuid.uuid5(uuid.NAMESPACE_URL, f'https://example.com/datagen/{self.seed}/{user_id}')
+
+    def _passcode_hash(self):
+        """Return a bcrypt hash of PASSCODE with a salt drawn from the seed.
+
+        Hashing is slow by design, so every entity with a passcode shares the hash. The last salt character only
+        carries two bits, so it is drawn from the characters whose other bits are zero.
+        """
+        rng = self._rng('passcode')
+        salt = ''.join(rng.choice(_BCRYPT_ALPHABET) for _ in range(21)) + rng.choice('.Oeu')
+        return bcrypt.hashpw(PASSCODE.encode(), f'$2b$12${salt}'.encode()).decode()
+
+    def _sample_user(self, user_id: int, org_id: int, role: str):
+        """Add a member to the sample of users and return its index in the sample."""
+        key = (user_id, org_id)
+        if key not in self._sampled_users:
+            self._sampled_users[key] = len(self.dataset['users'])
+            guid = self._keycloak_guid(user_id)
+            self.dataset['users'].append({'sub': str(guid), 'username': f'bcsc/{guid.hex}', 'org_id': org_id,
+                                          'role': role})
+        return self._sampled_users[key]
+
+    def _stride(self, count: int):
+        """Return the stride which samples about sample_size of count rows."""
+        return max(1, count // max(1, self.sample_size))
+
+    def users(self):
+        """Return the users: mostly BC Services Card users, some anonymous (bcros) users and a few staff."""
+        rng = self._rng('user')
+        first_id = self.first_ids['user']
+        statuses = self._choices(self.codes['user_status'], {UserStatus.ACTIVE.value: 0.98,
+                                                             UserStatus.INACTIVE.value: 0.02})
+        terms_version = self.codes['terms_of_use_version']
+        users = _CopyFile('"user"', ('id', 'username', 'first_name', 'last_name', 'email', 'keycloak_guid', 'roles',
+                                     'is_terms_of_use_accepted', 'terms_of_use_accepted_version', 'status', 'type',
+                                     'created', 'modified'))
+        pools = {_BCSC: array('l'), _ANONYMOUS: array('l'), _STAFF: array('l')}
+        for index in range(self.counts['users']):
+            user_id = first_id + index
+            first, last, email = self._user_names(user_id)
+            guid = self._keycloak_guid(user_id)
+            draw = rng.random()
+            if index and draw < ANONYMOUS_USER_SHARE:
+                kind, username, roles, user_type = _ANONYMOUS, f'bcros/{first}.{last}.{user_id}'.lower(), \
+                    '{anonymous_user}', AccessType.ANONYMOUS.value
+                guid = None
+            elif index and draw < ANONYMOUS_USER_SHARE + STAFF_USER_SHARE:
+                kind, username, roles, user_type = _STAFF, f'idir/{first}{last}{user_id}'.lower(), \
+                    '{staff,edit,public_user}', None
+            else:
+                kind, username, roles, user_type = _BCSC, f'bcsc/{guid.hex}', '{edit,public_user,account_holder}', None
+            accepted = terms_version is not None and rng.random() < 0.9
+            created = self._date(rng)
+            users.write(user_id, username, first, last, email, guid, roles, accepted,
+                        terms_version if accepted else None, rng.choices(*statuses)[0], user_type, created,
+                        self._date(rng, created))
+            pools[kind].append(user_id)
+        self._user_pools = pools
+        return [users]
+
+    def orgs(self):
+        """Return the orgs with their active payment settings, and their memberships.
+
+        Most orgs have one to a few members, drawn from a Pareto distribution; the large orgs have thousands, and the
+        anonymous orgs have an owner who signs in with a services card and members who are anonymous users. As with
+        Org.add_payment_settings, each org pays by credit card, or by the default payment type if there is no CC.
+        """
+        rng = self._rng('org')
+        first_id, first_membership_id = self.first_ids['org'], self.first_ids['membership']
+        first_payment_settings_id = self.first_ids['account_payment_settings']
+        payment_code = PaymentType.CREDIT_CARD.value if PaymentType.CREDIT_CARD.value in self.codes['payment_type'] \
+            else self.codes['payment_type'][0]
+        org_types = self._choices(self.codes['org_type'], ORG_TYPES)
+        org_statuses = self._choices(self.codes['org_status'], ORG_STATUSES)
+        membership_statuses = self._choices(self.codes['membership_status'], MEMBERSHIP_STATUSES)
+        premium = 'PREMIUM' if 'PREMIUM' in self.codes['org_type'] else org_types[0][0]
+        orgs = _CopyFile('org', ('id', 'type_code', 'status_code', 'name', 'normalized_name', 'access_type',
+                                 'billable', 'created_by_id', 'created', 'modified'))
+        payment_settings = _CopyFile('account_payment_settings', ('id', 'org_id', 'preferred_payment_code',
+                                                                  'is_active', 'created', 'modified'))
+        memberships = _CopyFile('membership', ('id', 'user_id', 'org_id', 'membership_type_code', 'status',
+                                               'created_by_id', 'created', 'modified'))
+        bcsc_users, anonymous_users = self._user_pools[_BCSC], self._user_pools[_ANONYMOUS] or self._user_pools[_BCSC]
+        large_stride = max(1, self.counts['orgs'] // self.large_orgs)
+        user_stride = self._stride(self.counts['users'])
+        anonymous_stride = self._stride(int(self.counts['orgs'] * ANONYMOUS_ORG_SHARE))
+        for index in range(self.counts['orgs']):
+            org_id = first_id + index
+            large = index % large_stride == 0 and index // large_stride < self.large_orgs
+            anonymous = not large and rng.random() < ANONYMOUS_ORG_SHARE
+            if large:
+                type_code, status_code = premium, 'ACTIVE'
+                size = rng.randint(self.large_org_members // 2, self.large_org_members)
+            else:
+                type_code, status_code = rng.choices(*org_types)[0], rng.choices(*org_statuses)[0]
+                size = min(int(rng.paretovariate(1.2 if anonymous else 1.6)), 200 if anonymous else 100)
+            name = f'{rng.choice(NAME_WORDS)} {rng.choice(NAME_NOUNS)} {org_id} {rng.choice(NAME_SUFFIXES)}'
+            owner = bcsc_users[rng.randrange(len(bcsc_users))]
+            created = self._date(rng)
+            orgs.write(org_id, type_code, status_code, name, OrgModel.normalize_name(name),
+                       AccessType.ANONYMOUS.value if anonymous else AccessType.BCSC.value, True, owner, created,
+                       self._date(rng, created))
+            payment_settings.write(first_payment_settings_id + index, org_id, payment_code, True, created, created)
+            self._org_owners.append(owner)
+            if large:
+                self._large_orgs.append(index)
+                self.dataset['large_orgs'].append({'org_id': org_id, 'user': self._sample_user(owner, org_id, OWNER)})
+            elif anonymous:
+                self._anonymous_orgs.append(index)
+                if (len(self._anonymous_orgs) - 1) % anonymous_stride == 0:
+                    self.dataset['anonymous_org_owners'].append(self._sample_user(owner, org_id, OWNER))
+            if status_code == 'ACTIVE' and not anonymous:
+                self._regular_orgs.append(index)
+
+            pool = anonymous_users if anonymous else bcsc_users
+            members = {owner}
+            size = min(size, len(pool))
+            while len(members) < size:
+                members.add(pool[rng.randrange(len(pool))])
+            for user_id in [owner] + sorted(members - {owner}):
+                membership_id = first_membership_id + memberships.rows
+                if user_id == owner:
+                    role, status = OWNER, Status.ACTIVE.value
+                else:
+                    role = ADMIN if rng.random() < 0.1 else MEMBER
+                    status = rng.choices(*membership_statuses)[0]
+                member_created = self._date(rng, created)
+                memberships.write(membership_id, user_id, org_id, role, status, owner, member_created,
+                                  member_created)
+                if status == Status.ACTIVE.value and not anonymous and membership_id % user_stride == 0:
+                    self._sample_user(user_id, org_id, role)
+        return [orgs, payment_settings, memberships]
+
+    def entities(self):
+        """Return the entities and their affiliations.
+
+        Most entities are affiliated to an active org, and a share of those to the large orgs, as law firms and
+        service companies hold thousands of businesses. Names requests have no passcode.
+        """
+        rng = self._rng('entity')
+        first_id, first_affiliation_id = self.first_ids['entity'], self.first_ids['affiliation']
+        corp_types = self._choices(self.codes['corp_type'], CORP_TYPES)
+        pass_code = self._passcode_hash()
+        entities = _CopyFile('entity', ('id', 'business_identifier', 'pass_code', 'pass_code_claimed',
+                                        'business_number', 'name', 'corp_type_code', 'folio_number', 'created',
+                                        'modified'))
+        affiliations = _CopyFile('affiliation', ('id', 'entity_id', 'org_id', 'created_by_id', 'created',
+                                                 'modified'))
+        stride = self._stride(self.counts['entities'])
+        first_org_id = self.first_ids['org']
+        for index in range(self.counts['entities']):
+            entity_id = first_id + index
+            corp_type = rng.choices(*corp_types)[0]
+            if corp_type == 'NR':
+                identifier, entity_pass_code = f'NR {entity_id:07d}', None
+            else:
+                identifier, entity_pass_code = f'{corp_type}{entity_id:07d}', pass_code
+            org_index = None
+            if self._regular_orgs and rng.random() < AFFILIATED_SHARE:
+                if self._large_orgs and rng.random() < LARGE_ORG_AFFILIATION_SHARE:
+                    org_index = self._large_orgs[rng.randrange(len(self._large_orgs))]
+                else:
+                    org_index = self._regular_orgs[rng.randrange(len(self._regular_orgs))]
+            name = f'{rng.choice(NAME_WORDS)} {rng.choice(NAME_NOUNS)} {rng.choice(NAME_SUFFIXES)}'.upper()
+            business_number = f'{rng.randrange(10 ** 8, 10 ** 9)}BC0001' if corp_type == 'BC' and rng.random() < 0.5 \
+                else None
+            folio_number = f'F{rng.randrange(10 ** 5):05d}' if rng.random() < 0.2 else None
+            created = self._date(rng)
+            entities.write(entity_id, identifier, entity_pass_code, org_index is not None and bool(entity_pass_code),
+                           business_number, name, corp_type, folio_number, created, created)
+            if org_index is not None:
+                org_id, owner = first_org_id + org_index, self._org_owners[org_index]
+                affiliated = self._date(rng, created)
+                affiliations.write(first_affiliation_id + affiliations.rows, entity_id, org_id, owner, affiliated,
+                                   affiliated)
+                if index % stride == 0:
+                    self.dataset['affiliated_entities'].append(
+                        {'identifier': identifier, 'user': self._sample_user(owner, org_id, OWNER)})
+            elif entity_pass_code and index % stride == 0:
+                self.dataset['free_entities'].append(identifier)
+        return [entities, affiliations]
+
+    def invitations(self):
+        """Return the invitations sent by org owners, each with the membership it offers."""
+        rng = self._rng('invitation')
+        first_id, first_invitation_membership_id = self.first_ids['invitation'], \
+            self.first_ids['invitation_membership']
+        statuses = self._choices(self.codes['invitation_status'], INVITATION_STATUSES)
+        director_search = InvitationType.DIRECTOR_SEARCH.value in self.codes['invitation_type']
+        anonymous_orgs = set(self._anonymous_orgs)
+        invitations = _CopyFile('invitation', ('id', 'sender_id', 'recipient_email', 'sent_date', 'accepted_date',
+                                               'token', 'invitation_status_code', 'type', 'created_by_id', 'created',
+                                               'modified'))
+        invitation_memberships = _CopyFile('invitation_membership', ('id', 'invitation_id', 'org_id',
+                                                                     'membership_type_code', 'created', 'modified'))
+        for index in range(self.counts['invitations']):
+            invitation_id = first_id + index
+            org_index = rng.randrange(len(self._org_owners))
+            sender = self._org_owners[org_index]
+            status = rng.choices(*statuses)[0]
+            invitation_type = InvitationType.DIRECTOR_SEARCH.value \
+                if director_search and org_index in anonymous_orgs else InvitationType.STANDARD.value
+            sent = self._date(rng)
+            accepted = self._date(rng, sent) if status == InvitationStatus.ACCEPTED.value else None
+            token = f'{rng.getrandbits(160):040x}' if status == InvitationStatus.PENDING.value else None
+            invitations.write(invitation_id, sender, f'invitee.{invitation_id}@example.com', sent, accepted, token,
+                              status, invitation_type, sender, sent, accepted or sent)
+            invitation_memberships.write(first_invitation_membership_id + index, invitation_id,
+                                         self.first_ids['org'] + org_index, ADMIN if rng.random() < 0.1 else MEMBER,
+                                         sent, sent)
+        return [invitations, invitation_memberships]
+
+    def notifications(self, connection):
+        """Return the notifications of the notify database, with their contents, sent to the users."""
+        rng = self._rng('notification')
+        types = [row[0] for row in self._execute_on(connection, 'SELECT code FROM notification_type')]
+        statuses = [row[0] for row in self._execute_on(connection, 'SELECT code FROM notification_status')]
+        statuses = self._choices(statuses, NOTIFICATION_STATUSES)
+        if 'EMAIL' not in types:
+            raise ValueError('Missing code notification_type.EMAIL; run the notify migrations first')
+        first_id, first_contents_id = self._first_id('notification', connection), \
+            self._first_id('notification_contents', connection)
+        notifications = _CopyFile('notification', ('id', 'recipients', 'request_date', 'sent_date', 'type_code',
+                                                   'status_code'))
+        contents = _CopyFile('notification_contents', ('id', 'subject', 'body', 'notification_id'))
+        users = self._user_pools[_BCSC]
+        for index in range(self.counts['notifications']):
+            notification_id = first_id + index
+            first, _, email = self._user_names(users[rng.randrange(len(users))])
+            status = rng.choices(*statuses)[0]
+            requested = self._date(rng)
+            notifications.write(notification_id, email, requested,
+                                self._date(rng, requested) if status == 'DELIVERED' else None, 'EMAIL', status)
+            subject = rng.choice(NOTIFICATION_SUBJECTS)
+            contents.write(first_contents_id + index, subject,
+                           f'<html><body><p>Hello {first},</p><p>{subject}.</p></body></html>', notification_id)
+        return [notifications, contents]
+
+    def _check_authorizations(self):
+        """Fail if a sampled owner has no authorization, as every request of the load test would then be denied."""
+        owners = [user for user in self.dataset['users'] if user['role'] == OWNER]
+        if not owners:
+            return
+        owner = owners[0]
+        if not self._execute('SELECT 1 FROM authorizations_index WHERE keycloak_guid = %s AND org_id = %s LIMIT 1',
+                             (owner['sub'], owner['org_id'])):
+            raise ValueError(f'The authorizations index has no row for the owner of org {owner["org_id"]}; '
+                             'check the authorizations view against the generated tables')
+
+    @staticmethod
+    def _execute_on(connection, sql: str):
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchall()
+
+    @staticmethod
+    def _load(connection, files):
+        """Load the files in order, then move the id sequences past the new ids."""
+        with connection.cursor() as cursor:
+            for copy_file in files:
+                copy_file.copy(cursor)
+                if copy_file.rows:
+                    cursor.execute(f"SELECT setval(pg_get_serial_sequence('{copy_file.table}', 'id'), "
+                                   f'(SELECT MAX(id) FROM {copy_file.table}))')
+                cursor.execute(f'ANALYZE {copy_file.table}')
+
+    def generate(self, notify_connection=None):
+        """Load the dataset, and the notifications if a notify connection is passed; return the sample of it.
+
+        The sample is what the load test and the benchmarks need to know about the dataset: some active members with
+        their org and role, the owners of the large and the anonymous orgs, affiliated entities with an owner of
+        the org, and unclaimed entities whose passcode is PASSCODE. Users are referred to by their index in 'users'.
+        """
+        self._load_codes()
+        for table in ('"user"', 'org', 'account_payment_settings', 'membership', 'entity', 'affiliation', 'invitation',
+                      'invitation_membership'):
+            self.first_ids[table.strip('"')] = self._first_id(table)
+
+        files = self.users() + self.orgs() + self.entities() + self.invitations()
+        # The authorizations index triggers would refresh an org for every row; the index is rebuilt once instead.
+        for table in _INDEXED_TABLES:
+            self._execute(f'ALTER TABLE {table} DISABLE TRIGGER USER')
+        self._load(self.connection, files)
+        for table in _INDEXED_TABLES:
+            self._execute(f'ALTER TABLE {table} ENABLE TRIGGER USER')
+        self._execute('SELECT refresh_authorizations(NULL)')
+        self._execute('ANALYZE authorizations_index')
+        self._check_authorizations()
+
+        if notify_connection is not None:
+            notify_files = self.notifications(notify_connection)
+            self._load(notify_connection, notify_files)
+            files += notify_files
+        self.dataset['counts'] = {copy_file.table.strip('"'): copy_file.rows for copy_file in files}
+        return self.dataset
+
+
+def generate(connection, seed: int = 1, scale: float = 1.0, notify_connection=None, **options):
+    """Load a dataset over the DB-API connections and return its sample; see DataGenerator.generate.
+
+    The options are those of DataGenerator: sample_size, large_orgs, large_org_members and the counts by name.
+    """
+    return DataGenerator(connection, seed, scale, **options).generate(notify_connection)
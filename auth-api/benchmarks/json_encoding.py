@@ -0,0 +1,65 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark for encoding large JSON responses.
+
+Compares the json module, as flask_restplus used it, with each backend of fast_json on a large member listing, dumped
+by the member schema, and on a notification listing shaped like the notify api's, which carries datetimes and UUIDs.
+
+    python -m benchmarks.json_encoding [rows] [iterations]
+"""
+import datetime
+import json
+import sys
+import timeit
+import uuid
+
+from auth_api.schemas import MembershipSchema
+from auth_api.schemas import serializers
+from auth_api.utils import fast_json
+
+from .serialization import build_listings
+
+
+def build_notifications(rows: int):
+    """Return a notification listing with the given number of rows."""
+    now = datetime.datetime.now()
+    return [{'id': index, 'requestBy': str(uuid.uuid4()), 'requestDate': now, 'sentDate': now,
+             'notifyStatus': 'DELIVERED', 'notifyType': 'EMAIL', 'recipients': f'user{index}@example.com',
+             'contents': {'subject': 'Your account has been approved', 'sender': 'noreply@example.com'}}
+            for index in range(rows)]
+
+
+def run(rows: int = 1000, iterations: int = 50):
+    """Time encoding each listing with the json module and the fast_json backends; returns milliseconds per call."""
+    memberships = build_listings(rows)['members'][0]
+    payloads = {
+        'members': {'members': serializers.dump(memberships, MembershipSchema, many=True, exclude=['org'])},
+        'notifications': build_notifications(rows)
+    }
+    backends = [backend for backend in fast_json.BACKENDS if backend != 'orjson' or fast_json.orjson is not None]
+    results = []
+    for name, payload in payloads.items():
+        stdlib = timeit.timeit(lambda: json.dumps(payload, default=fast_json.default), number=iterations)  # noqa: B023
+        result = {'name': name, 'stdlib_ms': stdlib / iterations * 1000}
+        for backend in backends:
+            result[f'{backend}_ms'] = timeit.timeit(
+                lambda: fast_json.dumps(payload, backend=backend), number=iterations) / iterations * 1000  # noqa: B023
+        results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    for result in run(*(int(arg) for arg in sys.argv[1:3])):
+        print('  '.join(f'{key} {value:8.2f}' if isinstance(value, float) else f'{value:<14}'
+                        for key, value in result.items()))
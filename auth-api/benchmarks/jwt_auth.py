@@ -0,0 +1,66 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark for the per-request cost of verifying a bearer token.
+
+Times the authentication of one request, as requires_auth runs it, with the claims cache of the JwtManager on and
+off; with it off every request checks the RSA signature of the token again.
+
+    python -m benchmarks.jwt_auth [iterations]
+"""
+import sys
+import timeit
+
+from flask import Flask
+
+from auth_api.jwt_wrapper import CachingJwtManager
+from config import get_named_config
+
+
+CLAIMS = {
+    'sub': 'f7a4a1d3-73a8-4cbc-a40f-bb1145302064',
+    'preferred_username': 'testuser',
+    'realm_access': {'roles': ['public_user', 'edit', 'staff']}
+}
+
+
+def build_manager(cache_size: int):
+    """Return an app in test mode and a JwtManager whose claims cache holds cache_size tokens."""
+    app = Flask(__name__)
+    app.config.from_object(get_named_config('testing'))
+    app.config['JWT_CLAIMS_CACHE_SIZE'] = cache_size
+    manager = CachingJwtManager()
+    manager.init_app(app)
+    return app, manager
+
+
+def run(iterations: int = 500):
+    """Time the authentication of a request with the claims cache on and off; returns microseconds per request."""
+    results = []
+    for name, cache_size in (('cache_off', 0), ('cache_on', 1000)):
+        app, manager = build_manager(cache_size)
+        claims = dict(CLAIMS, iss=manager.issuer, aud=manager.audience)
+        header = {'alg': 'RS256', 'typ': 'JWT', 'kid': app.config['JWT_OIDC_TEST_KEYS']['keys'][0]['kid']}
+        token = manager.create_jwt(claims=claims, header=header)
+        authenticate = manager._require_auth_validation  # pylint: disable=protected-access
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            authenticate()
+            elapsed = timeit.timeit(authenticate, number=iterations)
+        results.append({'name': name, 'per_request_us': elapsed / iterations * 1000000, **manager.get_metrics()})
+    return results
+
+
+if __name__ == '__main__':
+    for result in run(*(int(arg) for arg in sys.argv[1:2])):
+        print('  '.join(f'{key} {value:10.1f}' if isinstance(value, float) else f'{key} {value}'
+                        for key, value in result.items()))
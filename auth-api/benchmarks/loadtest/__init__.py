@@ -0,0 +1,21 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Load test of the auth api against local stand-ins for Keycloak, notify-api, legal-api and BCOL.
+
+Seeds a dataset into the database configured in the environment, starts the stub servers and the app under gunicorn
+(with the settings of gunicorn_config.py), then drives the main traffic patterns with concurrent clients. Reports the
+p50, p95 and p99 latencies and the requests per second of each endpoint.
+
+    python -m benchmarks.loadtest [--clients 50] [--seconds 60] [--scenario members ...] [--json results.json]
+"""
@@ -0,0 +1,69 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Run the load test; see the package docstring for what it does."""
+import argparse
+import json
+import os
+
+from ..worker_modes import PORT, start_server
+from .runner import LoadRunner
+from .scenarios import SCENARIOS
+from .stubs import StubServers
+
+
+def main():
+    """Seed the dataset, start the stubs and the app, drive the scenarios and report."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description=__doc__)
+    parser.add_argument('--clients', type=int, default=50, help='concurrent clients')
+    parser.add_argument('--seconds', type=float, default=60, help='duration of the run, after a short warm up')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run; repeat for several, all of them by default')
+    parser.add_argument('--stub-delay', type=float, default=0.02, help='seconds each stub waits before answering')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--orgs', type=int, default=200)
+    parser.add_argument('--entities', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1, help='seed of the dataset and of the clients')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    stubs = StubServers(delay=args.stub_delay)
+    stub_env = stubs.start()
+    # The config reads the environment when it is imported, so the app is imported once the stubs are known.
+    os.environ.update(stub_env)
+    from auth_api import create_app  # pylint: disable=import-outside-toplevel
+    from .dataset import seed  # pylint: disable=import-outside-toplevel
+
+    dataset = seed(create_app(os.getenv('FLASK_ENV', 'production')), users=args.users, orgs=args.orgs,
+                   entities=args.entities, seed_value=args.seed)
+    server = start_server(stub_env)
+    try:
+        runner = LoadRunner('127.0.0.1', PORT, {'dataset': dataset, 'issuer': stubs.issuer},
+                            [SCENARIOS[name] for name in args.scenario or sorted(SCENARIOS)])
+        runner.run(args.clients, min(5.0, args.seconds), seed=args.seed)  # warm up the workers and their pools
+        results = runner.run(args.clients, args.seconds, seed=args.seed)
+    finally:
+        server.terminate()
+        server.wait()
+        stubs.stop()
+
+    for result in results:
+        print('  '.join(f'{key} {value:10.2f}' if isinstance(value, float) else f'{key} {value}'
+                        for key, value in result.items()))
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump({'arguments': vars(args), 'results': results}, results_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Seed the dataset the load test scenarios run against.
+
+The dataset is loaded by the synthetic dataset generator, at a small scale by default: users, orgs with a skewed
+membership (a few orgs hold most of the members), anonymous orgs for the bulk user upload, and entities, most of them
+affiliated to orgs and the rest free to be claimed. It is deterministic for a seed, and loads after any data the
+database already holds.
+"""
+from auth_api.models import db
+
+from ..datagen import generate
+
+
+def seed(app, users: int = 2000, orgs: int = 200, large_orgs: int = 3,  # pylint: disable=too-many-arguments
+         large_org_members: int = 500, entities: int = 2000, seed_value: int = 1):
+    """Load the dataset and return what the scenarios need to know about it."""
+    with app.app_context():
+        dataset = generate(db.session.connection().connection, seed=seed_value, sample_size=users,
+                           users=users, orgs=orgs, entities=entities, invitations=max(1, orgs // 2),
+                           large_orgs=large_orgs, large_org_members=large_org_members)
+        db.session.commit()
+    return dataset
@@ -0,0 +1,88 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Drive the scenarios with concurrent clients and summarize the latencies of each endpoint."""
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Dict, List
+
+from ..worker_modes import percentile
+
+
+class LoadRunner:
+    """Clients which each loop over the scenarios on a keep alive connection until the time is up."""
+
+    def __init__(self, host: str, port: int, context: dict, scenarios: List):
+        """Create a runner for the app at host:port; context holds the dataset and the token issuer."""
+        self.host = host
+        self.port = port
+        self.context = context
+        self.scenarios = scenarios
+        self._latencies: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def run(self, clients: int, seconds: float, seed: int = 1) -> List[dict]:
+        """Run the clients for the given time; returns the summary of each endpoint."""
+        self._latencies, self._errors = {}, {}
+        deadline = time.monotonic() + seconds
+        threads = [threading.Thread(target=self._client, args=(random.Random(seed * 1000 + index), deadline))
+                   for index in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summarize(seconds)
+
+    def summarize(self, seconds: float) -> List[dict]:
+        """Return the request count, errors, requests per second and p50, p95 and p99 in ms for each endpoint."""
+        results = []
+        for endpoint in sorted(self._latencies):
+            latencies = sorted(self._latencies[endpoint])
+            results.append({'endpoint': endpoint, 'requests': len(latencies), 'errors': self._errors.get(endpoint, 0),
+                            'requests_per_second': len(latencies) / seconds,
+                            'p50_ms': percentile(latencies, 50) * 1000,
+                            'p95_ms': percentile(latencies, 95) * 1000,
+                            'p99_ms': percentile(latencies, 99) * 1000})
+        return results
+
+    def _client(self, rng: random.Random, deadline: float):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        latencies, errors = {}, {}
+        while time.monotonic() < deadline:
+            scenario = rng.choice(self.scenarios)
+            for endpoint, method, path, body, token in scenario(self.context, rng):
+                headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+                started = time.perf_counter()
+                try:
+                    connection.request(method, path, body=json.dumps(body) if body is not None else None,
+                                       headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    failed = response.status >= 400
+                except (OSError, http.client.HTTPException):
+                    failed = True
+                    connection.close()
+                    connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+                latencies.setdefault(endpoint, []).append(time.perf_counter() - started)
+                if failed:
+                    errors[endpoint] = errors.get(endpoint, 0) + 1
+        connection.close()
+        with self._lock:
+            for endpoint, values in latencies.items():
+                self._latencies.setdefault(endpoint, []).extend(values)
+            for endpoint, count in errors.items():
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + count
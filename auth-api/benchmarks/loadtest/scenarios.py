@@ -0,0 +1,115 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The traffic patterns the load test drives.
+
+Each scenario picks the users and records it needs from the seeded dataset and returns the requests one pass of the
+scenario makes, in order, as (endpoint, method, path, body, token) tuples. The endpoint names the route, so requests
+for different orgs or entities are reported together.
+"""
+import threading
+import time
+import uuid
+
+from jose import jwt
+
+from .stubs import AUDIENCE
+
+
+API = '/api/v1'
+
+_tokens = {}
+_tokens_lock = threading.Lock()
+_free_entities_lock = threading.Lock()
+
+
+def create_token(issuer: str, user: dict) -> str:
+    """Return a bearer token for the seeded user, signed with the test key the Keycloak stub publishes."""
+    from config import TestConfig  # pylint: disable=import-outside-toplevel
+    now = int(time.time())
+    claims = {
+        'iss': issuer, 'aud': AUDIENCE, 'sub': user['sub'], 'iat': now, 'exp': now + 3600,
+        'preferred_username': user['username'], 'firstname': 'Load', 'lastname': 'Tester',
+        'loginSource': 'BCSC', 'roles': ['public_user', 'edit'],
+        'realm_access': {'roles': ['public_user', 'edit']}
+    }
+    kid = TestConfig.JWT_OIDC_TEST_KEYS['keys'][0]['kid']
+    return jwt.encode(claims, TestConfig.JWT_OIDC_TEST_PRIVATE_KEY_PEM, algorithm='RS256', headers={'kid': kid})
+
+
+def _token(context, user_index: int) -> str:
+    """Return the token of the user, signing it only the first time, as a browser keeps its token."""
+    token = _tokens.get(user_index)
+    if token is None:
+        token = create_token(context['issuer'], context['dataset']['users'][user_index])
+        with _tokens_lock:
+            _tokens[user_index] = token
+    return token
+
+
+def login(context, rng):
+    """Sign in, which creates or updates the user from the token, then read the profile."""
+    user = rng.randrange(len(context['dataset']['users']))
+    token = _token(context, user)
+    return [('POST /users', 'POST', f'{API}/users', {}, token),
+            ('GET /users/@me', 'GET', f'{API}/users/@me', None, token)]
+
+
+def authorizations(context, rng):
+    """Read the authorizations of a member for an entity affiliated to their org."""
+    affiliated = rng.choice(context['dataset']['affiliated_entities'])
+    return [('GET /entities/{id}/authorizations', 'GET', f'{API}/entities/{affiliated["identifier"]}/authorizations',
+             None, _token(context, affiliated['user']))]
+
+
+def members(context, rng):
+    """List the members of an org; half of the listings are of the largest orgs."""
+    dataset = context['dataset']
+    if dataset['large_orgs'] and rng.random() < 0.5:
+        user = rng.choice(dataset['large_orgs'])['user']
+    else:
+        user = rng.randrange(len(dataset['users']))
+    org_id = dataset['users'][user]['org_id']
+    return [('GET /orgs/{id}/members', 'GET', f'{API}/orgs/{org_id}/members', None, _token(context, user))]
+
+
+def affiliation(context, rng):
+    """Claim a free entity for the org of a member with its passcode."""
+    dataset = context['dataset']
+    with _free_entities_lock:
+        if not dataset['free_entities']:
+            return []
+        identifier = dataset['free_entities'].pop()
+    user = rng.randrange(len(dataset['users']))
+    body = {'businessIdentifier': identifier, 'passCode': dataset['passcode']}
+    return [('POST /orgs/{id}/affiliations', 'POST', f'{API}/orgs/{dataset["users"][user]["org_id"]}/affiliations',
+             body, _token(context, user))]
+
+
+def bulk_users(context, rng, batch: int = 5):
+    """Add a batch of new users to an anonymous org as its owner."""
+    dataset = context['dataset']
+    owner = rng.choice(dataset['anonymous_org_owners'])
+    users = [{'username': f'lt{dataset["seed"]}-{uuid.UUID(int=rng.getrandbits(128)).hex[:12]}',
+              'password': 'Load@Test1'} for _ in range(batch)]
+    body = {'orgId': dataset['users'][owner]['org_id'], 'users': users}
+    return [('POST /bulk/users', 'POST', f'{API}/bulk/users', body, _token(context, owner))]
+
+
+SCENARIOS = {
+    'login': login,
+    'authorizations': authorizations,
+    'members': members,
+    'affiliation': affiliation,
+    'bulk_users': bulk_users
+}
@@ -0,0 +1,236 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Stub servers standing in for Keycloak, notify-api, legal-api and BCOL.
+
+Each stub answers the calls the auth api makes, after an optional delay to mimic the latency of the real service.
+The Keycloak stub also serves the JWKS of the test keys in config.py, so tokens signed by tokens.create_token pass
+verification, and keeps the users created through its admin api in memory.
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs
+
+
+REALM = 'loadtest'
+AUDIENCE = 'sbc-auth-web'
+
+
+class _StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a route table and the state of one stub."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str, routes, delay: float):
+        """Listen on a free port of the host."""
+        super().__init__((host, 0), _StubHandler)
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in routes]
+        self.delay = delay
+        self.state = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        """Return the base url of the server."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Dispatch requests to the routes of the server."""
+
+    protocol_version = 'HTTP/1.1'
+    # Send each response in one write, so the latency is the delay of the stub rather than of TCP acknowledgements.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+        """Handle a GET."""
+        self._dispatch('GET')
+
+    def do_POST(self):  # noqa: N802 pylint: disable=invalid-name
+        """Handle a POST."""
+        self._dispatch('POST')
+
+    def do_PUT(self):  # noqa: N802 pylint: disable=invalid-name
+        """Handle a PUT."""
+        self._dispatch('PUT')
+
+    def do_DELETE(self):  # noqa: N802 pylint: disable=invalid-name
+        """Handle a DELETE."""
+        self._dispatch('DELETE')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Do not log each request."""
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        path, _, query = self.path.partition('?')
+        for route_method, pattern, handler in self.server.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                status, payload = handler(self.server, match, parse_qs(query), body)
+                return self._send(status, payload)
+        return self._send(404, {'message': f'{method} {path} is not stubbed'})
+
+    def _send(self, status: int, payload):
+        content = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def _keycloak_token(server, match, query, body):  # pylint: disable=unused-argument
+    return 200, {'access_token': 'stub-admin-token', 'expires_in': 300, 'token_type': 'bearer'}
+
+
+def _keycloak_certs(server, match, query, body):  # pylint: disable=unused-argument
+    from config import TestConfig  # pylint: disable=import-outside-toplevel
+    return 200, TestConfig.JWT_OIDC_TEST_KEYS
+
+
+def _keycloak_groups(server, match, query, body):  # pylint: disable=unused-argument
+    name = query.get('search', ['group'])[0]
+    return 200, [{'id': name, 'name': name, 'path': f'/{name}'}]
+
+
+def _keycloak_find_users(server, match, query, body):  # pylint: disable=unused-argument
+    username = query.get('username', [None])[0]
+    with server.lock:
+        user = server.state.get(username)
+    return 200, [user] if user else []
+
+
+def _keycloak_add_user(server, match, query, body):  # pylint: disable=unused-argument
+    user = json.loads(body or b'{}')
+    with server.lock:
+        if user.get('username') in server.state:
+            return 409, {'errorMessage': 'User exists with same username'}
+        user.update(id=str(uuid.uuid4()), enabled=user.get('enabled', True))
+        server.state[user['username']] = user
+    return 201, None
+
+
+def _keycloak_update_user(server, match, query, body):  # pylint: disable=unused-argument
+    with server.lock:
+        for user in server.state.values():
+            if user['id'] == match.group('user_id'):
+                user.update(json.loads(body or b'{}'))
+    return 204, None
+
+
+def _keycloak_delete_user(server, match, query, body):  # pylint: disable=unused-argument
+    with server.lock:
+        server.state = {name: user for name, user in server.state.items() if user['id'] != match.group('user_id')}
+    return 204, None
+
+
+def _keycloak_user_groups(server, match, query, body):  # pylint: disable=unused-argument
+    return 200, []
+
+
+def _no_content(server, match, query, body):  # pylint: disable=unused-argument
+    return 204, None
+
+
+def _notify(server, match, query, body):  # pylint: disable=unused-argument
+    return 200, {'id': 1, 'notifyStatus': {'code': 'DELIVERED'}}
+
+
+def _legal_business(server, match, query, body):  # pylint: disable=unused-argument
+    identifier = match.group('identifier')
+    return 200, {'business': {'identifier': identifier, 'legalName': f'{identifier} LTD.', 'legalType': 'CP'}}
+
+
+def _bcol_profile(server, match, query, body):  # pylint: disable=unused-argument
+    profile = json.loads(body or b'{}')
+    return 200, {'userId': profile.get('userId'), 'accountNumber': '180670', 'orgName': 'LOAD TEST ORG',
+                 'accountType': 'B', 'profileFlags': ['PREMIUM']}
+
+
+_REALM_PATH = r'/auth/realms/[^/]+'
+_ADMIN_PATH = r'/auth/admin/realms/[^/]+'
+
+KEYCLOAK_ROUTES = (
+    ('POST', _REALM_PATH + r'/protocol/openid-connect/token', _keycloak_token),
+    ('GET', _REALM_PATH + r'/protocol/openid-connect/certs', _keycloak_certs),
+    ('GET', _ADMIN_PATH + r'/groups', _keycloak_groups),
+    ('GET', _ADMIN_PATH + r'/users', _keycloak_find_users),
+    ('POST', _ADMIN_PATH + r'/users', _keycloak_add_user),
+    ('PUT', _ADMIN_PATH + r'/users/(?P<user_id>[^/]+)', _keycloak_update_user),
+    ('DELETE', _ADMIN_PATH + r'/users/(?P<user_id>[^/]+)', _keycloak_delete_user),
+    ('GET', _ADMIN_PATH + r'/users/[^/]+/groups', _keycloak_user_groups),
+    ('PUT', _ADMIN_PATH + r'/users/[^/]+/groups/[^/]+', _no_content),
+    ('DELETE', _ADMIN_PATH + r'/users/[^/]+/groups/[^/]+', _no_content),
+)
+NOTIFY_ROUTES = (('POST', r'.*/notify/?', _notify),)
+LEGAL_ROUTES = (('GET', r'.*/businesses/(?P<identifier>[^/]+)', _legal_business),)
+BCOL_ROUTES = (('POST', r'.*/profiles', _bcol_profile),)
+
+
+class StubServers:
+    """The stub servers, each on its own port of the host."""
+
+    def __init__(self, host: str = '127.0.0.1', delay: float = 0.02):
+        """Create the servers; each answers after delay seconds."""
+        self.servers = {
+            'keycloak': _StubServer(host, KEYCLOAK_ROUTES, delay),
+            'notify': _StubServer(host, NOTIFY_ROUTES, delay),
+            'legal': _StubServer(host, LEGAL_ROUTES, delay),
+            'bcol': _StubServer(host, BCOL_ROUTES, delay)
+        }
+
+    @property
+    def issuer(self):
+        """Return the issuer of the tokens the app accepts."""
+        return f'{self.servers["keycloak"].url}/auth/realms/{REALM}'
+
+    def start(self) -> Dict[str, str]:
+        """Serve the stubs in background threads; returns the environment pointing the app at them."""
+        for name, server in self.servers.items():
+            threading.Thread(target=server.serve_forever, name=f'stub-{name}', daemon=True).start()
+        keycloak = self.servers['keycloak'].url
+        return {
+            'KEYCLOAK_BASE_URL': keycloak,
+            'KEYCLOAK_BCROS_BASE_URL': keycloak,
+            'KEYCLOAK_REALMNAME': REALM,
+            'KEYCLOAK_BCROS_REALMNAME': REALM,
+            'KEYCLOAK_ADMIN_CLIENTID': 'loadtest',
+            'KEYCLOAK_ADMIN_SECRET': 'loadtest',
+            'KEYCLOAK_BCROS_ADMIN_CLIENTID': 'loadtest',
+            'KEYCLOAK_BCROS_ADMIN_SECRET': 'loadtest',
+            'JWT_OIDC_WELL_KNOWN_CONFIG': '',
+            'JWT_OIDC_JWKS_URI': f'{self.issuer}/protocol/openid-connect/certs',
+            'JWT_OIDC_ISSUER': self.issuer,
+            'JWT_OIDC_AUDIENCE': AUDIENCE,
+            'JWT_OIDC_ALGORITHMS': 'RS256',
+            'NOTIFY_API_URL': f'{self.servers["notify"].url}/api/v1',
+            'LEGAL_API_URL': f'{self.servers["legal"].url}/api/v1',
+            'BCOL_API_URL': f'{self.servers["bcol"].url}/api/v1'
+        }
+
+    def stop(self):
+        """Stop serving and close the sockets."""
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
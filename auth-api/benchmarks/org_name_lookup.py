@@ -0,0 +1,91 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for the duplicate org name lookups.
+
+Seeds a temporary copy of the org name columns (1M rows by default) and times the lookups of
+Org.find_similar_org_by_name with and without the indexes added for them: the btree index on normalized_name for exact
+duplicates, and the trigram index on lower(name) for the containment and similarity matches. Only a temporary table
+is used, so it can be pointed at any database with pg_trgm available.
+
+    python -m benchmarks.org_name_lookup [rows] [--database-url URL]
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from config import get_named_config
+
+
+SEED = text(
+    'INSERT INTO bench_org (name, normalized_name) '
+    "SELECT n, lower(regexp_replace(trim(n), '\\s+', ' ', 'g')) FROM ("
+    "   SELECT 'Org ' || md5(i::text) || ' ' || (i % 1000) || ' Ltd' AS n FROM generate_series(1, :rows) AS i"
+    ') AS names')
+
+LOOKUPS = {
+    'exact (normalized_name)': text('SELECT id FROM bench_org WHERE normalized_name = :normalized LIMIT 1'),
+    'contains (lower(name) LIKE)': text('SELECT id FROM bench_org WHERE lower(name) LIKE :pattern LIMIT 1'),
+    'similar (% and similarity)': text('SELECT id FROM bench_org WHERE lower(name) % :lower '
+                                       'AND similarity(lower(name), :lower) >= 0.6 LIMIT 1')
+}
+
+INDEXES = (
+    'CREATE INDEX ix_bench_org_normalized_name ON bench_org (normalized_name)',
+    'CREATE INDEX ix_bench_org_name_trgm ON bench_org USING gin (lower(name) gin_trgm_ops)'
+)
+
+
+def _time(connection, statement, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(statement, params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run(database_url: str, rows: int = 1000000, repeat: int = 5):
+    """Seed the rows and return the median latency in milliseconds of each lookup, before and after indexing."""
+    engine = create_engine(database_url)
+    name = 'Org {} 42 Ltd'.format('5' * 32)
+    params = {'normalized': name.lower(), 'pattern': f'%{name.lower()}%', 'lower': name.lower()}
+    results = []
+    with engine.connect() as connection:
+        connection.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        connection.execute(text('CREATE TEMP TABLE bench_org (id serial PRIMARY KEY, name varchar(250), '
+                                'normalized_name varchar(250))'))
+        connection.execute(SEED, {'rows': rows})
+        connection.execute(text('ANALYZE bench_org'))
+        before = {label: _time(connection, statement, params, repeat) for label, statement in LOOKUPS.items()}
+
+        for index in INDEXES:
+            connection.execute(text(index))
+        connection.execute(text('ANALYZE bench_org'))
+        after = {label: _time(connection, statement, params, repeat) for label, statement in LOOKUPS.items()}
+
+        for label in LOOKUPS:
+            results.append({'name': label, 'unindexed_ms': before[label], 'indexed_ms': after[label]})
+        connection.execute(text('DROP TABLE bench_org'))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int, nargs='?', default=1000000)
+    parser.add_argument('--database-url', default=get_named_config('testing').SQLALCHEMY_DATABASE_URI)
+    args = parser.parse_args()
+    for result in run(args.database_url, args.rows):
+        print('{name:<30} unindexed {unindexed_ms:10.2f}ms  indexed {indexed_ms:8.2f}ms'.format(**result))
@@ -0,0 +1,78 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark for JSON schema validation.
+
+Compares validating with the cached schema store and compiled validators against the previous behaviour, which read
+every schema file and built the validator on each call (and a second one for the errors of an invalid payload).
+
+    python -m benchmarks.schema_validation [iterations]
+"""
+import sys
+import timeit
+from os import path
+
+from jsonschema import Draft7Validator, RefResolver, draft7_format_checker
+
+from auth_api.schemas import utils as schema_utils
+
+
+PAYLOADS = {
+    'org': {'name': 'My Test Org', 'accessType': 'ANONYMOUS',
+            'mailingAddress': {'street': '123 Main St', 'city': 'Victoria', 'region': 'BC',
+                               'postalCode': 'V8W 1A1', 'country': 'CA'}},
+    'bulk_user': {'orgId': 1, 'users': [{'username': f'user{i}', 'password': 'Password@1234'} for i in range(20)]},
+    'invitation': {'recipientEmail': 'abc123@email.com', 'sentDate': '2020-05-25 10:00:00',
+                   'membership': [{'membershipType': 'MEMBER', 'orgId': 1}]}
+}
+
+INVALID_PAYLOADS = {
+    'org': {'foo': 'bar'},
+    'bulk_user': {'orgId': 'one', 'users': [{'username': 'user'}]},
+    'invitation': {'membership': [{'orgId': 'one'}]}
+}
+
+
+def uncached_validate(json_data, schema_id):
+    """Validate the way schema_utils.validate did before the store and validators were cached."""
+    schema_search_path = schema_utils.DEFAULT_SCHEMA_SEARCH_PATH
+    schema_store = schema_utils._load_schema_store(schema_search_path)  # pylint: disable=protected-access
+    schema = schema_store.get(f'{schema_utils.BASE_URI}/{schema_id}')
+    resolver = RefResolver(f'file://{path.join(schema_search_path, schema_id)}.json', schema, schema_store)
+    if Draft7Validator(schema, format_checker=draft7_format_checker, resolver=resolver).is_valid(json_data):
+        return True, None
+    return False, list(Draft7Validator(schema, format_checker=draft7_format_checker,
+                                       resolver=resolver).iter_errors(json_data))
+
+
+def run(iterations: int = 1000):
+    """Time both implementations for the valid and invalid payloads of each schema; returns the results."""
+    results = []
+    for schema_id, payload in PAYLOADS.items():
+        for label, data in (('valid', payload), ('invalid', INVALID_PAYLOADS[schema_id])):
+            assert uncached_validate(data, schema_id)[0] == schema_utils.validate(data, schema_id)[0]
+            before = timeit.timeit(lambda: uncached_validate(data, schema_id), number=iterations)  # noqa: B023
+            after = timeit.timeit(lambda: schema_utils.validate(data, schema_id), number=iterations)  # noqa: B023
+            results.append({
+                'name': f'{schema_id} ({label})',
+                'uncached_us': before / iterations * 1e6,
+                'cached_us': after / iterations * 1e6,
+                'speedup': before / after if after else 0
+            })
+    return results
+
+
+if __name__ == '__main__':
+    for result in run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000):
+        print('{name:<24} uncached {uncached_us:10.1f}us  cached {cached_us:8.1f}us  x{speedup:6.1f}'.format(
+            **result))
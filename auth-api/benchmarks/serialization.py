@@ -0,0 +1,91 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark for dumping the member, org and affiliated entity listings.
+
+Builds the listings in memory, without a database, and compares dumping them the way the services did before, with a
+new schema instance for every row, against dumping with the shared schema and with the compiled dumper.
+
+    python -m benchmarks.serialization [rows] [iterations]
+"""
+import datetime
+import sys
+import timeit
+
+from auth_api.models import (
+    Contact, ContactLink, Entity, Membership, MembershipStatusCode, Org, OrgStatus, OrgType, User)
+from auth_api.schemas import EntitySchema, MembershipSchema, OrgSchema
+from auth_api.schemas import serializers
+
+
+def _contact_links(index: int):
+    contact = Contact(id=index, street=f'{index} Main St', city='Victoria', region='BC', country='CA',
+                      postal_code='V8W 1A1', email=f'user{index}@example.com', phone='2505551234')
+    return [ContactLink(id=index, contact=contact)]
+
+
+def build_listings(rows: int):
+    """Return the memberships, orgs and entities of a listing with the given number of rows."""
+    now = datetime.datetime.now()
+    active = MembershipStatusCode(id=1, name='ACTIVE', description='Active')
+    org_type, org_status = OrgType(code='IMPLICIT', desc='Implicit'), OrgStatus(code='ACTIVE', desc='Active')
+    memberships, orgs, entities = [], [], []
+    for index in range(rows):
+        user = User(id=index, username=f'bcsc/user{index}', firstname='First', lastname=f'Last {index}',
+                    email=f'user{index}@example.com', created=now, modified=now, status=1, type='PUBLIC_USER',
+                    is_terms_of_use_accepted=True, terms_of_use_accepted_version='2')
+        user.contacts = _contact_links(index)
+        org = Org(id=index, name=f'Org {index}', access_type='REGULAR', billable=True, created=now, modified=now,
+                  created_by=user)
+        org.org_type, org.org_status = org_type, org_status
+        membership = Membership(user_id=index, org_id=index, membership_type_code='OWNER', membership_type_status=1)
+        membership.id, membership.user, membership.org, membership.membership_status = index, user, org, active
+        entity = Entity(id=index, business_identifier=f'CP{index:07}', business_number=f'{index:09}BC0001',
+                        name=f'Entity {index}', corp_type_code='CP', pass_code_claimed=True, folio_number='ABC',
+                        created=now, modified=now, created_by=user)
+        entity.contacts = _contact_links(rows + index)
+        memberships.append(membership)
+        orgs.append(org)
+        entities.append(entity)
+    return {'members': (memberships, MembershipSchema, ['org']), 'orgs': (orgs, OrgSchema, None),
+            'affiliated entities': (entities, EntitySchema, None)}
+
+
+def run(rows: int = 100, iterations: int = 20):
+    """Time the three ways of dumping each listing; returns the results in microseconds per row."""
+    results = []
+    for name, (objects, schema_class, exclude) in build_listings(rows).items():
+        exclude = exclude or ()
+
+        def per_row_schema():
+            return [schema_class(exclude=exclude).dump(obj, many=False) for obj in objects]  # noqa: B023
+
+        def shared_schema():
+            return serializers.get_schema(schema_class, exclude=exclude).dump(objects, many=True)  # noqa: B023
+
+        def compiled_dumper():
+            return serializers.dump(objects, schema_class, many=True, exclude=exclude)  # noqa: B023
+
+        assert per_row_schema() == shared_schema() == compiled_dumper()
+        timings = {label: timeit.timeit(function, number=iterations) / (iterations * rows) * 1e6
+                   for label, function in (('per_row_us', per_row_schema), ('shared_us', shared_schema),
+                                           ('compiled_us', compiled_dumper))}
+        timings['speedup'] = timings['per_row_us'] / timings['compiled_us'] if timings['compiled_us'] else 0
+        results.append({'name': name, **timings})
+    return results
+
+
+if __name__ == '__main__':
+    for result in run(*(int(arg) for arg in sys.argv[1:3])):
+        print('{name:<20} per row schema {per_row_us:8.1f}us  shared schema {shared_us:8.1f}us  '
+              'compiled {compiled_us:8.1f}us  x{speedup:5.1f}'.format(**result))
@@ -0,0 +1,118 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Load test comparing the gunicorn sync workers with the green thread (gevent) workers.
+
+Starts the app under gunicorn once for each worker mode, with the settings of gunicorn_config.py and the database
+and downstream services configured in the environment, and drives one endpoint with concurrent clients. Reports the
+requests per second and the p50 and p99 latencies of each mode.
+
+    python -m benchmarks.worker_modes [path] [clients] [seconds]
+"""
+import http.client
+import os
+import subprocess
+import sys
+import threading
+import time
+
+
+PORT = 5099
+
+MODES = {
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_THREADS': os.getenv('GUNICORN_THREADS', '4')},
+    'gevent': {'GUNICORN_WORKER_CLASS': 'gevent',
+               'GUNICORN_WORKER_CONNECTIONS': os.getenv('GUNICORN_WORKER_CONNECTIONS', '100')}
+}
+
+
+def percentile(latencies, percent: float) -> float:
+    """Return the given percentile of the sorted latencies."""
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+def start_server(mode_env, port: int = PORT):
+    """Start gunicorn with the mode's settings and wait until it answers."""
+    server = subprocess.Popen(['gunicorn', '-c', 'gunicorn_config.py', '-b', f'127.0.0.1:{port}', 'wsgi:application'],
+                              env=dict(os.environ, **mode_env))
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/ops/readyz')
+            connection.getresponse().read()
+            return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start')
+
+
+def drive(path: str, clients: int, seconds: float, port: int = PORT, headers=None):
+    """Request the path from concurrent keep alive clients for the given time; return the latencies and errors."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        own_latencies, own_errors = [], 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers or {})
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 500:
+                    own_errors += 1
+            except (OSError, http.client.HTTPException):
+                own_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            own_latencies.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own_latencies)
+            errors.append(own_errors)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), sum(errors)
+
+
+def run(path: str = '/ops/healthz', clients: int = 50, seconds: float = 30):
+    """Drive the path under each worker mode; returns requests per second and latencies in milliseconds."""
+    results = []
+    for name, mode_env in MODES.items():
+        server = start_server(mode_env)
+        try:
+            drive(path, clients, 2)  # warm up the workers and their connection pools
+            latencies, errors = drive(path, clients, seconds)
+        finally:
+            server.terminate()
+            server.wait()
+        results.append({'name': name, 'requests_per_second': len(latencies) / seconds,
+                        'p50_ms': percentile(latencies, 50) * 1000, 'p99_ms': percentile(latencies, 99) * 1000,
+                        'errors': errors})
+    return results
+
+
+if __name__ == '__main__':
+    ARGS = sys.argv[1:]
+    for result in run(*ARGS[:1], *(int(arg) for arg in ARGS[1:3])):
+        print('  '.join(f'{key} {value:10.2f}' if isinstance(value, float) else f'{key} {value}'
+                        for key, value in result.items()))
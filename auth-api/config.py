@@ -78,6 +78,32 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     )
     SQLALCHEMY_ECHO = False
 
+    # Each worker process has its own connection pool, sized by default to the requests the worker serves at once:
+    # its threads, or its connections for green thread (gevent) workers. A few more are kept for the background
+    # workers, and the pool is capped so that many green workers do not exhaust the connections of the database.
+    if os.getenv('GUNICORN_WORKER_CLASS', 'sync') == 'gevent':
+        WORKER_CONCURRENCY = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '100'))
+    else:
+        WORKER_CONCURRENCY = int(os.getenv('GUNICORN_THREADS', '1'))
+    try:
+        DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE'))
+    except:
+        DB_POOL_SIZE = min(WORKER_CONCURRENCY + 2, 20)
+    try:
+        DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW'))
+    except:
+        DB_POOL_MAX_OVERFLOW = 10
+    try:
+        DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT'))
+    except:
+        DB_POOL_TIMEOUT = 30
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_POOL_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_pre_ping': True
+    }
+
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv('JWT_OIDC_WELL_KNOWN_CONFIG')
     JWT_OIDC_ALGORITHMS = os.getenv('JWT_OIDC_ALGORITHMS')
@@ -90,6 +116,24 @@ class _Config(object):  # pylint: disable=too-few-public-methods
         JWT_OIDC_JWKS_CACHE_TIMEOUT = int(os.getenv('JWT_OIDC_JWKS_CACHE_TIMEOUT'))
     except:
         JWT_OIDC_JWKS_CACHE_TIMEOUT = 300
+    # Shortest time between JWKS refreshes and how long a request waits for one when its key is not in the JWKS
+    try:
+        JWT_OIDC_JWKS_REFRESH_INTERVAL = int(os.getenv('JWT_OIDC_JWKS_REFRESH_INTERVAL'))
+    except:
+        JWT_OIDC_JWKS_REFRESH_INTERVAL = 30
+    try:
+        JWT_OIDC_JWKS_REFRESH_TIMEOUT = int(os.getenv('JWT_OIDC_JWKS_REFRESH_TIMEOUT'))
+    except:
+        JWT_OIDC_JWKS_REFRESH_TIMEOUT = 5
+    # Claims of verified tokens are kept until the token expires, for at most JWT_CLAIMS_CACHE_TTL seconds
+    try:
+        JWT_CLAIMS_CACHE_SIZE = int(os.getenv('JWT_CLAIMS_CACHE_SIZE'))
+    except:
+        JWT_CLAIMS_CACHE_SIZE = 1000
+    try:
+        JWT_CLAIMS_CACHE_TTL = int(os.getenv('JWT_CLAIMS_CACHE_TTL'))
+    except:
+        JWT_CLAIMS_CACHE_TTL = 300
 
     TESTING = False
     DEBUG = False
@@ -106,8 +150,173 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     KEYCLOAK_BCROS_ADMIN_CLIENTID = os.getenv("KEYCLOAK_BCROS_ADMIN_CLIENTID")
     KEYCLOAK_BCROS_ADMIN_SECRET = os.getenv("KEYCLOAK_BCROS_ADMIN_SECRET")
 
+    # Connections kept open per keycloak realm by the admin client
+    try:
+        KEYCLOAK_CONNECTION_POOL_SIZE = int(os.getenv('KEYCLOAK_CONNECTION_POOL_SIZE'))
+    except:
+        KEYCLOAK_CONNECTION_POOL_SIZE = 10
+
+    # Seconds the admin client waits on each keycloak request
+    try:
+        KEYCLOAK_REQUEST_TIMEOUT = int(os.getenv('KEYCLOAK_REQUEST_TIMEOUT'))
+    except:
+        KEYCLOAK_REQUEST_TIMEOUT = 30
+
+    # Parallel keycloak calls made while provisioning bulk users
+    try:
+        BULK_USER_KEYCLOAK_WORKERS = int(os.getenv('BULK_USER_KEYCLOAK_WORKERS'))
+    except:
+        BULK_USER_KEYCLOAK_WORKERS = 5
+
+    # Background bulk user jobs; 0 workers runs the job inside the request that submitted it
+    try:
+        BULK_USER_JOB_WORKERS = int(os.getenv('BULK_USER_JOB_WORKERS'))
+    except:
+        BULK_USER_JOB_WORKERS = 2
+
+    try:
+        BULK_USER_JOB_CHUNK_SIZE = int(os.getenv('BULK_USER_JOB_CHUNK_SIZE'))
+    except:
+        BULK_USER_JOB_CHUNK_SIZE = 50
+
+    # Seconds without progress after which an unfinished job is considered abandoned by its worker
+    try:
+        BULK_USER_JOB_STALE_SECONDS = int(os.getenv('BULK_USER_JOB_STALE_SECONDS'))
+    except:
+        BULK_USER_JOB_STALE_SECONDS = 600
+
+    # A sweeper thread in each process renews the heartbeat of the jobs the process holds, and fails the jobs of
+    # processes which went away; it must poll well within BULK_USER_JOB_STALE_SECONDS
+    BULK_USER_JOB_SWEEPER = os.getenv('BULK_USER_JOB_SWEEPER', 'True') == 'True'
+
+    try:
+        BULK_USER_JOB_SWEEPER_BATCH_SIZE = int(os.getenv('BULK_USER_JOB_SWEEPER_BATCH_SIZE'))
+    except:
+        BULK_USER_JOB_SWEEPER_BATCH_SIZE = 10
+
+    try:
+        BULK_USER_JOB_SWEEPER_POLL_SECONDS = int(os.getenv('BULK_USER_JOB_SWEEPER_POLL_SECONDS'))
+    except:
+        BULK_USER_JOB_SWEEPER_POLL_SECONDS = 60
+
+    # GET /users returns pages of at most this many users; unpaged searches are streamed in batches of this size
+    try:
+        USER_SEARCH_MAX_PAGE_SIZE = int(os.getenv('USER_SEARCH_MAX_PAGE_SIZE'))
+    except:
+        USER_SEARCH_MAX_PAGE_SIZE = 100
+
+    try:
+        USER_SEARCH_STREAM_BATCH_SIZE = int(os.getenv('USER_SEARCH_STREAM_BATCH_SIZE'))
+    except:
+        USER_SEARCH_STREAM_BATCH_SIZE = 500
+
+    # Cache-Control of the reference data endpoints; clients revalidate with the ETag once it is stale
+    CODES_CACHE_CONTROL = os.getenv('CODES_CACHE_CONTROL', 'public, max-age=300')
+    PRODUCTS_CACHE_CONTROL = os.getenv('PRODUCTS_CACHE_CONTROL', 'public, max-age=300')
+    # The terms of use returned depend on the token, so the document is only cached by the browser
+    DOCUMENTS_CACHE_CONTROL = os.getenv('DOCUMENTS_CACHE_CONTROL', 'private, no-cache')
+
+    # Seconds a serialized document is kept before the latest version is read again
+    try:
+        DOCUMENTS_CACHE_TTL = int(os.getenv('DOCUMENTS_CACHE_TTL'))
+    except:
+        DOCUMENTS_CACHE_TTL = 300
+
+    # Emails are saved to an outbox and sent to notify-api by a background dispatcher in each process
+    EMAIL_OUTBOX_DISPATCHER = os.getenv('EMAIL_OUTBOX_DISPATCHER', 'True') == 'True'
+
+    try:
+        EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE'))
+    except:
+        EMAIL_OUTBOX_BATCH_SIZE = 20
+
+    try:
+        EMAIL_OUTBOX_POLL_SECONDS = int(os.getenv('EMAIL_OUTBOX_POLL_SECONDS'))
+    except:
+        EMAIL_OUTBOX_POLL_SECONDS = 5
+
+    # Failed emails are retried after 30s, 60s, 120s... until they have been attempted EMAIL_OUTBOX_MAX_ATTEMPTS times
+    try:
+        EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS'))
+    except:
+        EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+    try:
+        EMAIL_OUTBOX_RETRY_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_SECONDS'))
+    except:
+        EMAIL_OUTBOX_RETRY_SECONDS = 30
+
+    # Seconds an email claimed by a dispatcher is hidden from the others, renewed just before it is sent; it is sent
+    # again if no result is recorded before the lease runs out
+    try:
+        EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS'))
+    except:
+        EMAIL_OUTBOX_LEASE_SECONDS = 120
+
+    # Keycloak group memberships are applied by a background reconciler in each process
+    KEYCLOAK_GROUP_SYNC = os.getenv('KEYCLOAK_GROUP_SYNC', 'True') == 'True'
+
+    try:
+        KEYCLOAK_GROUP_SYNC_BATCH_SIZE = int(os.getenv('KEYCLOAK_GROUP_SYNC_BATCH_SIZE'))
+    except:
+        KEYCLOAK_GROUP_SYNC_BATCH_SIZE = 50
+
+    try:
+        KEYCLOAK_GROUP_SYNC_POLL_SECONDS = int(os.getenv('KEYCLOAK_GROUP_SYNC_POLL_SECONDS'))
+    except:
+        KEYCLOAK_GROUP_SYNC_POLL_SECONDS = 2
+
+    # Failed changes are retried after 10s, 20s, 40s... until attempted KEYCLOAK_GROUP_SYNC_MAX_ATTEMPTS times
+    try:
+        KEYCLOAK_GROUP_SYNC_MAX_ATTEMPTS = int(os.getenv('KEYCLOAK_GROUP_SYNC_MAX_ATTEMPTS'))
+    except:
+        KEYCLOAK_GROUP_SYNC_MAX_ATTEMPTS = 10
+
+    try:
+        KEYCLOAK_GROUP_SYNC_RETRY_SECONDS = int(os.getenv('KEYCLOAK_GROUP_SYNC_RETRY_SECONDS'))
+    except:
+        KEYCLOAK_GROUP_SYNC_RETRY_SECONDS = 10
+
+    # Seconds a reconciler has to apply the changes it claimed before another reconciler may pick them up
+    try:
+        KEYCLOAK_GROUP_SYNC_LEASE_SECONDS = int(os.getenv('KEYCLOAK_GROUP_SYNC_LEASE_SECONDS'))
+    except:
+        KEYCLOAK_GROUP_SYNC_LEASE_SECONDS = 60
+
+    # Encoder for the JSON responses: orjson, or json for the standard library module
+    JSON_ENCODER_BACKEND = os.getenv('JSON_ENCODER_BACKEND', 'orjson')
+
+    # Compress JSON, HTML and text responses for clients which accept one of the encodings
+    RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True') == 'True'
+    RESPONSE_COMPRESSION_ENCODINGS = os.getenv('RESPONSE_COMPRESSION_ENCODINGS', 'br,gzip').split(',')
+
+    # Responses smaller than this many bytes are sent uncompressed
+    try:
+        RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE'))
+    except:
+        RESPONSE_COMPRESSION_MIN_SIZE = 1024
+
+    # Responses of this many bytes or more are compressed in chunks as they are sent
+    try:
+        RESPONSE_COMPRESSION_STREAM_SIZE = int(os.getenv('RESPONSE_COMPRESSION_STREAM_SIZE'))
+    except:
+        RESPONSE_COMPRESSION_STREAM_SIZE = 262144
+
+    try:
+        RESPONSE_COMPRESSION_GZIP_LEVEL = int(os.getenv('RESPONSE_COMPRESSION_GZIP_LEVEL'))
+    except:
+        RESPONSE_COMPRESSION_GZIP_LEVEL = 6
+
+    try:
+        RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.getenv('RESPONSE_COMPRESSION_BROTLI_QUALITY'))
+    except:
+        RESPONSE_COMPRESSION_BROTLI_QUALITY = 4
+
+    # Read the code, type and status tables when the app is created rather than on first use
+    CODE_REGISTRY_PRELOAD = os.getenv('CODE_REGISTRY_PRELOAD', 'True') == 'True'
+
     # Config to skip migrations when alembic migrate is used
-    SKIPPED_MIGRATIONS = ['authorizations_view']
+    SKIPPED_MIGRATIONS = ['authorizations_view', 'authorizations_index']
 
     # email server
     MAIL_SERVER = os.getenv('MAIL_SERVER')
@@ -137,12 +346,42 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     # url for the front end app
     WEB_APP_URL = os.getenv('WEB_APP_URL')
 
+    # Email templates, and the directory their compiled bytecode is kept in for all the worker processes; it must be
+    # writable by the app user only, and defaults to a directory of that user created by Jinja in the temp directory
+    EMAIL_TEMPLATE_DIR = os.path.join(PROJECT_ROOT, 'email_templates')
+    EMAIL_TEMPLATE_BYTECODE_CACHE = os.getenv('EMAIL_TEMPLATE_BYTECODE_CACHE', 'True') == 'True'
+    EMAIL_TEMPLATE_BYTECODE_CACHE_DIR = os.getenv('EMAIL_TEMPLATE_BYTECODE_CACHE_DIR', None)
+
     # Product config json object string - includes URL and description content
     PRODUCT_CONFIG = json.loads(os.getenv('PRODUCT_CONFIG', '[]'))
 
     # BC Online endpoint
     BCOL_API_URL = os.getenv('BCOL_API_URL')  # e.g, https://bcol-api-dev.pathfinder.gov.bc.ca/api/v1
 
+    # Outbound REST calls; timeouts are in seconds, REST_SERVICE_TIMEOUTS maps url prefixes to their own timeout
+    try:
+        CONNECT_TIMEOUT = int(os.getenv('CONNECT_TIMEOUT'))
+    except:
+        CONNECT_TIMEOUT = 60
+
+    REST_SERVICE_TIMEOUTS = json.loads(os.getenv('REST_SERVICE_TIMEOUTS', '{}'))
+
+    try:
+        REST_SERVICE_POOL_SIZE = int(os.getenv('REST_SERVICE_POOL_SIZE'))
+    except:
+        REST_SERVICE_POOL_SIZE = 10
+
+    # Consecutive failures after which calls to a host fail fast, and seconds before the host is tried again
+    try:
+        REST_SERVICE_FAILURE_THRESHOLD = int(os.getenv('REST_SERVICE_FAILURE_THRESHOLD'))
+    except:
+        REST_SERVICE_FAILURE_THRESHOLD = 5
+
+    try:
+        REST_SERVICE_RESET_TIMEOUT = int(os.getenv('REST_SERVICE_RESET_TIMEOUT'))
+    except:
+        REST_SERVICE_RESET_TIMEOUT = 30
+
     try:
         MAX_NUMBER_OF_ORGS = int(os.getenv('MAX_NUMBER_OF_ORGS'))
     except:
@@ -150,6 +389,23 @@ class _Config(object):  # pylint: disable=too-few-public-methods
 
     BCOL_ACCOUNT_LINK_CHECK = os.getenv('BCOL_ACCOUNT_LINK_CHECK', 'True').lower() == 'true'
 
+    # Org names with at least this trigram similarity to an existing org name are duplicates; 0 turns it off
+    try:
+        ORG_NAME_SIMILARITY_THRESHOLD = float(os.getenv('ORG_NAME_SIMILARITY_THRESHOLD'))
+    except:
+        ORG_NAME_SIMILARITY_THRESHOLD = 0
+
+    # Cross request authorization cache; a TTL of 0 keeps the cache to a single request
+    try:
+        AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL'))
+    except:
+        AUTH_CACHE_TTL = 0
+
+    try:
+        AUTH_CACHE_MAX_SIZE = int(os.getenv('AUTH_CACHE_MAX_SIZE'))
+    except:
+        AUTH_CACHE_MAX_SIZE = 10000
+
 
 class DevConfig(_Config):  # pylint: disable=too-few-public-methods
     TESTING = False
@@ -260,6 +516,20 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
 
     BCOL_ACCOUNT_LINK_CHECK = True
 
+    # Run bulk user jobs inline so tests see the finished job
+    BULK_USER_JOB_WORKERS = 0
+
+    # The test database is created after the app, so the code tables are read on first use
+    CODE_REGISTRY_PRELOAD = False
+
+    # Tests insert documents which are rolled back afterwards
+    DOCUMENTS_CACHE_TTL = 0
+
+    # Tests run the background workers themselves, in the test transaction
+    EMAIL_OUTBOX_DISPATCHER = False
+    KEYCLOAK_GROUP_SYNC = False
+    BULK_USER_JOB_SWEEPER = False
+
 
 class ProdConfig(_Config):  # pylint: disable=too-few-public-methods
     """Production environment configuration."""
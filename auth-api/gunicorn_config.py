@@ -20,5 +20,11 @@ import os
 workers = int(os.environ.get('GUNICORN_PROCESSES', '1'))  # pylint: disable=invalid-name
 threads = int(os.environ.get('GUNICORN_THREADS', '1'))  # pylint: disable=invalid-name
 
+# 'gevent' serves each request in a green thread, up to worker_connections at once per worker; threads is then unused.
+# The worker patches the standard library before it loads the app, so the app must not be preloaded in the master.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')  # pylint: disable=invalid-name
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '100'))  # pylint: disable=invalid-name
+preload_app = False  # pylint: disable=invalid-name
+
 forwarded_allow_ips = '*'  # pylint: disable=invalid-name
 secure_scheme_headers = {'X-Forwarded-Proto': 'https'}  # pylint: disable=invalid-name
@@ -50,6 +50,66 @@ def list_routes():
         print(line)
 
 
+@MANAGER.command
+def check_authorizations():
+    """Compare the authorizations index with the authorizations view and print any differences."""
+    from auth_api.models.views.authorization import Authorization
+
+    inconsistencies = Authorization.find_inconsistencies()
+    for row in inconsistencies:
+        print(dict(row))
+    print('{} inconsistent authorization rows found'.format(len(inconsistencies)))
+
+
+@MANAGER.command
+def rebuild_authorizations():
+    """Rebuild the authorizations index from the authorizations view."""
+    from auth_api.models.views.authorization import Authorization
+
+    Authorization.rebuild()
+    db.session.commit()
+
+
+@MANAGER.command
+def dispatch_emails():
+    """Send the due emails in the email outbox until none are left."""
+    from auth_api.services import EmailDispatcher
+
+    batch_size = APP.config.get('EMAIL_OUTBOX_BATCH_SIZE')
+    sent = 0
+    while True:
+        attempted = EmailDispatcher.dispatch_pending(batch_size)
+        sent += attempted
+        if attempted < batch_size:
+            break
+    print('{} emails attempted'.format(sent))
+
+
+@MANAGER.option('--notify-database-url', dest='notify_database_url', default=None,
+                help='also load notifications into this notify-api database')
+@MANAGER.option('--notifications', dest='notifications', type=int, default=None)
+@MANAGER.option('--invitations', dest='invitations', type=int, default=None)
+@MANAGER.option('--entities', dest='entities', type=int, default=None)
+@MANAGER.option('--orgs', dest='orgs', type=int, default=None)
+@MANAGER.option('--users', dest='users', type=int, default=None)
+@MANAGER.option('--scale', dest='scale', type=float, default=1.0, help='1 loads a million users; counts override it')
+@MANAGER.option('--seed', dest='seed', type=int, default=1)
+def generate_data(seed, scale, notify_database_url, **counts):
+    """Bulk load a synthetic dataset of production size, for performance work on a disposable database."""
+    from sqlalchemy import create_engine
+    from benchmarks.datagen import generate
+
+    notify_connection = create_engine(notify_database_url).raw_connection() if notify_database_url else None
+    dataset = generate(db.session.connection().connection, seed=seed, scale=scale,
+                       notify_connection=notify_connection, **counts)
+    db.session.commit()
+    if notify_connection is not None:
+        notify_connection.commit()
+        notify_connection.close()
+    for table, rows in dataset['counts'].items():
+        print('{:25s} {} rows'.format(table, rows))
+
+
 if __name__ == '__main__':
     logging.log(logging.INFO, 'Running the Manager')
     MANAGER.run()
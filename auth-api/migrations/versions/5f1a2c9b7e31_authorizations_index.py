@@ -0,0 +1,170 @@
+"""authorizations index materialized from authorizations_view
+
+Revision ID: 5f1a2c9b7e31
+Revises: 4efb2fdcc1ab
+Create Date: 2020-05-21 10:12:43.512870
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from auth_api.utils.custom_sql import CustomSql
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1a2c9b7e31'
+down_revision = '4efb2fdcc1ab'
+branch_labels = None
+depends_on = None
+
+authorizations_index_columns = 'business_identifier, entity_name, folio_number, corp_type_code, org_membership, ' \
+                               'keycloak_guid, user_id, org_id, org_name, org_type, product_code, ' \
+                               'preferred_payment_code, bcol_user_id, bcol_account_id, roles'
+
+# Re-computes the rows of the index for an org (and optionally a single member of the org) from the view.
+# Passing NULL for the org rebuilds the whole index.
+refresh_authorizations_function = CustomSql('refresh_authorizations',
+                                            'CREATE OR REPLACE FUNCTION refresh_authorizations('
+                                            '   p_org_id integer, p_user_id integer DEFAULT NULL) '
+                                            'RETURNS void AS $$ '
+                                            'BEGIN '
+                                            '   IF p_org_id IS NULL THEN '
+                                            '       DELETE FROM authorizations_index; '
+                                            f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                                            f'       SELECT {authorizations_index_columns} FROM authorizations_view; '
+                                            '   ELSIF p_user_id IS NULL THEN '
+                                            '       DELETE FROM authorizations_index WHERE org_id = p_org_id; '
+                                            f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                                            f'       SELECT {authorizations_index_columns} FROM authorizations_view '
+                                            '       WHERE org_id = p_org_id; '
+                                            '   ELSE '
+                                            '       DELETE FROM authorizations_index '
+                                            '       WHERE org_id = p_org_id AND user_id = p_user_id; '
+                                            f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                                            f'       SELECT {authorizations_index_columns} FROM authorizations_view '
+                                            '       WHERE org_id = p_org_id AND user_id = p_user_id; '
+                                            '   END IF; '
+                                            'END; '
+                                            '$$ LANGUAGE plpgsql;')
+
+# Row level trigger function; works out which orgs (and members) are affected by the change on each source table.
+refresh_authorizations_trigger_function = CustomSql('refresh_authorizations_trigger',
+                                                    'CREATE OR REPLACE FUNCTION refresh_authorizations_trigger() '
+                                                    'RETURNS trigger AS $$ '
+                                                    'DECLARE '
+                                                    '   affected_org_id integer; '
+                                                    'BEGIN '
+                                                    '   IF TG_TABLE_NAME = \'membership\' THEN '
+                                                    '       IF TG_OP = \'DELETE\' THEN '
+                                                    '           PERFORM refresh_authorizations(OLD.org_id, OLD.user_id); '
+                                                    '       ELSE '
+                                                    '           IF TG_OP = \'UPDATE\' THEN '
+                                                    '               IF NEW.org_id IS DISTINCT FROM OLD.org_id '
+                                                    '                       OR NEW.user_id IS DISTINCT FROM OLD.user_id THEN '
+                                                    '                   PERFORM refresh_authorizations(OLD.org_id, OLD.user_id); '
+                                                    '               END IF; '
+                                                    '           END IF; '
+                                                    '           PERFORM refresh_authorizations(NEW.org_id, NEW.user_id); '
+                                                    '       END IF; '
+                                                    '   ELSIF TG_TABLE_NAME IN (\'affiliation\', \'product_subscription\', '
+                                                    '                           \'account_payment_settings\') THEN '
+                                                    '       IF TG_OP = \'DELETE\' THEN '
+                                                    '           PERFORM refresh_authorizations(OLD.org_id); '
+                                                    '       ELSE '
+                                                    '           IF TG_OP = \'UPDATE\' THEN '
+                                                    '               IF NEW.org_id IS DISTINCT FROM OLD.org_id THEN '
+                                                    '                   PERFORM refresh_authorizations(OLD.org_id); '
+                                                    '               END IF; '
+                                                    '           END IF; '
+                                                    '           PERFORM refresh_authorizations(NEW.org_id); '
+                                                    '       END IF; '
+                                                    '   ELSIF TG_TABLE_NAME = \'product_subscription_role\' THEN '
+                                                    '       IF TG_OP = \'DELETE\' THEN '
+                                                    '           SELECT org_id INTO affected_org_id FROM product_subscription '
+                                                    '           WHERE id = OLD.product_subscription_id; '
+                                                    '       ELSE '
+                                                    '           SELECT org_id INTO affected_org_id FROM product_subscription '
+                                                    '           WHERE id = NEW.product_subscription_id; '
+                                                    '       END IF; '
+                                                    '       IF affected_org_id IS NOT NULL THEN '
+                                                    '           PERFORM refresh_authorizations(affected_org_id); '
+                                                    '       END IF; '
+                                                    '   ELSIF TG_TABLE_NAME = \'org\' THEN '
+                                                    '       PERFORM refresh_authorizations(NEW.id); '
+                                                    '   ELSIF TG_TABLE_NAME = \'entity\' THEN '
+                                                    '       FOR affected_org_id IN '
+                                                    '           SELECT org_id FROM affiliation WHERE entity_id = NEW.id '
+                                                    '       LOOP '
+                                                    '           PERFORM refresh_authorizations(affected_org_id); '
+                                                    '       END LOOP; '
+                                                    '   ELSIF TG_TABLE_NAME = \'user\' THEN '
+                                                    '       FOR affected_org_id IN '
+                                                    '           SELECT org_id FROM membership WHERE user_id = NEW.id '
+                                                    '       LOOP '
+                                                    '           PERFORM refresh_authorizations(affected_org_id, NEW.id); '
+                                                    '       END LOOP; '
+                                                    '   END IF; '
+                                                    '   RETURN NULL; '
+                                                    'END; '
+                                                    '$$ LANGUAGE plpgsql;')
+
+# (trigger name, table, events)
+authorizations_index_triggers = [
+    ('membership_authorizations_trigger', 'membership', 'INSERT OR UPDATE OR DELETE'),
+    ('affiliation_authorizations_trigger', 'affiliation', 'INSERT OR UPDATE OR DELETE'),
+    ('product_subscription_authorizations_trigger', 'product_subscription', 'INSERT OR UPDATE OR DELETE'),
+    ('product_subscription_role_authorizations_trigger', 'product_subscription_role', 'INSERT OR UPDATE OR DELETE'),
+    ('account_payment_settings_authorizations_trigger', 'account_payment_settings', 'INSERT OR UPDATE OR DELETE'),
+    ('org_authorizations_trigger', 'org', 'UPDATE OF name, type_code'),
+    ('entity_authorizations_trigger', 'entity', 'UPDATE OF business_identifier, name, folio_number, corp_type_code'),
+    ('user_authorizations_trigger', '"user"', 'UPDATE OF keycloak_guid'),
+]
+
+
+def upgrade():
+    op.create_table('authorizations_index',
+                    sa.Column('business_identifier', sa.String(length=75), nullable=True),
+                    sa.Column('entity_name', sa.String(length=250), nullable=True),
+                    sa.Column('folio_number', sa.String(length=50), nullable=True),
+                    sa.Column('corp_type_code', sa.String(length=10), nullable=True),
+                    sa.Column('org_membership', sa.String(length=15), nullable=True),
+                    sa.Column('keycloak_guid', postgresql.UUID(), nullable=True),
+                    sa.Column('user_id', sa.Integer(), nullable=True),
+                    sa.Column('org_id', sa.Integer(), nullable=True),
+                    sa.Column('org_name', sa.String(length=250), nullable=True),
+                    sa.Column('org_type', sa.String(length=15), nullable=True),
+                    sa.Column('product_code', sa.String(length=15), nullable=True),
+                    sa.Column('preferred_payment_code', sa.String(length=15), nullable=True),
+                    sa.Column('bcol_user_id', sa.String(length=20), nullable=True),
+                    sa.Column('bcol_account_id', sa.String(length=20), nullable=True),
+                    sa.Column('roles', sa.Text(), nullable=True)
+                    )
+    op.create_index('ix_authorizations_index_key', 'authorizations_index',
+                    ['keycloak_guid', 'org_id', 'business_identifier', 'product_code'], unique=False)
+    op.create_index('ix_authorizations_index_business_identifier', 'authorizations_index',
+                    ['business_identifier', 'corp_type_code'], unique=False)
+    op.create_index('ix_authorizations_index_org_id', 'authorizations_index', ['org_id', 'user_id'], unique=False)
+
+    op.execute(refresh_authorizations_function.sql)
+    op.execute(refresh_authorizations_trigger_function.sql)
+
+    for trigger_name, table_name, events in authorizations_index_triggers:
+        op.execute(f'CREATE TRIGGER {trigger_name} AFTER {events} ON {table_name} '
+                   f'FOR EACH ROW EXECUTE PROCEDURE {refresh_authorizations_trigger_function.name}()')
+
+    # Backfill the index from the view
+    op.execute(f'SELECT {refresh_authorizations_function.name}(NULL)')
+
+
+def downgrade():
+    for trigger_name, table_name, _ in authorizations_index_triggers:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}')
+
+    op.execute(f'DROP FUNCTION IF EXISTS {refresh_authorizations_trigger_function.name}()')
+    op.execute(f'DROP FUNCTION IF EXISTS {refresh_authorizations_function.name}(integer, integer)')
+
+    op.drop_index('ix_authorizations_index_org_id', table_name='authorizations_index')
+    op.drop_index('ix_authorizations_index_business_identifier', table_name='authorizations_index')
+    op.drop_index('ix_authorizations_index_key', table_name='authorizations_index')
+    op.drop_table('authorizations_index')
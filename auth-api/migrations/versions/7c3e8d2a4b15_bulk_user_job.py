@@ -0,0 +1,44 @@
+"""bulk user job table
+
+Revision ID: 7c3e8d2a4b15
+Revises: 5f1a2c9b7e31
+Create Date: 2020-05-25 09:41:18.204511
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e8d2a4b15'
+down_revision = '5f1a2c9b7e31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('bulk_user_job',
+                    sa.Column('created', sa.DateTime(), nullable=True),
+                    sa.Column('modified', sa.DateTime(), nullable=True),
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('org_id', sa.Integer(), nullable=False),
+                    sa.Column('status', sa.String(length=20), nullable=False),
+                    sa.Column('total', sa.Integer(), nullable=False),
+                    sa.Column('processed', sa.Integer(), nullable=False),
+                    sa.Column('users', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+                    sa.Column('results', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+                    sa.Column('heartbeat', sa.DateTime(), nullable=True),
+                    sa.Column('created_by_id', sa.Integer(), nullable=True),
+                    sa.Column('modified_by_id', sa.Integer(), nullable=True),
+                    sa.ForeignKeyConstraint(['created_by_id'], ['user.id'], ),
+                    sa.ForeignKeyConstraint(['modified_by_id'], ['user.id'], ),
+                    sa.ForeignKeyConstraint(['org_id'], ['org.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index(op.f('ix_bulk_user_job_status'), 'bulk_user_job', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_bulk_user_job_status'), table_name='bulk_user_job')
+    op.drop_table('bulk_user_job')
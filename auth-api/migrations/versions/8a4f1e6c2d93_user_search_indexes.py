@@ -0,0 +1,30 @@
+"""trigram indexes for user search
+
+Revision ID: 8a4f1e6c2d93
+Revises: 7c3e8d2a4b15
+Create Date: 2020-05-27 14:22:05.318442
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4f1e6c2d93'
+down_revision = '7c3e8d2a4b15'
+branch_labels = None
+depends_on = None
+
+# User.search_filter matches on the lower cased columns; GIN trigram indexes serve both its prefix LIKE and its
+# similarity (%) conditions.
+user_search_columns = ['first_name', 'last_name', 'email']
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in user_search_columns:
+        op.execute(f'CREATE INDEX IF NOT EXISTS ix_user_{column}_trgm ON "user" USING gin (lower({column}) gin_trgm_ops)')
+
+
+def downgrade():
+    for column in user_search_columns:
+        op.execute(f'DROP INDEX IF EXISTS ix_user_{column}_trgm')
@@ -0,0 +1,32 @@
+"""normalized org name and trigram index for duplicate org name checks
+
+Revision ID: 9b2d7f3a5e18
+Revises: 8a4f1e6c2d93
+Create Date: 2020-05-28 11:05:47.620915
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2d7f3a5e18'
+down_revision = '8a4f1e6c2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('org', sa.Column('normalized_name', sa.String(length=250), nullable=True))
+    # Same normalization as Org.normalize_name: trimmed, inner whitespace collapsed and lower cased.
+    op.execute("UPDATE org SET normalized_name = lower(regexp_replace(trim(name), '\\s+', ' ', 'g'))")
+    op.create_index(op.f('ix_org_normalized_name'), 'org', ['normalized_name'], unique=False)
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_org_name_trgm ON org USING gin (lower(name) gin_trgm_ops)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_org_name_trgm')
+    op.drop_index(op.f('ix_org_normalized_name'), table_name='org')
+    op.drop_column('org', 'normalized_name')
@@ -0,0 +1,44 @@
+"""email outbox table
+
+Revision ID: a3c7e5f2b961
+Revises: 9b2d7f3a5e18
+Create Date: 2020-06-08 10:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c7e5f2b961'
+down_revision = '9b2d7f3a5e18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_outbox',
+                    sa.Column('created', sa.DateTime(), nullable=True),
+                    sa.Column('modified', sa.DateTime(), nullable=True),
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('recipients', sa.Text(), nullable=False),
+                    sa.Column('subject', sa.Text(), nullable=False),
+                    sa.Column('body', sa.Text(), nullable=False),
+                    sa.Column('status', sa.String(length=20), nullable=False),
+                    sa.Column('attempts', sa.Integer(), nullable=False),
+                    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+                    sa.Column('last_error', sa.Text(), nullable=True),
+                    sa.Column('sent_at', sa.DateTime(), nullable=True),
+                    sa.Column('created_by_id', sa.Integer(), nullable=True),
+                    sa.Column('modified_by_id', sa.Integer(), nullable=True),
+                    sa.ForeignKeyConstraint(['created_by_id'], ['user.id'], ),
+                    sa.ForeignKeyConstraint(['modified_by_id'], ['user.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_email_outbox_status_next_attempt_at', 'email_outbox', ['status', 'next_attempt_at'],
+                    unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,41 @@
+"""keycloak group sync table
+
+Revision ID: b5d1f8a3c247
+Revises: a3c7e5f2b961
+Create Date: 2020-06-12 14:27:09.551830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d1f8a3c247'
+down_revision = 'a3c7e5f2b961'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('keycloak_group_sync',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('keycloak_guid', postgresql.UUID(as_uuid=True), nullable=False),
+                    sa.Column('group_name', sa.String(length=50), nullable=False),
+                    sa.Column('member', sa.Boolean(), nullable=False),
+                    sa.Column('applied_member', sa.Boolean(), nullable=True),
+                    sa.Column('version', sa.Integer(), nullable=False),
+                    sa.Column('attempts', sa.Integer(), nullable=False),
+                    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+                    sa.Column('last_error', sa.Text(), nullable=True),
+                    sa.Column('modified', sa.DateTime(), nullable=True),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('keycloak_guid', 'group_name', name='uq_keycloak_group_sync_guid_group')
+                    )
+    op.create_index(op.f('ix_keycloak_group_sync_next_attempt_at'), 'keycloak_group_sync', ['next_attempt_at'],
+                    unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_keycloak_group_sync_next_attempt_at'), table_name='keycloak_group_sync')
+    op.drop_table('keycloak_group_sync')
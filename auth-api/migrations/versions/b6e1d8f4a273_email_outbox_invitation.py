@@ -0,0 +1,26 @@
+"""link outbox emails to the invitation they send
+
+Revision ID: b6e1d8f4a273
+Revises: f3a9d5b2c816
+Create Date: 2020-06-19 09:41:27.530162
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d8f4a273'
+down_revision = 'f3a9d5b2c816'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('email_outbox', sa.Column('invitation_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('email_outbox_invitation_id_fkey', 'email_outbox', 'invitation', ['invitation_id'], ['id'])
+
+
+def downgrade():
+    op.drop_constraint('email_outbox_invitation_id_fkey', 'email_outbox', type_='foreignkey')
+    op.drop_column('email_outbox', 'invitation_id')
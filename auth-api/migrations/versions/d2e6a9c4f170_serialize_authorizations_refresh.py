@@ -0,0 +1,74 @@
+"""serialize refresh_authorizations with advisory locks
+
+Revision ID: d2e6a9c4f170
+Revises: b5d1f8a3c247
+Create Date: 2020-06-15 09:41:22.318604
+
+"""
+from alembic import op
+
+from auth_api.utils.custom_sql import CustomSql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e6a9c4f170'
+down_revision = 'b5d1f8a3c247'
+branch_labels = None
+depends_on = None
+
+authorizations_index_columns = 'business_identifier, entity_name, folio_number, corp_type_code, org_membership, ' \
+                               'keycloak_guid, user_id, org_id, org_name, org_type, product_code, ' \
+                               'preferred_payment_code, bcol_user_id, bcol_account_id, roles'
+
+# Advisory lock keys: (AUTHORIZATIONS_LOCK, 0) guards the whole index and (AUTHORIZATIONS_ORG_LOCK, org id) an org.
+AUTHORIZATIONS_LOCK = 5172001
+AUTHORIZATIONS_ORG_LOCK = 5172002
+
+# A refresh of an org takes the index lock shared and the org lock exclusive, and a rebuild takes the index lock
+# exclusive, so refreshes of the same rows wait for each other until commit. Under READ COMMITTED each statement
+# of the waiting refresh then sees the rows the other committed, so the DELETE removes them before the INSERT.
+_locks = {
+    'rebuild': f'       PERFORM pg_advisory_xact_lock({AUTHORIZATIONS_LOCK}, 0); ',
+    'org': f'       PERFORM pg_advisory_xact_lock_shared({AUTHORIZATIONS_LOCK}, 0); '
+           f'       PERFORM pg_advisory_xact_lock({AUTHORIZATIONS_ORG_LOCK}, p_org_id); '
+}
+_no_locks = {'rebuild': '', 'org': ''}
+
+
+def _refresh_authorizations_function(locks):
+    return CustomSql('refresh_authorizations',
+                     'CREATE OR REPLACE FUNCTION refresh_authorizations('
+                     '   p_org_id integer, p_user_id integer DEFAULT NULL) '
+                     'RETURNS void AS $$ '
+                     'BEGIN '
+                     '   IF p_org_id IS NULL THEN '
+                     f'{locks["rebuild"]}'
+                     '       DELETE FROM authorizations_index; '
+                     f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                     f'       SELECT {authorizations_index_columns} FROM authorizations_view; '
+                     '   ELSIF p_user_id IS NULL THEN '
+                     f'{locks["org"]}'
+                     '       DELETE FROM authorizations_index WHERE org_id = p_org_id; '
+                     f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                     f'       SELECT {authorizations_index_columns} FROM authorizations_view '
+                     '       WHERE org_id = p_org_id; '
+                     '   ELSE '
+                     f'{locks["org"]}'
+                     '       DELETE FROM authorizations_index '
+                     '       WHERE org_id = p_org_id AND user_id = p_user_id; '
+                     f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                     f'       SELECT {authorizations_index_columns} FROM authorizations_view '
+                     '       WHERE org_id = p_org_id AND user_id = p_user_id; '
+                     '   END IF; '
+                     'END; '
+                     '$$ LANGUAGE plpgsql;')
+
+
+def upgrade():
+    op.execute(_refresh_authorizations_function(_locks).sql)
+    # Clear out any rows duplicated by concurrent refreshes before the locks were taken.
+    op.execute('SELECT refresh_authorizations(NULL)')
+
+
+def downgrade():
+    op.execute(_refresh_authorizations_function(_no_locks).sql)
@@ -0,0 +1,28 @@
+"""bulk user job owner, without passwords
+
+Revision ID: e4b8c1d7a925
+Revises: d2e6a9c4f170
+Create Date: 2020-06-16 10:12:47.530182
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8c1d7a925'
+down_revision = 'd2e6a9c4f170'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('bulk_user_job', sa.Column('owner', sa.String(length=100), nullable=True))
+    # Passwords are no longer saved with a job: drop the users of finished jobs and the passwords of the others.
+    op.execute("UPDATE bulk_user_job SET users = NULL WHERE status IN ('COMPLETED', 'FAILED')")
+    op.execute("UPDATE bulk_user_job SET users = (SELECT jsonb_agg(u.value - 'password' ORDER BY u.ordinality) "
+               'FROM jsonb_array_elements(users) WITH ORDINALITY u) WHERE users IS NOT NULL')
+
+
+def downgrade():
+    op.drop_column('bulk_user_job', 'owner')
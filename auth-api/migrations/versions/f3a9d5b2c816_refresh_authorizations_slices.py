@@ -0,0 +1,248 @@
+"""refresh only the authorizations index rows a change affects
+
+Revision ID: f3a9d5b2c816
+Revises: e4b8c1d7a925
+Create Date: 2020-06-18 14:05:31.904217
+
+"""
+from alembic import op
+
+from auth_api.utils.custom_sql import CustomSql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9d5b2c816'
+down_revision = 'e4b8c1d7a925'
+branch_labels = None
+depends_on = None
+
+authorizations_index_columns = 'business_identifier, entity_name, folio_number, corp_type_code, org_membership, ' \
+                               'keycloak_guid, user_id, org_id, org_name, org_type, product_code, ' \
+                               'preferred_payment_code, bcol_user_id, bcol_account_id, roles'
+
+# The advisory locks of d2e6a9c4f170: the index lock shared and the org lock exclusive, held until commit.
+AUTHORIZATIONS_LOCK = 5172001
+AUTHORIZATIONS_ORG_LOCK = 5172002
+
+lock_authorizations_org_function = CustomSql('lock_authorizations_org',
+                                             'CREATE OR REPLACE FUNCTION lock_authorizations_org(p_org_id integer) '
+                                             'RETURNS void AS $$ '
+                                             'BEGIN '
+                                             f'   PERFORM pg_advisory_xact_lock_shared({AUTHORIZATIONS_LOCK}, 0); '
+                                             f'   PERFORM pg_advisory_xact_lock({AUTHORIZATIONS_ORG_LOCK}, p_org_id); '
+                                             'END; '
+                                             '$$ LANGUAGE plpgsql;')
+
+
+def _refresh_slice_function(name: str, column: str, exists_sql: str):
+    """Return a function which refreshes the rows of an org with the given values of the column.
+
+    The rows with a NULL value stand for an org without any rows in the table behind the column, so they are
+    refreshed too, and only rebuilt if the org has none left. With no values the whole org is refreshed.
+    """
+    return CustomSql(name,
+                     f'CREATE OR REPLACE FUNCTION {name}(p_org_id integer, p_values text[]) '
+                     'RETURNS void AS $$ '
+                     'BEGIN '
+                     '   IF p_values IS NULL OR cardinality(p_values) = 0 THEN '
+                     '       PERFORM refresh_authorizations(p_org_id); '
+                     '       RETURN; '
+                     '   END IF; '
+                     '   PERFORM lock_authorizations_org(p_org_id); '
+                     '   DELETE FROM authorizations_index '
+                     f'   WHERE org_id = p_org_id AND ({column} = ANY(p_values) OR {column} IS NULL); '
+                     f'   INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                     f'   SELECT {authorizations_index_columns} FROM authorizations_view '
+                     f'   WHERE org_id = p_org_id AND {column} = ANY(p_values); '
+                     f'   IF NOT EXISTS ({exists_sql}) THEN '
+                     f'       INSERT INTO authorizations_index ({authorizations_index_columns}) '
+                     f'       SELECT {authorizations_index_columns} FROM authorizations_view '
+                     f'       WHERE org_id = p_org_id AND {column} IS NULL; '
+                     '   END IF; '
+                     'END; '
+                     '$$ LANGUAGE plpgsql;')
+
+
+refresh_businesses_function = _refresh_slice_function(
+    'refresh_authorizations_businesses', 'business_identifier',
+    'SELECT 1 FROM affiliation WHERE org_id = p_org_id')
+refresh_products_function = _refresh_slice_function(
+    'refresh_authorizations_products', 'product_code',
+    'SELECT 1 FROM product_subscription WHERE org_id = p_org_id')
+
+# Row level trigger function. Changes to the rows of an org's entities or products refresh only the rows of those
+# entities or products, and renames are updated in place. Orgs are locked in org id order, so that transactions
+# changing the same orgs wait for each other rather than deadlock.
+refresh_authorizations_trigger_function = CustomSql(
+    'refresh_authorizations_trigger',
+    'CREATE OR REPLACE FUNCTION refresh_authorizations_trigger() '
+    'RETURNS trigger AS $$ '
+    'DECLARE '
+    '   affected_org_id integer; '
+    '   affected_product_code text; '
+    'BEGIN '
+    '   IF TG_TABLE_NAME = \'membership\' THEN '
+    '       IF TG_OP = \'DELETE\' THEN '
+    '           PERFORM refresh_authorizations(OLD.org_id, OLD.user_id); '
+    '       ELSE '
+    '           IF TG_OP = \'UPDATE\' THEN '
+    '               IF NEW.org_id IS DISTINCT FROM OLD.org_id '
+    '                       OR NEW.user_id IS DISTINCT FROM OLD.user_id THEN '
+    '                   PERFORM refresh_authorizations(OLD.org_id, OLD.user_id); '
+    '               END IF; '
+    '           END IF; '
+    '           PERFORM refresh_authorizations(NEW.org_id, NEW.user_id); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'affiliation\' THEN '
+    '       IF TG_OP IN (\'UPDATE\', \'DELETE\') THEN '
+    '           PERFORM refresh_authorizations_businesses(OLD.org_id, '
+    '               ARRAY(SELECT business_identifier::text FROM entity WHERE id = OLD.entity_id)); '
+    '       END IF; '
+    '       IF TG_OP IN (\'INSERT\', \'UPDATE\') THEN '
+    '           PERFORM refresh_authorizations_businesses(NEW.org_id, '
+    '               ARRAY(SELECT business_identifier::text FROM entity WHERE id = NEW.entity_id)); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'product_subscription\' THEN '
+    '       IF TG_OP IN (\'UPDATE\', \'DELETE\') THEN '
+    '           PERFORM refresh_authorizations_products(OLD.org_id, ARRAY[OLD.product_code::text]); '
+    '       END IF; '
+    '       IF TG_OP IN (\'INSERT\', \'UPDATE\') THEN '
+    '           PERFORM refresh_authorizations_products(NEW.org_id, ARRAY[NEW.product_code::text]); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'product_subscription_role\' THEN '
+    '       IF TG_OP = \'DELETE\' THEN '
+    '           SELECT org_id, product_code INTO affected_org_id, affected_product_code '
+    '           FROM product_subscription WHERE id = OLD.product_subscription_id; '
+    '       ELSE '
+    '           SELECT org_id, product_code INTO affected_org_id, affected_product_code '
+    '           FROM product_subscription WHERE id = NEW.product_subscription_id; '
+    '       END IF; '
+    '       IF affected_org_id IS NOT NULL THEN '
+    '           PERFORM refresh_authorizations_products(affected_org_id, ARRAY[affected_product_code]); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'account_payment_settings\' THEN '
+    # The payment columns are on every row of the org, and only orgs with active settings are in the view.
+    '       IF TG_OP = \'UPDATE\' AND NEW.org_id = OLD.org_id '
+    '               AND NEW.is_active IS TRUE AND OLD.is_active IS TRUE THEN '
+    '           PERFORM lock_authorizations_org(NEW.org_id); '
+    '           UPDATE authorizations_index SET preferred_payment_code = NEW.preferred_payment_code, '
+    '               bcol_user_id = NEW.bcol_user_id, bcol_account_id = NEW.bcol_account_id '
+    '           WHERE org_id = NEW.org_id; '
+    '       ELSE '
+    '           IF TG_OP IN (\'UPDATE\', \'DELETE\') AND OLD.is_active IS TRUE THEN '
+    '               PERFORM refresh_authorizations(OLD.org_id); '
+    '           END IF; '
+    '           IF TG_OP IN (\'INSERT\', \'UPDATE\') AND NEW.is_active IS TRUE THEN '
+    '               PERFORM refresh_authorizations(NEW.org_id); '
+    '           END IF; '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'org\' THEN '
+    '       PERFORM lock_authorizations_org(NEW.id); '
+    '       UPDATE authorizations_index SET org_name = NEW.name, org_type = NEW.type_code '
+    '       WHERE org_id = NEW.id; '
+    '   ELSIF TG_TABLE_NAME = \'entity\' THEN '
+    '       FOR affected_org_id IN '
+    '           SELECT DISTINCT org_id FROM affiliation WHERE entity_id = NEW.id ORDER BY org_id '
+    '       LOOP '
+    '           IF NEW.business_identifier IS DISTINCT FROM OLD.business_identifier THEN '
+    '               PERFORM refresh_authorizations_businesses(affected_org_id, '
+    '                   ARRAY[OLD.business_identifier::text, NEW.business_identifier::text]); '
+    '           ELSE '
+    '               PERFORM lock_authorizations_org(affected_org_id); '
+    '               UPDATE authorizations_index SET entity_name = NEW.name, folio_number = NEW.folio_number, '
+    '                   corp_type_code = NEW.corp_type_code '
+    '               WHERE org_id = affected_org_id AND business_identifier = NEW.business_identifier; '
+    '           END IF; '
+    '       END LOOP; '
+    '   ELSIF TG_TABLE_NAME = \'user\' THEN '
+    '       FOR affected_org_id IN '
+    '           SELECT DISTINCT org_id FROM membership WHERE user_id = NEW.id ORDER BY org_id '
+    '       LOOP '
+    '           PERFORM lock_authorizations_org(affected_org_id); '
+    '       END LOOP; '
+    '       UPDATE authorizations_index SET keycloak_guid = NEW.keycloak_guid WHERE user_id = NEW.id; '
+    '   END IF; '
+    '   RETURN NULL; '
+    'END; '
+    '$$ LANGUAGE plpgsql;')
+
+# The trigger function of 5f1a2c9b7e31, which refreshes whole orgs.
+org_refresh_authorizations_trigger_function = CustomSql(
+    'refresh_authorizations_trigger',
+    'CREATE OR REPLACE FUNCTION refresh_authorizations_trigger() '
+    'RETURNS trigger AS $$ '
+    'DECLARE '
+    '   affected_org_id integer; '
+    'BEGIN '
+    '   IF TG_TABLE_NAME = \'membership\' THEN '
+    '       IF TG_OP = \'DELETE\' THEN '
+    '           PERFORM refresh_authorizations(OLD.org_id, OLD.user_id); '
+    '       ELSE '
+    '           IF TG_OP = \'UPDATE\' THEN '
+    '               IF NEW.org_id IS DISTINCT FROM OLD.org_id '
+    '                       OR NEW.user_id IS DISTINCT FROM OLD.user_id THEN '
+    '                   PERFORM refresh_authorizations(OLD.org_id, OLD.user_id); '
+    '               END IF; '
+    '           END IF; '
+    '           PERFORM refresh_authorizations(NEW.org_id, NEW.user_id); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME IN (\'affiliation\', \'product_subscription\', '
+    '                           \'account_payment_settings\') THEN '
+    '       IF TG_OP = \'DELETE\' THEN '
+    '           PERFORM refresh_authorizations(OLD.org_id); '
+    '       ELSE '
+    '           IF TG_OP = \'UPDATE\' THEN '
+    '               IF NEW.org_id IS DISTINCT FROM OLD.org_id THEN '
+    '                   PERFORM refresh_authorizations(OLD.org_id); '
+    '               END IF; '
+    '           END IF; '
+    '           PERFORM refresh_authorizations(NEW.org_id); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'product_subscription_role\' THEN '
+    '       IF TG_OP = \'DELETE\' THEN '
+    '           SELECT org_id INTO affected_org_id FROM product_subscription '
+    '           WHERE id = OLD.product_subscription_id; '
+    '       ELSE '
+    '           SELECT org_id INTO affected_org_id FROM product_subscription '
+    '           WHERE id = NEW.product_subscription_id; '
+    '       END IF; '
+    '       IF affected_org_id IS NOT NULL THEN '
+    '           PERFORM refresh_authorizations(affected_org_id); '
+    '       END IF; '
+    '   ELSIF TG_TABLE_NAME = \'org\' THEN '
+    '       PERFORM refresh_authorizations(NEW.id); '
+    '   ELSIF TG_TABLE_NAME = \'entity\' THEN '
+    '       FOR affected_org_id IN '
+    '           SELECT org_id FROM affiliation WHERE entity_id = NEW.id '
+    '       LOOP '
+    '           PERFORM refresh_authorizations(affected_org_id); '
+    '       END LOOP; '
+    '   ELSIF TG_TABLE_NAME = \'user\' THEN '
+    '       FOR affected_org_id IN '
+    '           SELECT org_id FROM membership WHERE user_id = NEW.id '
+    '       LOOP '
+    '           PERFORM refresh_authorizations(affected_org_id, NEW.id); '
+    '       END LOOP; '
+    '   END IF; '
+    '   RETURN NULL; '
+    'END; '
+    '$$ LANGUAGE plpgsql;')
+
+
+def upgrade():
+    op.create_index('ix_authorizations_index_org_business', 'authorizations_index',
+                    ['org_id', 'business_identifier'], unique=False)
+    op.create_index('ix_authorizations_index_user_id', 'authorizations_index', ['user_id'], unique=False)
+    op.execute(lock_authorizations_org_function.sql)
+    op.execute(refresh_businesses_function.sql)
+    op.execute(refresh_products_function.sql)
+    op.execute(refresh_authorizations_trigger_function.sql)
+
+
+def downgrade():
+    op.execute(org_refresh_authorizations_trigger_function.sql)
+    op.execute(f'DROP FUNCTION IF EXISTS {refresh_products_function.name}(integer, text[])')
+    op.execute(f'DROP FUNCTION IF EXISTS {refresh_businesses_function.name}(integer, text[])')
+    op.execute(f'DROP FUNCTION IF EXISTS {lock_authorizations_org_function.name}(integer)')
+    op.drop_index('ix_authorizations_index_user_id', table_name='authorizations_index')
+    op.drop_index('ix_authorizations_index_org_business', table_name='authorizations_index')
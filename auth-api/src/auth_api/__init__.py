@@ -26,6 +26,10 @@ from auth_api import models
 from auth_api.extensions import mail
 from auth_api.jwt_wrapper import JWTWrapper
 from auth_api.models import db, ma
+from auth_api.models.code_registry import CodeRegistry
+from auth_api.schemas import utils as schema_utils
+from auth_api.utils import compression, green
+from auth_api.utils.email_templates import EmailTemplates
 from auth_api.utils.run_version import get_run_version
 from auth_api.utils.util_logging import setup_logging
 from config import CONFIGURATION, _Config
@@ -54,6 +58,9 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     from auth_api.resources import API_BLUEPRINT, OPS_BLUEPRINT, \
         TEST_BLUEPRINT  # pylint: disable=import-outside-toplevel
 
+    # Before any connection is made to the database; does nothing unless the worker is a gevent one.
+    green.init_app(app)
+
     db.init_app(app)
     ma.init_app(app)
     mail.init_app(app)
@@ -69,6 +76,44 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
 
     ExceptionHandler(app)
 
+    # Read the JSON schemas now rather than on the first request which validates a payload.
+    schema_utils.get_schema_store()
+
+    # Compile the email templates once here; forked workers share them, and later processes read their bytecode.
+    EmailTemplates.init_app(app)
+
+    if app.config.get('CODE_REGISTRY_PRELOAD', True):
+        with app.app_context():
+            # Read the code tables now; the connection is not kept, so forked workers do not share it.
+            CodeRegistry.load()
+            db.session.remove()
+            db.get_engine(app).dispose()
+
+    if app.config.get('EMAIL_OUTBOX_DISPATCHER', True):
+        from auth_api.services import EmailDispatcher  # pylint: disable=import-outside-toplevel
+
+        @app.before_first_request
+        def start_email_dispatcher():  # pylint: disable=unused-variable
+            # Started by the first request, so each worker process runs its own dispatcher.
+            EmailDispatcher.start(app)
+
+    if app.config.get('KEYCLOAK_GROUP_SYNC', True):
+        from auth_api.services import KeycloakGroupSync  # pylint: disable=import-outside-toplevel
+
+        @app.before_first_request
+        def start_keycloak_group_sync():  # pylint: disable=unused-variable
+            KeycloakGroupSync.start(app)
+
+    if app.config.get('BULK_USER_JOB_SWEEPER', True):
+        from auth_api.services import BulkUserJob  # pylint: disable=import-outside-toplevel
+
+        @app.before_first_request
+        def start_bulk_user_job_sweeper():  # pylint: disable=unused-variable
+            BulkUserJob.start(app)
+
+    # Registered before the other after request functions, so the compression runs after them.
+    compression.init_app(app)
+
     @app.after_request
     def add_version(response):  # pylint: disable=unused-variable
         version = get_run_version()
@@ -15,12 +15,173 @@
 
 This module is a wrapper for the Flask JwtManager
 """
+import hashlib
+import threading
+import time
+from typing import Dict
+
+from flask import _request_ctx_stack, current_app, g
+from flask_jwt_oidc import JwtManager
+from jose import jwt
+
+from auth_api.utils.cache import TTLCache
+
+
+class CachingJwtManager(JwtManager):
+    """JwtManager which keeps the claims of verified tokens and the JWKS in memory.
+
+    A token is verified once; its claims are then served from a bounded cache, keyed by a hash of the token, until
+    the token expires. The JWKS is fetched when the app starts and refreshed in a background thread when it is stale
+    or a token names a key it does not hold.
+    """
+
+    def __init__(self, app=None):
+        """Create the manager; the caches are sized by init_app."""
+        self.claims_cache = TTLCache(max_size=0)
+        self.claims_ttl = 0
+        self.jwks_cache_timeout = 300
+        self.jwks_refresh_interval = 30
+        self.jwks_refresh_timeout = 5
+        self._jwks = None
+        self._jwks_fetched_at = 0
+        self._jwks_refreshed_at = None
+        self._jwks_refresh = None
+        self._jwks_lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'jwksRefreshes': 0, 'jwksErrors': 0}
+        self._metrics_lock = threading.Lock()
+        super().__init__(app)
+
+    def init_app(self, app):
+        """Configure the manager from the app and prefetch the JWKS."""
+        super().init_app(app)
+        self.claims_cache = TTLCache(max_size=app.config.get('JWT_CLAIMS_CACHE_SIZE', 1000))
+        self.claims_ttl = app.config.get('JWT_CLAIMS_CACHE_TTL', 300)
+        self.jwks_cache_timeout = app.config.get('JWT_OIDC_JWKS_CACHE_TIMEOUT', 300)
+        self.jwks_refresh_interval = app.config.get('JWT_OIDC_JWKS_REFRESH_INTERVAL', 30)
+        self.jwks_refresh_timeout = app.config.get('JWT_OIDC_JWKS_REFRESH_TIMEOUT', 5)
+        # The JWKS is kept here rather than in the cache of JwtManager, which refetches it inside the request.
+        self.caching_enabled = False
+        self.cache = None
+        self._jwks = None
+        if not self.jwt_oidc_test_mode and self.jwks_uri:
+            try:
+                self._store_jwks(self._fetch_jwks_from_url())
+            except Exception as err:  # NOQA # pylint: disable=broad-except
+                app.logger.warning('Could not prefetch the JWKS from {}: {}'.format(self.jwks_uri, err))
+
+    def _require_auth_validation(self, *args, **kwargs):
+        """Verify the bearer token, or take its claims from the cache if it has been verified before."""
+        key = hashlib.sha256(self.get_token_auth_header().encode('utf-8')).hexdigest()
+        claims = self.claims_cache.get(key)
+        if claims is not None:
+            self._record('hits')
+            _request_ctx_stack.top.current_user = g.jwt_oidc_token_info = dict(claims)
+            return
+
+        self._record('misses')
+        super()._require_auth_validation(*args, **kwargs)
+        claims = g.jwt_oidc_token_info
+        ttl = self.claims_ttl
+        if 'exp' in claims:
+            ttl = min(ttl, claims['exp'] - time.time())
+        if ttl > 0:
+            self.claims_cache.set(key, dict(claims), ttl=ttl)
+
+    def contains_role(self, roles):
+        """Return True if the verified token holds any of the roles."""
+        roles_in_token = self._get_roles()
+        return any(elem in roles_in_token for elem in roles)
+
+    def validate_roles(self, required_roles):
+        """Return True if the verified token holds all of the roles."""
+        roles_in_token = self._get_roles()
+        return all(elem in roles_in_token for elem in required_roles)
+
+    def get_jwks(self):
+        """Return the JWKS, starting a background refresh when it is older than the cache timeout."""
+        if self.jwt_oidc_test_mode:
+            return self.jwt_oidc_test_keys
+
+        jwks = self._jwks
+        if jwks is None:
+            # Nothing to serve while a refresh runs, so the first fetch is made by the request itself.
+            jwks = self._fetch_jwks_from_url()
+            self._store_jwks(jwks)
+        elif time.monotonic() - self._jwks_fetched_at > self.jwks_cache_timeout:
+            self._start_jwks_refresh()
+        return jwks
+
+    def get_rsa_key(self, jwks, kid):
+        """Return the key for the kid; on a miss wait for a JWKS refresh, in case the keys have been rotated."""
+        rsa_key = super().get_rsa_key(jwks, kid)
+        if not rsa_key and not self.jwt_oidc_test_mode:
+            refresh = self._start_jwks_refresh()
+            if refresh is not None:
+                refresh.join(self.jwks_refresh_timeout)
+            # Read the keys again even without a refresh of our own, as one may have finished since the JWKS was read.
+            if self._jwks is not None and self._jwks is not jwks:
+                rsa_key = super().get_rsa_key(self._jwks, kid)
+        return rsa_key
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return the claims cache hits and misses and the JWKS refresh counters."""
+        with self._metrics_lock:
+            return dict(self._metrics, cachedTokens=len(self.claims_cache))
+
+    def reset(self):
+        """Forget the cached claims and the counters."""
+        self.claims_cache.clear()
+        with self._metrics_lock:
+            for name in self._metrics:
+                self._metrics[name] = 0
+
+    def _get_roles(self):
+        """Return the roles of the token verified for this request, rather than decoding the token again."""
+        claims = getattr(g, 'jwt_oidc_token_info', None)
+        if claims is None:
+            claims = jwt.get_unverified_claims(self.get_token_auth_header())
+        return current_app.config['JWT_ROLE_CALLBACK'](claims)
+
+    def _start_jwks_refresh(self):
+        """Start a background JWKS refresh and return its thread; None if refreshed too recently."""
+        with self._jwks_lock:
+            if self._jwks_refresh is not None:
+                return self._jwks_refresh
+            now = time.monotonic()
+            if self._jwks_refreshed_at is not None and now - self._jwks_refreshed_at < self.jwks_refresh_interval:
+                return None
+            self._jwks_refreshed_at = now
+            self._jwks_refresh = threading.Thread(target=self._refresh_jwks, name='jwks-refresh', daemon=True)
+            refresh = self._jwks_refresh
+        refresh.start()
+        return refresh
+
+    def _refresh_jwks(self):
+        """Fetch the JWKS; on failure the keys already held are kept."""
+        try:
+            self._store_jwks(self._fetch_jwks_from_url())
+            self._record('jwksRefreshes')
+        except Exception as err:  # NOQA # pylint: disable=broad-except
+            self._record('jwksErrors')
+            self.app.logger.warning('Could not refresh the JWKS from {}: {}'.format(self.jwks_uri, err))
+        finally:
+            with self._jwks_lock:
+                self._jwks_refresh = None
+
+    def _store_jwks(self, jwks):
+        """Keep the JWKS and the time it was fetched."""
+        self._jwks = jwks
+        self._jwks_fetched_at = time.monotonic()
+
+    def _record(self, name: str):
+        with self._metrics_lock:
+            self._metrics[name] += 1
 
 
 class JWTWrapper:  # pylint: disable=too-few-public-methods
     """Singleton wrapper for Flask JwtManager."""
 
-    from flask_jwt_oidc import JwtManager  # pylint: disable=import-outside-toplevel
+    JwtManager = CachingJwtManager
     __instance = None
 
     @staticmethod
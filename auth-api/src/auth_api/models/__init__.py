@@ -21,16 +21,19 @@ from sbc_common_components.tracing.db_tracing import DBTracing  # noqa: I001, I0
 
 from .affiliation import Affiliation
 from .account_payment_settings import AccountPaymentSettings
+from .bulk_user_job import BulkUserJob
 from .contact import Contact
 from .contact_link import ContactLink
 from .corp_type import CorpType
 from .db import db, ma
 from .documents import Documents
+from .email_outbox import EmailOutbox
 from .entity import Entity
 from .invitation import Invitation
 from .invitation_membership import InvitationMembership
 from .invite_status import InvitationStatus
 from .invitation_type import InvitationType
+from .keycloak_group_sync import KeycloakGroupSync
 from .membership import Membership
 from .membership_status_code import MembershipStatusCode
 from .membership_type import MembershipType
@@ -47,6 +50,7 @@ from .product_subscription import ProductSubscription
 from .user import User
 from .user_settings import UserSettings
 from .user_status_code import UserStatusCode
+from .loader_profiles import LoaderProfile, loader_options
 
 
 event.listen(Engine, 'before_cursor_execute', DBTracing.query_tracing)
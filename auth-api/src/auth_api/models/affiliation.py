@@ -46,9 +46,9 @@ class Affiliation(BaseModel):  # pylint: disable=too-few-public-methods # Tempor
         return cls.query.filter_by(org_id=org_id).filter_by(id=affiliation_id).first()
 
     @classmethod
-    def find_affiliations_by_org_id(cls, org_id: int):
-        """Return the affiliations with the provided org id."""
-        return cls.query.filter_by(org_id=org_id).all()
+    def find_affiliations_by_org_id(cls, org_id: int, options=()):
+        """Return the affiliations with the provided org id; options are applied to the query."""
+        return cls.query.filter_by(org_id=org_id).options(*options).all()
 
     @classmethod
     def find_affiliations_by_business_identifier(cls, business_identifier: str):
@@ -14,12 +14,14 @@
 """Super class to handle all operations related to base model."""
 
 import datetime
+from typing import List
 
 from flask import g
 from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import relationship
 
+from . import unit_of_work
 from .db import db
 
 
@@ -52,15 +54,13 @@ class BaseModel(db.Model):
     def _get_current_user():
         """Return the current user.
 
-        Used to populate the created_by and modified_by relationships on all models.
+        Used to populate the created_by and modified_by relationships on all models. The user is resolved once per
+        request, so writing many rows does not look the user up for each of them.
         """
         try:
             from .user import User as UserModel  # pylint:disable=cyclic-import, import-outside-toplevel
             token = g.jwt_oidc_token_info
-            user = UserModel.find_by_jwt_token(token)
-            if not user:
-                return None
-            return user.id
+            return UserModel.find_id_by_jwt_token(token)
         except:  # pylint:disable=bare-except # noqa: B901, E722
             return None
 
@@ -99,8 +99,8 @@ class BaseModel(db.Model):
 
     @staticmethod
     def commit():
-        """Commit the session."""
-        db.session.commit()
+        """Commit the session; only flush it while a unit of work is active."""
+        unit_of_work.commit()
 
     def flush(self):
         """Save and flush."""
@@ -108,6 +108,23 @@ class BaseModel(db.Model):
         db.session.flush()
         return self
 
+    @classmethod
+    def bulk_insert(cls, rows: List[dict], returning: tuple = ()):
+        """Insert the rows in a single INSERT statement and return the requested columns of the new rows.
+
+        Rows are dicts keyed on model attribute names; column defaults are applied as for a normal insert.
+        """
+        if not rows:
+            return []
+        columns = cls.__mapper__.columns
+        values = [{columns[key].key: value for key, value in row.items()} for row in rows]
+        statement = cls.__table__.insert().values(values)
+        if returning:
+            statement = statement.returning(*returning)
+            return db.session.execute(statement).fetchall()
+        db.session.execute(statement)
+        return []
+
     def add_to_session(self):
         """Save and flush."""
         db.session.add(self)
@@ -116,13 +133,13 @@ class BaseModel(db.Model):
     def save(self):
         """Save and commit."""
         db.session.add(self)
-        db.session.commit()
+        unit_of_work.commit()
         return self
 
     def delete(self):
         """Delete and commit."""
         db.session.delete(self)
-        db.session.commit()
+        unit_of_work.commit()
 
     @staticmethod
     def rollback():
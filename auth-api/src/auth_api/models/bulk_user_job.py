@@ -0,0 +1,98 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This manages a Bulk User Job record in the Auth service.
+
+A Bulk User Job holds a bulk user request which is provisioned in the background, and the per user results.
+"""
+
+import datetime
+from typing import List
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, and_, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+
+from auth_api.utils.enums import BulkUserJobStatus
+
+from .base_model import BaseModel
+from .db import db
+
+
+class BulkUserJob(BaseModel):  # pylint: disable=too-few-public-methods
+    """Model for a Bulk User Job record."""
+
+    __tablename__ = 'bulk_user_job'
+
+    id = Column(Integer, primary_key=True)
+    org_id = Column(ForeignKey('org.id'), nullable=False)
+    status = Column(String(20), nullable=False, default=BulkUserJobStatus.PENDING.value, index=True)
+    total = Column(Integer, nullable=False)
+    processed = Column(Integer, nullable=False, default=0)
+    # The requested users without their passwords, which are only held by the worker; cleared once the job is done.
+    users = Column(JSONB, nullable=True)
+    results = Column(JSONB, nullable=True)
+    # The process holding the job, which renews the heartbeat while the job is queued or running. A job whose
+    # heartbeat goes stale lost its process, and with it the passwords, so it is failed by the sweeper.
+    owner = Column(String(100), nullable=True)
+    heartbeat = Column(DateTime, nullable=True)
+
+    org = relationship('Org', foreign_keys=[org_id], lazy='select')
+
+    @classmethod
+    def find_by_id(cls, job_id: int):
+        """Find a job by id."""
+        return cls.query.filter_by(id=job_id).one_or_none()
+
+    @classmethod
+    def claim_abandoned(cls, limit: int, stale_seconds: int, owner: str):
+        """Claim up to limit unfinished jobs which no worker has touched for stale_seconds and return their ids."""
+        table = cls.__table__
+        now = datetime.datetime.now()
+        stale_before = now - datetime.timedelta(seconds=stale_seconds)
+        abandoned = select([table.c.id]) \
+            .where(table.c.status.in_((BulkUserJobStatus.PENDING.value, BulkUserJobStatus.RUNNING.value))) \
+            .where(or_(table.c.heartbeat.is_(None), table.c.heartbeat < stale_before)) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True)
+        statement = table.update() \
+            .where(table.c.id.in_(abandoned)) \
+            .values(owner=owner, heartbeat=now) \
+            .returning(table.c.id)
+        job_ids = [row.id for row in db.session.execute(statement).fetchall()]
+        db.session.commit()
+        return job_ids
+
+    @classmethod
+    def renew_heartbeats(cls, job_ids: List[int], owner: str) -> int:
+        """Renew the heartbeat of the unfinished jobs held by the owner, and return how many were renewed."""
+        if not job_ids:
+            return 0
+        table = cls.__table__
+        result = db.session.execute(table.update()
+                                    .where(and_(table.c.id.in_(job_ids), table.c.owner == owner,
+                                                table.c.status.in_((BulkUserJobStatus.PENDING.value,
+                                                                    BulkUserJobStatus.RUNNING.value))))
+                                    .values(heartbeat=datetime.datetime.now()))
+        db.session.commit()
+        return result.rowcount
+
+    @classmethod
+    def update_if_owner(cls, job_id: int, owner: str, **values) -> bool:
+        """Update the job and renew its heartbeat, unless another worker has claimed it; return whether it did."""
+        table = cls.__table__
+        result = db.session.execute(table.update()
+                                    .where(and_(table.c.id == job_id, table.c.owner == owner))
+                                    .values(heartbeat=datetime.datetime.now(), **values))
+        db.session.commit()
+        return result.rowcount == 1
@@ -0,0 +1,121 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In memory registry of the rows of the code, type and status tables.
+
+The rows of these tables change only with a migration, but are looked up on most writes. The registry reads them once
+and answers lookups from memory; call reload after changing the tables outside of a migration.
+"""
+import threading
+from typing import Dict, List
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .base_model import BaseCodeModel
+from .db import db
+
+
+class CodeRegistry:
+    """Rows of the code, type and status tables, read once per process.
+
+    The registry holds every BaseCodeModel subclass and the models registered with the register decorator. The
+    rows are kept detached from any session; find merges the row it returns into the current session, so it can be
+    assigned to a relationship without querying the table.
+    """
+
+    _models: List[type] = []
+    _rows: Dict[type, list] = None
+    _code_models_by_table: Dict[str, type] = None
+    _version = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, model):
+        """Class decorator to keep the rows of a reference table which is not a BaseCodeModel."""
+        cls._models.append(model)
+        return model
+
+    @classmethod
+    def load(cls) -> bool:
+        """Read the rows of all tables, unless they have already been read; return True if they are available."""
+        if cls._rows is not None:
+            return True
+        with cls._lock:
+            if cls._rows is None:
+                # Read on a connection of its own, so a failure does not touch the caller's session and transaction.
+                try:
+                    with db.engine.connect() as connection:
+                        session = Session(bind=connection)
+                        try:
+                            rows = {model: session.query(model).all() for model in cls._reference_models()}
+                            session.expunge_all()
+                        finally:
+                            session.close()
+                except SQLAlchemyError as e:
+                    # Tables may not exist yet, e.g. while the migrations run; lookups go to the tables until then.
+                    current_app.logger.warning(f'Could not load the code tables : {e}')
+                    return False
+                cls._rows = rows
+                cls._version += 1
+        return True
+
+    @classmethod
+    def reload(cls) -> bool:
+        """Drop the rows read so far and read all tables again."""
+        with cls._lock:
+            cls._rows = None
+            cls._code_models_by_table = None
+        return cls.load()
+
+    @classmethod
+    def version(cls) -> int:
+        """Return a number which changes every time the rows are read, for caches built from them."""
+        return cls._version
+
+    @classmethod
+    def rows(cls, model) -> list:
+        """Return the detached rows of the table, or None if they can not be read."""
+        if not cls.load():
+            return None
+        return cls._rows.get(model, None)
+
+    @classmethod
+    def find(cls, model, **attrs):
+        """Return the first row with the given column values, attached to the current session.
+
+        Rows inserted since the registry was loaded are not in memory, so a miss is looked up in the table.
+        """
+        rows = cls.rows(model)
+        if rows is not None:
+            for row in rows:
+                if all(getattr(row, name) == value for name, value in attrs.items()):
+                    return db.session.merge(row, load=False)
+        return model.query.filter_by(**attrs).first()
+
+    @classmethod
+    def code_model_for_table(cls, table_name: str):
+        """Return the BaseCodeModel subclass mapped to the table, or None."""
+        models = cls._code_models_by_table
+        if models is None:
+            models = {model.__table__.fullname: model for model in cls._reference_models()
+                      if issubclass(model, BaseCodeModel)}
+            cls._code_models_by_table = models
+        return models.get(table_name, None)
+
+    @classmethod
+    def _reference_models(cls) -> List[type]:
+        code_models = [model for model in db.Model._decl_class_registry.values()  # pylint:disable=protected-access
+                       if isinstance(model, type) and issubclass(model, BaseCodeModel) and hasattr(model, '__table__')]
+        return code_models + [model for model in cls._models if model not in code_models]
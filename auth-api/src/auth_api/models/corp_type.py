@@ -14,6 +14,7 @@
 """Model to handle all operations related to Corp type master data."""
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class CorpType(BaseCodeModel):  # pylint: disable=too-few-public-methods # Temporarily disable until methods defined
@@ -24,4 +25,4 @@ class CorpType(BaseCodeModel):  # pylint: disable=too-few-public-methods # Tempo
     @classmethod
     def get_default_corp_type(cls):
         """Return the default Corp type for an Org."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
@@ -0,0 +1,115 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This manages an Email Outbox record in the Auth service.
+
+Emails are saved to the outbox in the transaction of the change they notify about, and sent to notify-api by the
+email dispatcher afterwards.
+"""
+
+import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, and_, select
+
+from auth_api.utils.enums import EmailOutboxStatus
+
+from .base_model import BaseModel
+from .db import db
+
+
+class EmailOutbox(BaseModel):  # pylint: disable=too-few-public-methods
+    """Model for an Email Outbox record."""
+
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    recipients = Column(Text, nullable=False)
+    subject = Column(Text, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default=EmailOutboxStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    invitation_id = Column(ForeignKey('invitation.id'), nullable=True)  # marked FAILED if the email is given up on
+
+    @classmethod
+    def find_by_id(cls, email_id: int):
+        """Find an email by id."""
+        return cls.query.filter_by(id=email_id).one_or_none()
+
+    @classmethod
+    def claim_due(cls, limit: int, lease_seconds: int):
+        """Return up to limit of the oldest due emails, hiding them from other dispatchers for lease_seconds.
+
+        The next_attempt_at of each returned row is its lease, to be passed to renew_lease and the mark methods.
+        """
+        table = cls.__table__
+        now = datetime.datetime.now()
+        due = select([table.c.id]) \
+            .where(table.c.status == EmailOutboxStatus.PENDING.value) \
+            .where(table.c.next_attempt_at <= now) \
+            .order_by(table.c.next_attempt_at, table.c.id) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True)
+        statement = table.update() \
+            .where(table.c.id.in_(due)) \
+            .values(next_attempt_at=now + datetime.timedelta(seconds=lease_seconds)) \
+            .returning(table.c.id, table.c.recipients, table.c.subject, table.c.body, table.c.attempts,
+                       table.c.invitation_id, table.c.next_attempt_at)
+        rows = db.session.execute(statement).fetchall()
+        db.session.commit()
+        return sorted(rows, key=lambda row: row.id)
+
+    @classmethod
+    def renew_lease(cls, email_id: int, lease, lease_seconds: int):
+        """Extend the lease of a claimed email, returning the new lease or None if another dispatcher took it over."""
+        table = cls.__table__
+        statement = table.update() \
+            .where(cls._leased(email_id, lease)) \
+            .values(next_attempt_at=datetime.datetime.now() + datetime.timedelta(seconds=lease_seconds)) \
+            .returning(table.c.next_attempt_at)
+        renewed = db.session.execute(statement).scalar()
+        db.session.commit()
+        return renewed
+
+    @classmethod
+    def mark_sent(cls, email_id: int, lease) -> bool:
+        """Record that the email was sent, returning False if the lease was lost."""
+        table = cls.__table__
+        result = db.session.execute(table.update()
+                                    .where(cls._leased(email_id, lease))
+                                    .values(status=EmailOutboxStatus.SENT.value, attempts=table.c.attempts + 1,
+                                            sent_at=datetime.datetime.now(), last_error=None))
+        return result.rowcount > 0
+
+    @classmethod
+    def mark_failed(cls, email_id: int, lease, next_attempt_at, error: str) -> bool:
+        """Record a failed attempt, giving up on the email if next_attempt_at is None; False if the lease was lost."""
+        table = cls.__table__
+        values = {'status': EmailOutboxStatus.FAILED.value} if next_attempt_at is None else \
+            {'next_attempt_at': next_attempt_at}
+        result = db.session.execute(table.update()
+                                    .where(cls._leased(email_id, lease))
+                                    .values(attempts=table.c.attempts + 1, last_error=error, **values))
+        return result.rowcount > 0
+
+    @classmethod
+    def _leased(cls, email_id: int, lease):
+        """Match the pending email only while it still holds the given lease."""
+        table = cls.__table__
+        return and_(table.c.id == email_id, table.c.status == EmailOutboxStatus.PENDING.value,
+                    table.c.next_attempt_at == lease)
@@ -94,9 +94,9 @@ class Invitation(BaseModel):  # pylint: disable=too-few-public-methods # Tempora
         return cls.query.filter_by(id=invitation_id).first()
 
     @classmethod
-    def find_invitations_by_org(cls, org_id, status=None):
-        """Find all invitations sent for specific org filtered by status."""
-        results = cls.query.filter(Invitation.membership.any(InvitationMembership.org_id == org_id))
+    def find_invitations_by_org(cls, org_id, status=None, options=()):
+        """Find all invitations sent for specific org filtered by status; options are applied to the query."""
+        results = cls.query.filter(Invitation.membership.any(InvitationMembership.org_id == org_id)).options(*options)
         return results.filter(Invitation.status == status.value).all() if status else results.all()
 
     @staticmethod
@@ -107,11 +107,12 @@ class Invitation(BaseModel):  # pylint: disable=too-few-public-methods # Tempora
             filter(Invitation.invitation_status_code != 'ACCEPTED').all()
 
     @staticmethod
-    def find_pending_invitations_by_org(org_id):
+    def find_pending_invitations_by_org(org_id, options=()):
         """Find all invitations that are not in accepted state."""
         return db.session.query(Invitation) \
             .filter(Invitation.membership.any(InvitationMembership.org_id == org_id)) \
-            .filter(Invitation.invitation_status_code != 'ACCEPTED').all()
+            .filter(Invitation.invitation_status_code != 'ACCEPTED') \
+            .options(*options).all()
 
     @staticmethod
     def find_invitations_by_status(user_id, status):
@@ -126,3 +127,9 @@ class Invitation(BaseModel):  # pylint: disable=too-few-public-methods # Tempora
         self.invitation_status = InvitationStatus.get_default_status()
         self.save()
         return self
+
+    @classmethod
+    def mark_failed(cls, invitation_id: int):
+        """Mark the invitation FAILED if it is still pending, as its email could not be sent."""
+        cls.query.filter_by(id=invitation_id, invitation_status_code='PENDING') \
+            .update({'invitation_status_code': 'FAILED'}, synchronize_session=False)
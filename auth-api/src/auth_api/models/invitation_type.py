@@ -17,6 +17,7 @@ It defines the different types of an Invitation.
 """
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class InvitationType(BaseCodeModel):  # pylint: disable=too-few-public-methods
@@ -27,9 +28,9 @@ class InvitationType(BaseCodeModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def get_default_type(cls):
         """Return the default type code for an Invitation."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
 
     @classmethod
     def get_type_by_code(cls, code: str):
         """Return the type object corresponding to the given code."""
-        return cls.query.filter_by(code=code).first()
+        return CodeRegistry.find(cls, code=code)
@@ -17,6 +17,7 @@ It defines the different statuses of an Invitation.
 """
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class InvitationStatus(BaseCodeModel):  # pylint: disable=too-few-public-methods
@@ -27,9 +28,9 @@ class InvitationStatus(BaseCodeModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def get_default_status(cls):
         """Return the default status code for an Invitation."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
 
     @classmethod
     def get_status_by_code(cls, code: str):
         """Return the status object corresponding to the given code."""
-        return cls.query.filter_by(code=code).first()
+        return CodeRegistry.find(cls, code=code)
@@ -0,0 +1,116 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This manages the desired keycloak group memberships of users.
+
+Each row is the desired membership of a user in a keycloak group, and the membership last applied to keycloak. The
+keycloak group sync reconciler applies the rows where the two differ.
+"""
+
+import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, UniqueConstraint, and_, or_, select
+from sqlalchemy.dialects.postgresql import UUID, insert
+
+from . import unit_of_work
+from .db import db
+
+
+class KeycloakGroupSync(db.Model):  # pylint: disable=too-few-public-methods
+    """Model for the desired membership of a user in a keycloak group."""
+
+    __tablename__ = 'keycloak_group_sync'
+    __table_args__ = (
+        UniqueConstraint('keycloak_guid', 'group_name', name='uq_keycloak_group_sync_guid_group'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    keycloak_guid = Column(UUID(as_uuid=True), nullable=False)
+    group_name = Column(String(50), nullable=False)
+    member = Column(Boolean, nullable=False)
+    applied_member = Column(Boolean, nullable=True)
+    # Incremented on every change of the desired membership, so a reconciler does not record a stale result.
+    version = Column(Integer, nullable=False, default=1)
+    attempts = Column(Integer, nullable=False, default=0)
+    # None once the retries are used up; the row is picked up again when the desired membership changes.
+    next_attempt_at = Column(DateTime, nullable=True, index=True)
+    last_error = Column(Text, nullable=True)
+    modified = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+    @classmethod
+    def set_membership(cls, keycloak_guid, group_name: str, member: bool):
+        """Save and commit the desired membership; a later change for the user replaces it."""
+        now = datetime.datetime.now()
+        statement = insert(cls.__table__).values(keycloak_guid=keycloak_guid, group_name=group_name, member=member,
+                                                 version=1, attempts=0, next_attempt_at=now, modified=now)
+        table = cls.__table__
+        statement = statement.on_conflict_do_update(
+            constraint='uq_keycloak_group_sync_guid_group',
+            set_={
+                'member': statement.excluded.member,
+                'version': table.c.version + 1,
+                'attempts': 0,
+                'next_attempt_at': now,
+                'last_error': None,
+                'modified': now
+            },
+            # Nothing to do if the membership is unchanged, unless its retries were used up without applying it.
+            where=or_(table.c.member.is_distinct_from(statement.excluded.member),
+                      and_(table.c.next_attempt_at.is_(None),
+                           table.c.applied_member.is_distinct_from(statement.excluded.member)))
+        )
+        db.session.execute(statement)
+        unit_of_work.commit()
+
+    @classmethod
+    def claim_due(cls, limit: int, lease_seconds: int):
+        """Return up to limit memberships to apply, hiding them from other reconcilers for lease_seconds."""
+        table = cls.__table__
+        now = datetime.datetime.now()
+        due = select([table.c.id]) \
+            .where(table.c.member.is_distinct_from(table.c.applied_member)) \
+            .where(table.c.next_attempt_at <= now) \
+            .order_by(table.c.next_attempt_at) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True)
+        statement = table.update() \
+            .where(table.c.id.in_(due)) \
+            .values(next_attempt_at=now + datetime.timedelta(seconds=lease_seconds)) \
+            .returning(table.c.id, table.c.keycloak_guid, table.c.group_name, table.c.member, table.c.version,
+                       table.c.attempts)
+        rows = db.session.execute(statement).fetchall()
+        db.session.commit()
+        return sorted(rows, key=lambda row: (str(row.keycloak_guid), row.group_name))
+
+    @classmethod
+    def mark_applied(cls, row_id: int, version: int, member: bool):
+        """Record the applied membership, unless the desired membership changed meanwhile."""
+        table = cls.__table__
+        db.session.execute(table.update()
+                           .where(and_(table.c.id == row_id, table.c.version == version))
+                           .values(applied_member=member, attempts=0, next_attempt_at=None, last_error=None,
+                                   modified=datetime.datetime.now()))
+
+    @classmethod
+    def mark_failed(cls, row_id: int, version: int, next_attempt_at, error: str):
+        """Record a failed attempt, unless the desired membership changed meanwhile."""
+        table = cls.__table__
+        db.session.execute(table.update()
+                           .where(and_(table.c.id == row_id, table.c.version == version))
+                           .values(attempts=table.c.attempts + 1, next_attempt_at=next_attempt_at, last_error=error,
+                                   modified=datetime.datetime.now()))
+
+    @classmethod
+    def find_by_guid(cls, keycloak_guid, group_name: str):
+        """Find the desired membership of the user in the group."""
+        return cls.query.filter_by(keycloak_guid=keycloak_guid, group_name=group_name).one_or_none()
@@ -0,0 +1,93 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Named eager loading profiles for listings.
+
+Each profile is the set of loader options which loads everything the schema of a listing dumps, so that dumping a
+large listing does not lazy load the relationships of every row one query at a time. The option sets mirror the
+schema shapes; when a schema starts dumping another relationship, add it to the profile as well.
+"""
+from enum import Enum
+from typing import Tuple
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from .affiliation import Affiliation
+from .contact import Contact
+from .contact_link import ContactLink
+from .entity import Entity
+from .invitation import Invitation
+from .invitation_membership import InvitationMembership
+from .membership import Membership
+from .org import Org
+from .user import User
+
+
+class LoaderProfile(Enum):
+    """Loader profiles, named for the listing they serve."""
+
+    MEMBERS = 'members'
+    INVITATIONS = 'invitations'
+    AFFILIATED_ENTITIES = 'affiliated_entities'
+
+
+def _contact_options(link_path):
+    """Return the options loading the contacts of the contact links, as dumped by ContactSchema.
+
+    link_path returns a new loader chain ending at the contact links each time it is called, since chaining further
+    options onto a loader modifies it.
+    """
+    return (
+        link_path().joinedload(ContactLink.contact).selectinload(Contact.links),
+        link_path().joinedload(ContactLink.contact).joinedload(Contact.created_by),
+        link_path().joinedload(ContactLink.contact).joinedload(Contact.modified_by)
+    )
+
+
+def _members():
+    """MembershipSchema(exclude=['org']): the user with contacts, and the membership status."""
+    return (
+        joinedload(Membership.membership_status),
+        *_contact_options(lambda: selectinload(Membership.user).selectinload(User.contacts))
+    )
+
+
+def _invitations():
+    """InvitationSchema: the invitation memberships with their org and membership type."""
+    return (
+        joinedload(Invitation.invitation_status),
+        selectinload(Invitation.membership).joinedload(InvitationMembership.membership_type),
+        selectinload(Invitation.membership).joinedload(InvitationMembership.org).selectinload(Org.products),
+        selectinload(Invitation.membership).joinedload(InvitationMembership.org).joinedload(Org.modified_by)
+    )
+
+
+def _affiliated_entities():
+    """EntitySchema for each affiliation: the entity with contacts and audit users."""
+    return (
+        joinedload(Affiliation.entity).joinedload(Entity.created_by),
+        joinedload(Affiliation.entity).joinedload(Entity.modified_by),
+        *_contact_options(lambda: joinedload(Affiliation.entity).selectinload(Entity.contacts))
+    )
+
+
+_PROFILES = {
+    LoaderProfile.MEMBERS: _members,
+    LoaderProfile.INVITATIONS: _invitations,
+    LoaderProfile.AFFILIATED_ENTITIES: _affiliated_entities
+}
+
+
+def loader_options(profile: LoaderProfile) -> Tuple:
+    """Return the loader options of the profile, to pass to Query.options."""
+    return _PROFILES[profile]()
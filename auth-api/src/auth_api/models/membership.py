@@ -84,11 +84,11 @@ class Membership(BaseModel):  # pylint: disable=too-few-public-methods # Tempora
         return count
 
     @classmethod
-    def find_members_by_org_id_by_status_by_roles(cls, org_id, roles, status=Status.ACTIVE.value):
-        """Return all members of the org with a status."""
+    def find_members_by_org_id_by_status_by_roles(cls, org_id, roles, status=Status.ACTIVE.value, options=()):
+        """Return all members of the org with a status; options are applied to the query."""
         return db.session.query(Membership).filter(
             and_(Membership.status == status, Membership.membership_type_code.in_(roles))). \
-            join(OrgModel).filter(OrgModel.id == org_id).all()
+            join(OrgModel).filter(OrgModel.id == org_id).options(*options).all()
 
     @classmethod
     def find_orgs_for_user(cls, user_id, valid_statuses=VALID_STATUSES):
@@ -19,8 +19,10 @@ It defines the available types of membership Status have with Orgs.
 from sqlalchemy import Column, Integer, String
 
 from .base_model import BaseModel
+from .code_registry import CodeRegistry
 
 
+@CodeRegistry.register
 class MembershipStatusCode(BaseModel):  # pylint: disable=too-few-public-methods
     """This is the Membership Status model for the Auth service."""
 
@@ -33,7 +35,7 @@ class MembershipStatusCode(BaseModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def get_membership_status_by_code(cls, name):
         """Return the membership type object that corresponds to given code."""
-        return cls.query.filter_by(name=name).first()
+        return CodeRegistry.find(cls, name=name)
 
     @classmethod
     def get_default_type(cls):
@@ -19,6 +19,7 @@ It defines the available types of membership Users have with Orgs.
 from sqlalchemy import Column, String
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class MembershipType(BaseCodeModel):  # pylint: disable=too-few-public-methods
@@ -32,9 +33,9 @@ class MembershipType(BaseCodeModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def get_default_type(cls):
         """Return the default type code for Membership."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
 
     @classmethod
     def get_membership_type_by_code(cls, type_code):
         """Return the membership type object that corresponds to given code."""
-        return cls.query.filter_by(code=type_code).first()
+        return CodeRegistry.find(cls, code=type_code)
@@ -17,8 +17,8 @@ Basic users will have an internal Org that is not created explicitly, but implic
 """
 
 from flask import current_app
-from sqlalchemy import Column, ForeignKey, Integer, String, and_, func, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, String, and_, func, or_, Boolean
+from sqlalchemy.orm import relationship, validates
 
 from auth_api.utils.roles import OrgStatus as OrgStatusEnum
 
@@ -36,6 +36,8 @@ class Org(BaseModel):  # pylint: disable=too-few-public-methods
     type_code = Column(ForeignKey('org_type.code'), nullable=False)
     status_code = Column(ForeignKey('org_status.code'), nullable=False)
     name = Column(String(250), index=True)
+    # The name lower cased with whitespace collapsed, for duplicate name checks; kept in step with name.
+    normalized_name = Column(String(250), index=True)
     access_type = Column(String(250), index=True, nullable=True)  # for ANONYMOUS ACCESS
     billable = Column('billable', Boolean(), default=True, nullable=False)
 
@@ -77,13 +79,44 @@ class Org(BaseModel):  # pylint: disable=too-few-public-methods
 
     @classmethod
     def find_similar_org_by_name(cls, name, org_id=None):
-        """Find an Org instance that matches the provided name."""
-        # TODO: add more fancy comparison
-        query = cls.query.filter(Org.name.ilike(f'%{name}%'))
+        """Find an Org whose name is the same as, contains or is similar to the provided name.
+
+        Names are the same if they match once normalized. Names are similar if their trigram similarity is at least
+        ORG_NAME_SIMILARITY_THRESHOLD; 0 turns the similarity match off. The containment and similarity conditions
+        are served by the trigram index on the lower cased name.
+        """
+        query = cls.query.filter(Org.normalized_name == cls.normalize_name(name))
+        if org_id:
+            query = query.filter(Org.id != org_id)
+        org = query.first()
+        if org is not None:
+            return org
+
+        lower_name = name.lower()
+        lower_column = func.lower(Org.name)
+        pattern = lower_name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        conditions = [lower_column.like(f'%{pattern}%')]
+        threshold = current_app.config.get('ORG_NAME_SIMILARITY_THRESHOLD', 0)
+        if threshold:
+            # % narrows the rows through the index (pg_trgm.similarity_threshold, 0.3 by default) and similarity()
+            # applies the configured threshold to them.
+            conditions.append(and_(lower_column.op('%')(lower_name),
+                                   func.similarity(lower_column, lower_name) >= threshold))
+        query = cls.query.filter(or_(*conditions))
         if org_id:
             query = query.filter(Org.id != org_id)
         return query.first()
 
+    @staticmethod
+    def normalize_name(name: str):
+        """Return the name lower cased, with surrounding whitespace removed and inner whitespace collapsed."""
+        return ' '.join(name.split()).lower() if name is not None else None
+
+    @validates('name')
+    def _set_normalized_name(self, key, name):  # pylint: disable=unused-argument
+        self.normalized_name = Org.normalize_name(name)
+        return name
+
     @classmethod
     def get_count_of_org_created_by_user_id(cls, user_id):
         """Find the count of the organisations created by the user."""
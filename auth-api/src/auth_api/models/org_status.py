@@ -17,6 +17,7 @@ This is a mapping between status codes and descriptions for Org objects.
 """
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class OrgStatus(BaseCodeModel):  # pylint: disable=too-few-public-methods # Temporarily disable until methods defined
@@ -27,4 +28,4 @@ class OrgStatus(BaseCodeModel):  # pylint: disable=too-few-public-methods # Temp
     @classmethod
     def get_default_status(cls):
         """Return the default status code for an Org."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
@@ -17,6 +17,7 @@ This is a mapping between org type codes and descriptions for Org objects.
 """
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class OrgType(BaseCodeModel):  # pylint: disable=too-few-public-methods
@@ -27,9 +28,9 @@ class OrgType(BaseCodeModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def get_default_type(cls):
         """Return the default type code for an Org."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
 
     @classmethod
     def get_type_for_code(cls, code):
         """Return the type for the provided code."""
-        return cls.query.filter_by(code=code).first()
+        return CodeRegistry.find(cls, code=code)
@@ -17,6 +17,7 @@ Payment types are used to store the preferred payment type on the Org model.
 """
 
 from .base_model import BaseCodeModel
+from .code_registry import CodeRegistry
 
 
 class PaymentType(BaseCodeModel):  # pylint: disable=too-few-public-methods # Temporarily disable until methods defined
@@ -27,4 +28,4 @@ class PaymentType(BaseCodeModel):  # pylint: disable=too-few-public-methods # Te
     @classmethod
     def get_default_payment_type(cls):
         """Return the default payment type for an Org."""
-        return cls.query.filter_by(default=True).first()
+        return CodeRegistry.find(cls, default=True)
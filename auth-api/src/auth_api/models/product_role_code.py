@@ -19,8 +19,10 @@ It defines the available roles for a product.
 from sqlalchemy import Column, ForeignKey, Integer, String
 
 from .base_model import BaseModel
+from .code_registry import CodeRegistry
 
 
+@CodeRegistry.register
 class ProductRoleCode(BaseModel):  # pylint: disable=too-few-public-methods
     """Product role code table to store all the roles on products supported by auth system."""
 
@@ -34,7 +36,7 @@ class ProductRoleCode(BaseModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def find_by_code_and_product_code(cls, code: str, product_code: str):
         """Find a Product Role Code instance that matches the code and product code."""
-        return cls.query.filter_by(code=code, product_code=product_code).one_or_none()
+        return CodeRegistry.find(cls, code=code, product_code=product_code)
 
     @classmethod
     def find_all_roles_by_product_code(cls, product_code: str):
@@ -0,0 +1,90 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Request scoped unit of work.
+
+While a unit of work is active, the commit helpers of the models only flush; the changes made by the request are
+committed once when it ends, or rolled back if it fails. This holds the row locks for a single transaction and
+writes it to the database log once, rather than once per model saved.
+"""
+import functools
+from contextlib import contextmanager
+
+from flask import Response, g, has_app_context
+
+from .db import db
+
+
+class UnitOfWork:  # pylint: disable=too-few-public-methods
+    """The state of the active unit of work."""
+
+    def __init__(self):
+        """Start a unit of work which commits when it ends."""
+        self.rollback_only = False
+
+
+def is_active() -> bool:
+    """Return True if the changes are committed by an active unit of work."""
+    return has_app_context() and g.get('unit_of_work', None) is not None
+
+
+def commit():
+    """Commit the session, or only flush it while a unit of work is active."""
+    if is_active():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+@contextmanager
+def unit_of_work():
+    """Commit the changes made in the block once at its end, rolling them back if it raises.
+
+    A block run while a unit of work is already active joins it.
+    """
+    if is_active():
+        yield g.unit_of_work
+        return
+
+    work = g.unit_of_work = UnitOfWork()
+    try:
+        yield work
+        if work.rollback_only:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    finally:
+        g.unit_of_work = None
+
+
+def transactional(function):
+    """Decorate a resource method to run it in a unit of work; error responses roll the changes back."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with unit_of_work() as work:
+            result = function(*args, **kwargs)
+            work.rollback_only = work.rollback_only or _status_code(result) >= 400
+        return result
+
+    return wrapper
+
+
+def _status_code(result) -> int:
+    if isinstance(result, Response):
+        return result.status_code
+    if isinstance(result, tuple) and len(result) > 1 and isinstance(result[1], int):
+        return result[1]
+    return 200
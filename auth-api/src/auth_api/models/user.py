@@ -18,10 +18,10 @@ A User stores basic information from a KeyCloak user (including the KeyCloak GUI
 
 import datetime
 
-from flask import current_app
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, or_
+from flask import current_app, g, has_app_context
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, event, func, or_
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
 from auth_api.utils.roles import Status, UserStatus, AccessType
 
@@ -74,12 +74,44 @@ class User(BaseModel):
         """Return the first user with the provided username."""
         return cls.query.filter_by(username=username).first()
 
+    @classmethod
+    def find_by_usernames(cls, usernames: list):
+        """Return all users with any of the provided usernames."""
+        if not usernames:
+            return []
+        return cls.query.filter(cls.username.in_(usernames)).all()
+
     @classmethod
     def find_by_jwt_token(cls, token: dict):
-        """Find an existing user by the keycloak GUID in the provided token."""
-        return cls.query.filter_by(
-            keycloak_guid=token.get('sub', None)
-        ).one_or_none()
+        """Find an existing user by the keycloak GUID in the provided token.
+
+        The user id is looked up once per request (app context) and remembered on g; later calls load the user by
+        primary key, which the session usually answers from its identity map without a query.
+        """
+        keycloak_guid = token.get('sub', None)
+        user_ids = _resolved_user_ids()
+        user_id = user_ids.get(keycloak_guid, None) if user_ids is not None else None
+        if user_id is not None:
+            user = cls.query.get(user_id)
+            if user is not None:
+                return user
+
+        user = cls.query.filter_by(keycloak_guid=keycloak_guid).one_or_none()
+        if user is not None and keycloak_guid and user_ids is not None:
+            user_ids[keycloak_guid] = user.id
+        return user
+
+    @classmethod
+    def find_id_by_jwt_token(cls, token: dict):
+        """Return the id of the user in the token, resolving it at most once per request; None if there is none."""
+        keycloak_guid = token.get('sub', None) if token else None
+        if not keycloak_guid:
+            return None
+        user_ids = _resolved_user_ids()
+        if user_ids is not None and keycloak_guid in user_ids:
+            return user_ids[keycloak_guid]
+        user = cls.find_by_jwt_token(token)
+        return user.id if user else None
 
     @classmethod
     def create_from_jwt_token(cls, token: dict):
@@ -99,6 +131,9 @@ class User(BaseModel):
             )
             user.status = UserStatusCode.get_default_type()
             user.save()
+            user_ids = _resolved_user_ids()
+            if user.keycloak_guid and user_ids is not None:
+                user_ids[str(user.keycloak_guid)] = user.id
             return user
         return None
 
@@ -127,12 +162,36 @@ class User(BaseModel):
         return None
 
     @classmethod
-    def find_users(cls, first_name, last_name, email):
-        """Return a set of users with either the given username or the given email."""
-        # TODO: This needs to be improved for scalability.  Paging large datasets etc.
-        if first_name == '' and last_name == '' and email == '':
-            return cls.query.all()
-        return cls.query.filter(or_(cls.firstname == first_name, cls.lastname == last_name, cls.email == email)).all()
+    def find_users(cls, first_name, last_name, email,  # pylint: disable=too-many-arguments
+                   search_text: str = None, after_id: int = None, limit: int = None):
+        """Return users with either the given first name, last name or email, ordered by id.
+
+        search_text matches the start of, or is similar to, the first name, last name or email; see search_filter.
+        Pages are read with keyset pagination: pass the id of the last user of the previous page as after_id.
+        """
+        query = cls.query
+        if first_name != '' or last_name != '' or email != '':
+            query = query.filter(or_(cls.firstname == first_name, cls.lastname == last_name, cls.email == email))
+        if search_text:
+            query = query.filter(cls.search_filter(search_text))
+        if after_id is not None:
+            query = query.filter(cls.id > after_id)
+        query = query.order_by(cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @classmethod
+    def search_filter(cls, search_text: str):
+        """Return the filter for users whose first name, last name or email starts with or is similar to the text.
+
+        Both the prefix (LIKE) and the similarity (pg_trgm %) matches are served by the trigram indexes on the
+        lower cased columns.
+        """
+        text = search_text.strip().lower()
+        prefix = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        columns = (func.lower(cls.firstname), func.lower(cls.lastname), func.lower(cls.email))
+        return or_(*[column.like(prefix) for column in columns], *[column.op('%')(text) for column in columns])
 
     @classmethod
     def update_terms_of_use(cls, token: dict, is_terms_accepted, terms_of_use_version):
@@ -163,3 +222,19 @@ class User(BaseModel):
     def delete(self):
         """Users cannot be deleted so intercept the ORM by just returning."""
         return self
+
+
+def _resolved_user_ids():
+    """Return the user ids resolved in this app context, keyed by keycloak GUID; None outside an app context."""
+    if not has_app_context():
+        return None
+    if 'user_ids_by_keycloak_guid' not in g:
+        g.user_ids_by_keycloak_guid = {}
+    return g.user_ids_by_keycloak_guid
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_resolved_user_ids(session, previous_transaction):  # pylint: disable=unused-argument
+    """Forget the resolved users on rollback, as users created in the rolled back transaction no longer exist."""
+    if has_app_context():
+        g.pop('user_ids_by_keycloak_guid', None)
@@ -19,8 +19,10 @@ It defines the available types of users Status.
 from sqlalchemy import Column, Integer, String
 
 from .base_model import BaseModel
+from .code_registry import CodeRegistry
 
 
+@CodeRegistry.register
 class UserStatusCode(BaseModel):  # pylint: disable=too-few-public-methods
     """This is the User Status model for the Auth service."""
 
@@ -33,7 +35,7 @@ class UserStatusCode(BaseModel):  # pylint: disable=too-few-public-methods
     @classmethod
     def get_user_status_by_name(cls, name):
         """Return the user status object that corresponds to given name."""
-        return cls.query.filter_by(name=name).one_or_none()
+        return CodeRegistry.find(cls, name=name)
 
     @classmethod
     def get_default_type(cls):
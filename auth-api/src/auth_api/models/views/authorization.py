@@ -14,11 +14,13 @@
 """This manages Authorization view.
 
 Authorization view wraps details on the entities and membership through orgs and delegations.
+The rows are read from authorizations_index, a table materialized from authorizations_view and kept current
+by database triggers on the membership, affiliation, product subscription and payment settings tables.
 """
 
 import uuid
 
-from sqlalchemy import Column, Integer, String, and_, or_
+from sqlalchemy import Column, Integer, String, and_, or_, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import expression
 
@@ -27,9 +29,9 @@ from auth_api.utils.roles import ADMIN, MEMBER, OWNER
 
 
 class Authorization(db.Model):
-    """This is the model the authorizations_view."""
+    """This is the model the authorizations_index."""
 
-    __tablename__ = 'authorizations_view'
+    __tablename__ = 'authorizations_index'
 
     business_identifier = Column(String)
     entity_name = Column(String)
@@ -96,3 +98,27 @@ class Authorization(db.Model):
     def find_all_authorizations_for_user(cls, keycloak_guid):
         """Return list of authorizations for the user."""
         return cls.query.filter_by(keycloak_guid=keycloak_guid).all()
+
+    @classmethod
+    def find_inconsistencies(cls, limit: int = 100):
+        """Return the rows which differ between authorizations_index and authorizations_view.
+
+        Each row carries a 'source' column saying which side has the row ('view' means missing from the index).
+        """
+        columns = 'business_identifier, entity_name, folio_number, corp_type_code, org_membership, keycloak_guid, ' \
+                  'user_id, org_id, org_name, org_type, product_code, preferred_payment_code, bcol_user_id, ' \
+                  'bcol_account_id, roles'
+        sql = text(f'''
+            (SELECT 'view' AS source, diff.* FROM
+                (SELECT {columns} FROM authorizations_view EXCEPT ALL SELECT {columns} FROM authorizations_index) diff)
+            UNION ALL
+            (SELECT 'index' AS source, diff.* FROM
+                (SELECT {columns} FROM authorizations_index EXCEPT ALL SELECT {columns} FROM authorizations_view) diff)
+            LIMIT :limit
+        ''')
+        return db.session.execute(sql, {'limit': limit}).fetchall()
+
+    @classmethod
+    def rebuild(cls, org_id: int = None):
+        """Rebuild the authorizations index for an org, or the whole index if no org is passed."""
+        db.session.execute(text('SELECT refresh_authorizations(:org_id)'), {'org_id': org_id})
@@ -18,9 +18,16 @@ to support swagger on http
 from flask import url_for
 from flask_restplus import Api as BaseApi
 
+from auth_api.utils import fast_json
+
 
 class Api(BaseApi):
-    """Monkey patch Swagger API to return HTTPS URLs."""
+    """Monkey patch Swagger API to return HTTPS URLs, and encode JSON with the configured encoder backend."""
+
+    def __init__(self, *args, **kwargs):
+        """Create the api, replacing the JSON representation."""
+        super().__init__(*args, **kwargs)
+        self.representations['application/json'] = fast_json.output_json
 
     @property
     def specs_url(self):
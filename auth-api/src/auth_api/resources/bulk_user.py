@@ -20,6 +20,7 @@ from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
 from auth_api.schemas import utils as schema_utils
+from auth_api.services.bulk_user_job import BulkUserJob as BulkUserJobService
 from auth_api.services.user import User as UserService
 from auth_api.tracer import Tracer
 from auth_api.utils.util import cors_preflight
@@ -56,3 +57,55 @@ class BulkUser(Resource):
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
         return response, status
+
+
+@cors_preflight('POST,OPTIONS')
+@API.route('/jobs', methods=['POST', 'OPTIONS'])
+class BulkUserJobs(Resource):
+    """Resource for submitting bulk users to be created in the background."""
+
+    @staticmethod
+    @TRACER.trace()
+    @cors.crossdomain(origin='*')
+    @_JWT.requires_auth
+    def post():
+        """Admin users can submit multiple users to their org; the job can be polled for progress and results.
+
+        The passwords are only held in memory by the process running the job. If that process restarts before the job
+        has finished, the job ends FAILED and each user it had not processed gets a 500 result saying it was not
+        processed; submit those users again.
+        """
+        try:
+            request_json = request.get_json()
+            valid_format, errors = schema_utils.validate(request_json, 'bulk_user')
+            token = g.jwt_oidc_token_info
+            if not valid_format:
+                return {'message': schema_utils.serialize(errors)}, http_status.HTTP_400_BAD_REQUEST
+
+            job = BulkUserJobService.submit(request_json, token)
+            response, status = job.as_dict(), http_status.HTTP_202_ACCEPTED
+        except BusinessException as exception:
+            response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
+        return response, status
+
+
+@cors_preflight('GET,OPTIONS')
+@API.route('/jobs/<int:job_id>', methods=['GET', 'OPTIONS'])
+class BulkUserJob(Resource):
+    """Resource for polling a bulk user job."""
+
+    @staticmethod
+    @TRACER.trace()
+    @cors.crossdomain(origin='*')
+    @_JWT.requires_auth
+    def get(job_id):
+        """Return the status, progress and per user results of the job.
+
+        A job interrupted by a restart is FAILED, with a 'not processed' result for the users still to be added.
+        """
+        try:
+            job = BulkUserJobService.find_by_id(job_id, g.jwt_oidc_token_info)
+            response, status = job.as_dict(), http_status.HTTP_200_OK
+        except BusinessException as exception:
+            response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
+        return response, status
@@ -12,13 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """API endpoints for managing an Invitation resource."""
-from flask import jsonify
+from flask import current_app
 from flask_restplus import Namespace, Resource, cors
 
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
 from auth_api.services import Codes as CodeService
+from auth_api.utils.representation import conditional_response
 from auth_api.utils.util import cors_preflight
 
 
@@ -36,12 +37,11 @@ class Codes(Resource):
     def get(code_type):
         """Return the codes by giving name."""
         try:
-            codes = CodeService.fetch_codes(code_type=code_type)
+            codes = CodeService.fetch_codes_representation(code_type=code_type)
             if codes is not None:
-                response, status = jsonify(codes), http_status.HTTP_200_OK
-            else:
-                response, status = {'message': f'The code type ({code_type}) could not be found.'}, \
-                    http_status.HTTP_404_NOT_FOUND
+                return conditional_response(codes, current_app.config.get('CODES_CACHE_CONTROL'))
+            response, status = {'message': f'The code type ({code_type}) could not be found.'}, \
+                http_status.HTTP_404_NOT_FOUND
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
         return response, status
@@ -13,7 +13,7 @@
 # limitations under the License.
 """API endpoints for managing an Invitation resource."""
 
-from flask import g
+from flask import current_app, g
 from flask_restplus import Namespace, Resource, cors
 
 from auth_api import status as http_status
@@ -22,6 +22,7 @@ from auth_api.jwt_wrapper import JWTWrapper
 from auth_api.services import Documents as DocumentService
 from auth_api.tracer import Tracer
 from auth_api.utils.enums import DocumentType
+from auth_api.utils.representation import conditional_response
 from auth_api.utils.roles import AccessType
 from auth_api.utils.util import cors_preflight
 
@@ -48,12 +49,11 @@ class Documents(Resource):
                 if token.get('accessType', None) == AccessType.ANONYMOUS.value:
                     document_type = DocumentType.TERMS_OF_USE_DIRECTOR_SEARCH.value
 
-            doc = DocumentService.fetch_latest_document(document_type)
+            doc = DocumentService.fetch_latest_document_representation(document_type)
             if doc is not None:
-                response, status = doc.as_dict(), http_status.HTTP_200_OK
-            else:
-                response, status = {'message': 'The requested invitation could not be found.'}, \
-                                   http_status.HTTP_404_NOT_FOUND
+                return conditional_response(doc, current_app.config.get('DOCUMENTS_CACHE_CONTROL'))
+            response, status = {'message': 'The requested invitation could not be found.'}, \
+                http_status.HTTP_404_NOT_FOUND
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
         return response, status
@@ -19,6 +19,7 @@ from flask_restplus import Namespace, Resource, cors
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
+from auth_api.models.unit_of_work import transactional
 from auth_api.schemas import utils as schema_utils
 from auth_api.services.authorization import Authorization as AuthorizationService
 from auth_api.services.entity import Entity as EntityService
@@ -110,6 +111,7 @@ class ContactResource(Resource):
     @staticmethod
     @_JWT.requires_auth
     @cors.crossdomain(origin='*')
+    @transactional
     def post(business_identifier):
         """Add a new contact for the Entity identified by the provided id."""
         request_json = request.get_json()
@@ -133,6 +135,7 @@ class ContactResource(Resource):
     @staticmethod
     @_JWT.requires_auth
     @cors.crossdomain(origin='*')
+    @transactional
     def put(business_identifier):
         """Update the business contact for the Entity identified by the provided id."""
         request_json = request.get_json()
@@ -156,6 +159,7 @@ class ContactResource(Resource):
     @staticmethod
     @_JWT.requires_auth
     @cors.crossdomain(origin='*')
+    @transactional
     def delete(business_identifier):
         """Delete the business contact for the Entity identified by the provided id."""
         try:
@@ -20,6 +20,7 @@ from auth_api.utils.roles import Role
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
+from auth_api.models.unit_of_work import transactional
 from auth_api.schemas import utils as schema_utils
 from auth_api.services import Invitation as InvitationService
 from auth_api.services import User as UserService
@@ -41,6 +42,7 @@ class Invitations(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.has_one_of_roles([Role.SYSTEM.value, Role.STAFF.value, Role.PUBLIC_USER.value])
+    @transactional
     def post():
         """Send a new invitation using the details in request and saves the invitation."""
         token = g.jwt_oidc_token_info
@@ -82,6 +84,7 @@ class Invitation(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.requires_auth
+    @transactional
     def patch(invitation_id):
         """Update the invitation specified by the provided id as retried."""
         token = g.jwt_oidc_token_info
@@ -134,6 +137,7 @@ class InvitationAction(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.requires_auth
+    @transactional
     def put(invitation_token):
         """Check whether the passed token is valid and add user, role and org from invitation to membership."""
         token = g.jwt_oidc_token_info
@@ -13,13 +13,15 @@
 # limitations under the License.
 """API endpoints for managing an Org resource."""
 
-from flask import g, jsonify, request
+from flask import g, request
 from flask_restplus import Namespace, Resource, cors
 
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
+from auth_api.models.unit_of_work import transactional
 from auth_api.schemas import InvitationSchema, MembershipSchema, AccountPaymentSettingsSchema
+from auth_api.schemas import serializers
 from auth_api.schemas import utils as schema_utils
 from auth_api.services import Affiliation as AffiliationService
 from auth_api.services import Invitation as InvitationService
@@ -46,6 +48,7 @@ class Orgs(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.has_one_of_roles([Role.PUBLIC_USER.value, Role.STAFF_ADMIN.value])
+    @transactional
     def post():
         """Post a new org using the request body.
 
@@ -207,6 +210,7 @@ class OrgContacts(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.requires_auth
+    @transactional
     def post(org_id):
         """Create a new contact for the specified org."""
         request_json = request.get_json()
@@ -224,6 +228,7 @@ class OrgContacts(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.requires_auth
+    @transactional
     def put(org_id):
         """Update an existing contact for the specified org."""
         request_json = request.get_json()
@@ -240,6 +245,7 @@ class OrgContacts(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.requires_auth
+    @transactional
     def delete(org_id):
         """Delete the contact info for the specified org."""
         try:
@@ -283,9 +289,9 @@ class OrgAffiliations(Resource):
     def get(org_id):
         """Get all affiliated entities for the given org."""
         try:
-            response, status = jsonify({
-                'entities': AffiliationService.find_affiliated_entities_by_org_id(org_id, g.jwt_oidc_token_info)}), \
-                               http_status.HTTP_200_OK
+            response, status = {
+                'entities': AffiliationService.find_affiliated_entities_by_org_id(org_id, g.jwt_oidc_token_info)}, \
+                http_status.HTTP_200_OK
 
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
@@ -334,8 +340,9 @@ class OrgMembers(Resource):
             members = MembershipService.get_members_for_org(org_id, status=status,
                                                             membership_roles=roles, token_info=g.jwt_oidc_token_info)
             if members:
-                response, status = {'members': MembershipSchema(exclude=['org']).dump(members, many=True)}, \
-                                   http_status.HTTP_200_OK
+                response, status = {
+                    'members': serializers.dump(members, MembershipSchema, many=True, exclude=['org'])
+                }, http_status.HTTP_200_OK
             else:
                 response, status = {}, \
                                    http_status.HTTP_200_OK
@@ -355,6 +362,7 @@ class OrgMember(Resource):
     @_JWT.requires_auth
     @TRACER.trace()
     @cors.crossdomain(origin='*')
+    @transactional
     def patch(org_id, membership_id):  # pylint:disable=unused-argument
         """Update a membership record with new member role."""
         token = g.jwt_oidc_token_info
@@ -430,7 +438,8 @@ class OrgInvitations(Resource):
                                                                     status=invitation_status,
                                                                     token_info=g.jwt_oidc_token_info)
 
-            response, status = {'invitations': InvitationSchema().dump(invitations, many=True)}, http_status.HTTP_200_OK
+            response, status = {'invitations': serializers.dump(invitations, InvitationSchema, many=True)}, \
+                http_status.HTTP_200_OK
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
 
@@ -19,6 +19,7 @@ from flask_restplus import Namespace, Resource, cors
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
+from auth_api.models.unit_of_work import transactional
 from auth_api.schemas import ProductSubscriptionSchema
 from auth_api.schemas import utils as schema_utils
 from auth_api.services import Product as ProductService
@@ -40,6 +41,7 @@ class OrgProducts(Resource):
     @TRACER.trace()
     @cors.crossdomain(origin='*')
     @_JWT.has_one_of_roles([Role.STAFF_ADMIN.value])
+    @transactional
     def post(org_id):
         """Post a new product subscription to the org using the request body."""
         request_json = request.get_json()
@@ -13,15 +13,14 @@
 # limitations under the License.
 """API endpoints for managing a Product resource."""
 
-import json
-
+from flask import current_app
 from flask_restplus import Namespace, Resource, cors
 
-from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
 from auth_api.services import Product as ProductService
 from auth_api.tracer import Tracer
+from auth_api.utils.representation import conditional_response
 from auth_api.utils.util import cors_preflight
 
 API = Namespace('products', description='Endpoints for products management')
@@ -40,7 +39,8 @@ class Products(Resource):
     def get():
         """Get a list of all products."""
         try:
-            response, status = json.dumps(ProductService.get_products()), http_status.HTTP_200_OK
+            return conditional_response(ProductService.get_products_representation(),
+                                        current_app.config.get('PRODUCTS_CACHE_CONTROL'))
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
         return response, status
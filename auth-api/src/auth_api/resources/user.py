@@ -13,21 +13,24 @@
 # limitations under the License.
 """API endpoints for managing a User resource."""
 
-from flask import g, jsonify, request
+from flask import Response, current_app, g, request, stream_with_context
 from flask_restplus import Namespace, Resource, cors
 
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.jwt_wrapper import JWTWrapper
 from auth_api.schemas import MembershipSchema, OrgSchema
+from auth_api.schemas import serializers
 from auth_api.schemas import utils as schema_utils
 from auth_api.services import Invitation as InvitationService
 from auth_api.services.authorization import Authorization as AuthorizationService
 from auth_api.services.keycloak import KeycloakService
+from auth_api.services.keycloak_group_sync import KeycloakGroupSync
 from auth_api.services.membership import Membership as MembershipService
 from auth_api.services.org import Org as OrgService
 from auth_api.services.user import User as UserService
 from auth_api.tracer import Tracer
+from auth_api.utils import fast_json
 from auth_api.utils.constants import BCROS, BCSC
 from auth_api.utils.roles import Role, Status, AccessType
 from auth_api.utils.util import cors_preflight
@@ -103,7 +106,7 @@ class Users(Resource):
             if token.get('loginSource', '') in (BCSC, BCROS) \
                     and Role.ACCOUNT_HOLDER.value not in token.get('roles', []) \
                     and len(OrgService.get_orgs(user.identifier, [Status.ACTIVE.value])) > 0:
-                KeycloakService.join_account_holders_group()
+                KeycloakGroupSync.join_account_holders_group()
 
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
@@ -114,18 +117,42 @@ class Users(Resource):
     @cors.crossdomain(origin='*')
     @_JWT.has_one_of_roles([Role.STAFF.value])
     def get():
-        """Return a set of users based on search query parameters (staff only)."""
+        """Return a set of users based on search query parameters (staff only).
+
+        With a limit or cursor a page of users is returned, along with the cursor of the next page if there is one.
+        Otherwise all matching users are streamed as a JSON array.
+        """
         search_email = request.args.get('email', '')
         search_first_name = request.args.get('firstname', '')
         search_last_name = request.args.get('lastname', '')
+        search_text = request.args.get('search', None)
 
-        users = UserService.find_users(first_name=search_first_name, last_name=search_last_name, email=search_email)
-        collection = []
-        for user in users:
-            collection.append(UserService(user).as_dict())
-        response = jsonify(collection)
-        status = http_status.HTTP_200_OK
-        return response, status
+        if request.args.get('limit', None) is None and request.args.get('cursor', None) is None:
+            users = UserService.iter_users(first_name=search_first_name, last_name=search_last_name,
+                                           email=search_email, search_text=search_text,
+                                           batch_size=current_app.config.get('USER_SEARCH_STREAM_BATCH_SIZE', 500))
+            return Response(stream_with_context(_stream_json_array(users)), status=http_status.HTTP_200_OK,
+                            mimetype='application/json')
+
+        try:
+            max_page_size = current_app.config.get('USER_SEARCH_MAX_PAGE_SIZE', 100)
+            limit = min(int(request.args.get('limit', max_page_size)), max_page_size)
+            cursor = request.args.get('cursor', None)
+            after_id = int(cursor) if cursor else None
+            if limit < 1:
+                raise ValueError(limit)
+        except ValueError:
+            return {'message': 'limit and cursor must be positive numbers'}, http_status.HTTP_400_BAD_REQUEST
+
+        users = UserService.find_users(first_name=search_first_name, last_name=search_last_name, email=search_email,
+                                       search_text=search_text, after_id=after_id, limit=limit)
+        response = {
+            'users': [UserService(user).as_dict() for user in users],
+            'limit': limit
+        }
+        if len(users) == limit:
+            response['nextCursor'] = str(users[-1].id)
+        return response, http_status.HTTP_200_OK
 
 
 @cors_preflight('GET,OPTIONS,DELETE')
@@ -312,9 +339,8 @@ class UserOrgs(Resource):
                 response, status = {'message': 'User not found.'}, http_status.HTTP_404_NOT_FOUND
             else:
                 all_orgs = OrgService.get_orgs(user.identifier)
-                orgs = OrgSchema().dump(
-                    all_orgs, many=True)
-                response, status = jsonify({'orgs': orgs}), http_status.HTTP_200_OK
+                orgs = serializers.dump(all_orgs, OrgSchema, many=True)
+                response, status = {'orgs': orgs}, http_status.HTTP_200_OK
 
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
@@ -340,7 +366,8 @@ class MembershipResource(Resource):
             else:
                 membership = MembershipService \
                     .get_membership_for_org_and_user_all_status(org_id=org_id, user_id=user.identifier)
-                response, status = MembershipSchema(exclude=['org']).dump(membership), http_status.HTTP_200_OK
+                response, status = serializers.dump(membership, MembershipSchema, exclude=['org']), \
+                    http_status.HTTP_200_OK
         except BusinessException as exception:
             response, status = {'code': exception.code, 'message': exception.message}, exception.status_code
         return response, status
@@ -358,3 +385,11 @@ class AuthorizationResource(Resource):
         """Add a new contact for the Entity identified by the provided id."""
         sub = g.jwt_oidc_token_info.get('sub', None)
         return AuthorizationService.get_user_authorizations(sub), http_status.HTTP_200_OK
+
+
+def _stream_json_array(items):
+    """Yield the items as the chunks of a JSON array."""
+    yield '['
+    for index, item in enumerate(items):
+        yield (',' if index else '') + fast_json.dumps(item).decode('utf-8')
+    yield ']'
@@ -27,7 +27,7 @@ class OrgSchema(BaseSchema):  # pylint: disable=too-many-ancestors, too-few-publ
         """Maps all of the Org fields to a default schema."""
 
         model = OrgModel
-        exclude = ('members', 'contacts', 'invitations', 'affiliated_entities')
+        exclude = ('members', 'contacts', 'invitations', 'affiliated_entities', 'normalized_name')
 
     org_type = fields.Pluck('OrgTypeSchema', 'code', data_key='orgType')
     access_type = fields.String(data_key='accessType')
@@ -0,0 +1,141 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared schema instances and compiled dumpers for the schemas dumped on every request.
+
+Creating a ModelSchema copies and binds all of its fields, which costs more than dumping a single row with it. Dumping
+does not change a schema, so get_schema creates each (schema, many, only, exclude) combination once and reuses it.
+
+get_dumper goes a step further for the listings: it reads the bound fields of a shared schema once and returns a
+function which builds the output dict of a row directly, leaving out empty values as BaseSchema does. Plain column
+fields are read and converted inline and nested schemas are compiled the same way; every other field is serialized by
+the field itself, so the output is the same as dumping with the schema.
+"""
+import threading
+from typing import Callable, Dict, Tuple
+
+from marshmallow import Schema, fields, missing, utils
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+
+_schemas: Dict[Tuple, Schema] = {}
+_dumpers: Dict[Tuple, Callable] = {}
+_lock = threading.Lock()
+
+
+def _key(schema_class, many: bool = False, only=None, exclude=None) -> Tuple:
+    return (schema_class, bool(many), tuple(only) if only else None, tuple(exclude) if exclude else ())
+
+
+def get_schema(schema_class, many: bool = False, only=None, exclude=None) -> Schema:
+    """Return the shared instance of the schema class for these options."""
+    key = _key(schema_class, many, only, exclude)
+    schema = _schemas.get(key, None)
+    if schema is None:
+        with _lock:
+            schema = _schemas.get(key, None)
+            if schema is None:
+                schema = _schemas[key] = schema_class(many=many, only=only, exclude=exclude or ())
+    return schema
+
+
+def get_dumper(schema_class, only=None, exclude=None) -> Callable:
+    """Return a function which dumps a single object like the schema class with these options does."""
+    key = _key(schema_class, False, only, exclude)
+    dumper = _dumpers.get(key, None)
+    if dumper is None:
+        dumper = compile_dumper(get_schema(schema_class, only=only, exclude=exclude))
+        with _lock:
+            dumper = _dumpers.setdefault(key, dumper)
+    return dumper
+
+
+def dump(obj, schema_class, many: bool = False, only=None, exclude=None):
+    """Dump the object, or the list of objects when many is True, with the compiled dumper of the schema class."""
+    dumper = get_dumper(schema_class, only=only, exclude=exclude)
+    if many:
+        return [dumper(item) for item in obj]
+    return dumper(obj)
+
+
+def compile_dumper(schema: Schema) -> Callable:
+    """Return a function which dumps a single object with the fields of the schema instance.
+
+    Schemas with other dump hooks than the removal of empty values are dumped by the schema itself.
+    """
+    hooks = schema._hooks  # pylint: disable=protected-access
+    post_dump = hooks[(POST_DUMP, False)] + hooks[(POST_DUMP, True)]
+    if hooks[(PRE_DUMP, False)] or hooks[(PRE_DUMP, True)] or \
+            any(name != '_remove_empty' for name in post_dump):
+        return lambda obj: schema.dump(obj, many=False)
+    remove_empty = bool(post_dump)
+
+    accessor = schema.get_attribute
+    writers = tuple(_field_writer(name, field, accessor) for name, field in schema.fields.items()
+                    if not getattr(field, 'load_only', False))
+
+    def _dump(obj):
+        data = {}
+        for key, write in writers:
+            value = write(obj)
+            if value is missing or (remove_empty and value is None):
+                continue
+            data[key] = value
+        return data
+
+    return _dump
+
+
+def _field_writer(name: str, field: fields.Field, accessor) -> Tuple[str, Callable]:
+    """Return the output key of the field and a function which returns its serialized value for an object."""
+    key = field.data_key or name
+    attribute = field.attribute or name
+    convert = _converter(field)
+    if convert is None or '.' in attribute:
+        return key, lambda obj: field.serialize(name, obj, accessor=accessor)
+
+    def _write(obj):
+        value = getattr(obj, attribute, missing)
+        if value is missing:
+            # Not an attribute of the object, e.g. a dict; let the field look the value up.
+            return field.serialize(name, obj, accessor=accessor)
+        return None if value is None else convert(value)
+
+    return key, _write
+
+
+def _converter(field: fields.Field):  # pylint: disable=too-many-return-statements
+    """Return the conversion of a non empty value for the field, or None if the field has to serialize it itself."""
+    field_type = type(field)
+    if field_type is fields.String:
+        return utils.ensure_text_type
+    if field_type is fields.Integer and not field.as_string:
+        return int
+    if field_type is fields.Boolean:
+        return lambda value: True if value in field.truthy else False if value in field.falsy else bool(value)
+    if field_type is fields.DateTime and (field.format or field.DEFAULT_FORMAT) == 'iso':
+        return lambda value: utils.isoformat(value, localtime=field.localtime)
+    if field_type in (fields.Nested, fields.Pluck) and field.nested == 'self':
+        return None
+    if field_type is fields.Pluck:
+        nested = compile_dumper(field.schema)
+        data_key = field._field_data_key  # pylint: disable=protected-access
+        if field.many:
+            return lambda value: [nested(item)[data_key] for item in value]
+        return lambda value: nested(value)[data_key]
+    if field_type is fields.Nested:
+        nested = compile_dumper(field.schema)
+        if field.many:
+            return lambda value: [nested(item) for item in value]
+        return nested
+    return None
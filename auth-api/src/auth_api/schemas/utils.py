@@ -16,14 +16,28 @@
 Test helper functions to load and assert that a JSON payload validates against a defined schema.
 """
 import json
+import threading
+from contextlib import contextmanager
 from os import listdir, path
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 from jsonschema import Draft7Validator, RefResolver, SchemaError, draft7_format_checker
 
 
 BASE_URI = 'https://bcrs.gov.bc.ca/.well_known/schemas'
 
+DEFAULT_SCHEMA_SEARCH_PATH = path.join(path.dirname(__file__), 'schemas')
+
+# Schema stores loaded from disk, by search path; the schema files do not change while the app is running.
+_SCHEMA_STORES: Dict[str, dict] = {}
+_SCHEMA_STORES_LOCK = threading.Lock()
+
+# Idle validators compiled against the cached stores, by (search path, schema id). RefResolver keeps its resolution
+# scope as mutable state while validating, so a validator is taken out of its pool while in use and put back after.
+# A pool rather than a thread local, as under gevent every request runs in a new greenlet with its own locals.
+_VALIDATOR_POOLS: Dict[Tuple[str, str], List[Draft7Validator]] = {}
+_VALIDATOR_POOLS_LOCK = threading.Lock()
+
 
 def get_schema(filename: str) -> dict:
     """Return the given schema file identified by filename."""
@@ -44,11 +58,30 @@ def _load_json_schema(filename: str):
 def get_schema_store(validate_schema: bool = False, schema_search_path: str = None) -> dict:
     """Return a schema_store as a dict.
 
-    The default returns schema_store of the default schemas found in this package.
+    The default returns schema_store of the default schemas found in this package. The files are read once per search
+    path and the same store is returned after that.
     """
+    if not schema_search_path:
+        schema_search_path = DEFAULT_SCHEMA_SEARCH_PATH
+
+    schemastore = _SCHEMA_STORES.get(schema_search_path, None)
+    if schemastore is None:
+        with _SCHEMA_STORES_LOCK:
+            schemastore = _SCHEMA_STORES.get(schema_search_path, None)
+            if schemastore is None:
+                schemastore = _load_schema_store(schema_search_path)
+                _SCHEMA_STORES[schema_search_path] = schemastore
+
+    if validate_schema:
+        for _, schema in schemastore.items():
+            Draft7Validator.check_schema(schema)
+
+    return schemastore
+
+
+def _load_schema_store(schema_search_path: str) -> dict:
+    """Read every schema file under the search path, keyed by $id."""
     try:
-        if not schema_search_path:
-            schema_search_path = path.join(path.dirname(__file__), 'schemas')
         schemastore = {}
         fnames = listdir(schema_search_path)
         for fname in fnames:
@@ -59,16 +92,49 @@ def get_schema_store(validate_schema: bool = False, schema_search_path: str = No
                     if '$id' in schema:
                         schemastore[schema['$id']] = schema
 
-        if validate_schema:
-            for _, schema in schemastore.items():
-                Draft7Validator.check_schema(schema)
-
         return schemastore
     except (SchemaError, json.JSONDecodeError) as error:
         # handle schema error
         raise error
 
 
+def get_validator(schema_id: str, schema_store: dict = None, schema_search_path: str = None) -> Draft7Validator:
+    """Return a newly compiled validator for the schema id, against the cached store unless one is supplied."""
+    if not schema_search_path:
+        schema_search_path = DEFAULT_SCHEMA_SEARCH_PATH
+    if not schema_store:
+        schema_store = get_schema_store(schema_search_path=schema_search_path)
+
+    schema = schema_store.get(f'{BASE_URI}/{schema_id}')
+    schema_file_path = path.join(schema_search_path, schema_id)
+    resolver = RefResolver(f'file://{schema_file_path}.json', schema, schema_store)
+    return Draft7Validator(schema, format_checker=draft7_format_checker, resolver=resolver)
+
+
+@contextmanager
+def checkout_validator(schema_id: str, schema_store: dict = None, schema_search_path: str = None):
+    """Lend a validator for the schema id to the caller alone, for the duration of the with block.
+
+    Validators for the cached schema stores are taken from a pool shared by all threads and greenlets, compiled only
+    when every pooled one is in use; a caller supplied store gets a new one.
+    """
+    if schema_store:
+        yield get_validator(schema_id, schema_store, schema_search_path)
+        return
+
+    key = (schema_search_path or DEFAULT_SCHEMA_SEARCH_PATH, schema_id)
+    with _VALIDATOR_POOLS_LOCK:
+        pool = _VALIDATOR_POOLS.setdefault(key, [])
+        validator = pool.pop() if pool else None
+    if validator is None:
+        validator = get_validator(schema_id, schema_search_path=schema_search_path)
+    try:
+        yield validator
+    finally:
+        with _VALIDATOR_POOLS_LOCK:
+            pool.append(validator)
+
+
 def validate(json_data: json,
              schema_id: str,
              schema_store: dict = None,
@@ -77,31 +143,15 @@ def validate(json_data: json,
              ) -> Tuple[bool, iter]:
     """Load the json file and validate against loaded schema."""
     try:
-        if not schema_search_path:
-            schema_search_path = path.join(path.dirname(__file__), 'schemas')
-
-        if not schema_store:
-            schema_store = get_schema_store(validate_schema, schema_search_path)
-
-        schema = schema_store.get(f'{BASE_URI}/{schema_id}')
         if validate_schema:
-            Draft7Validator.check_schema(schema)
+            store = schema_store or get_schema_store(schema_search_path=schema_search_path)
+            Draft7Validator.check_schema(store.get(f'{BASE_URI}/{schema_id}'))
 
-        schema_file_path = path.join(schema_search_path, schema_id)
-        resolver = RefResolver(f'file://{schema_file_path}.json', schema, schema_store)
-
-        if Draft7Validator(schema,
-                           format_checker=draft7_format_checker,
-                           resolver=resolver
-                           ) \
-                .is_valid(json_data):
+        # Collect the errors in a single pass instead of validating once more to report them.
+        with checkout_validator(schema_id, schema_store, schema_search_path) as validator:
+            errors = list(validator.iter_errors(json_data))
+        if not errors:
             return True, None
-
-        errors = Draft7Validator(schema,
-                                 format_checker=draft7_format_checker,
-                                 resolver=resolver
-                                 ) \
-            .iter_errors(json_data)
         return False, errors
 
     except SchemaError as error:
@@ -13,11 +13,14 @@
 # limitations under the License.
 """Exposes all of the Services used in the API."""
 from .affiliation import Affiliation
+from .bulk_user_job import BulkUserJob
 from .codes import Codes
 from .contact import Contact
 from .documents import Documents
+from .email_dispatcher import EmailDispatcher
 from .entity import Entity
 from .invitation import Invitation
+from .keycloak_group_sync import KeycloakGroupSync
 from .membership import Membership
 from .products import Product
 from .org import Org
@@ -20,8 +20,10 @@ from sbc_common_components.tracing.service_tracing import ServiceTracing  # noqa
 
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
+from auth_api.models import LoaderProfile, loader_options
 from auth_api.models.affiliation import Affiliation as AffiliationModel
-from auth_api.schemas import AffiliationSchema
+from auth_api.schemas import AffiliationSchema, EntitySchema
+from auth_api.schemas import serializers
 from auth_api.services.entity import Entity as EntityService
 from auth_api.services.org import Org as OrgService
 from auth_api.utils.passcode import validate_passcode
@@ -55,9 +57,7 @@ class Affiliation:
 
         None fields are not included in the dictionary.
         """
-        affiliation_schema = AffiliationSchema()
-        obj = affiliation_schema.dump(self._model, many=False)
-        return obj
+        return serializers.dump(self._model, AffiliationSchema)
 
     @staticmethod
     def find_affiliated_entities_by_org_id(org_id, token_info: Dict = None):
@@ -70,13 +70,13 @@ class Affiliation:
         if org is None:
             raise BusinessException(Error.DATA_NOT_FOUND, None)
 
-        data = []
-        affiliation_models = AffiliationModel.find_affiliations_by_org_id(org_id)
+        affiliation_models = AffiliationModel.find_affiliations_by_org_id(
+            org_id, loader_options(LoaderProfile.AFFILIATED_ENTITIES))
         if affiliation_models is None:
             raise BusinessException(Error.DATA_NOT_FOUND, None)
 
-        for affiliation_model in affiliation_models:
-            data.append(EntityService(affiliation_model.entity).as_dict())
+        data = serializers.dump([affiliation_model.entity for affiliation_model in affiliation_models], EntitySchema,
+                                many=True)
         current_app.logger.debug('>find_affiliations_by_org_id')
 
         return data
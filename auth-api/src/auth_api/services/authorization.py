@@ -17,12 +17,25 @@ This module is to handle authorization related queries.
 """
 from typing import Dict
 
-from flask import abort
+from flask import abort, current_app, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
+from auth_api.models import Affiliation as AffiliationModel
+from auth_api.models import Membership as MembershipModel
+from auth_api.models import db
 from auth_api.models.views.authorization import Authorization as AuthorizationView
+from auth_api.utils.cache import TTLCache
 from auth_api.utils.roles import STAFF, Role, STAFF_ADMIN
 
 
+# Cross request cache for authorization lookups; sized from AUTH_CACHE_MAX_SIZE and AUTH_CACHE_TTL on first use.
+_AUTHORIZATION_CACHE = TTLCache(max_size=0)
+_MISSING = object()
+# Set in session.info when a flush changed memberships or affiliations, so the cache is cleared once they commit.
+_AUTHORIZATIONS_CHANGED = 'authorizations_changed'
+
+
 class Authorization:
     """This module is to handle authorization related queries.
 
@@ -139,26 +152,114 @@ def check_auth(token_info: Dict, **kwargs):
         org_identifier = kwargs.get('org_id', None)
         auth = None
         if business_identifier:
-            auth = Authorization.get_user_authorizations_for_entity(token_info, business_identifier)
+            auth = _get_cached_authorization(
+                (None, ('business', business_identifier), corp_type_in_jwt),
+                lambda: Authorization.get_user_authorizations_for_entity(token_info, business_identifier))
         elif org_identifier:
-            auth_record = AuthorizationView.find_user_authorization_by_org_id_and_corp_type(org_identifier,
-                                                                                            corp_type_in_jwt)
-            auth = Authorization(auth_record).as_dict() if auth_record else None
+            auth = _get_cached_authorization(
+                (None, ('org', str(org_identifier)), corp_type_in_jwt),
+                lambda: _as_dict_or_none(
+                    AuthorizationView.find_user_authorization_by_org_id_and_corp_type(org_identifier,
+                                                                                      corp_type_in_jwt)))
         if auth is None:
             abort(403)
     else:
         business_identifier = kwargs.get('business_identifier', None)
         org_identifier = kwargs.get('org_id', None)
+        keycloak_guid = token_info.get('sub', None)
+        auth = None
         if business_identifier:
-            auth = Authorization.get_user_authorizations_for_entity(token_info, business_identifier)
+            auth = _get_cached_authorization(
+                (keycloak_guid, ('business', business_identifier), None),
+                lambda: Authorization.get_user_authorizations_for_entity(token_info, business_identifier))
         elif org_identifier:
-            auth_record = AuthorizationView.find_user_authorization_by_org_id(token_info.get('sub', None),
-                                                                              org_identifier)
-            auth = Authorization(auth_record).as_dict() if auth_record else None
+            auth = _get_cached_authorization(
+                (keycloak_guid, ('org', str(org_identifier)), None),
+                lambda: _as_dict_or_none(AuthorizationView.find_user_authorization_by_org_id(keycloak_guid,
+                                                                                             org_identifier)))
 
         _check_for_roles(auth.get('orgMembership', None) if auth else None, kwargs)
 
 
+def _as_dict_or_none(auth_record):
+    return Authorization(auth_record).as_dict() if auth_record else None
+
+
+def _get_cached_authorization(cache_key: tuple, loader):
+    """Return the authorization for the key from the request cache, then the shared cache, then the loader.
+
+    Keys are (token sub, org id or business identifier, corp type); service accounts are keyed on corp type only.
+    Lookups made while the session holds uncommitted authorization changes are kept out of the shared cache, as other
+    requests can not see those changes, and they may yet be rolled back.
+    """
+    request_cache = g.setdefault('authorization_cache', {}) if has_app_context() else {}
+    auth = request_cache.get(cache_key, _MISSING)
+    if auth is not _MISSING:
+        return auth
+
+    shared_cache = _get_shared_cache()
+    auth = shared_cache.get(cache_key, _MISSING)
+    if auth is _MISSING:
+        auth = loader()
+        if not db.session.info.get(_AUTHORIZATIONS_CHANGED, False):
+            shared_cache.set(cache_key, auth)
+
+    request_cache[cache_key] = auth
+    return auth
+
+
+def _get_shared_cache():
+    """Return the cross request cache, resized if the configuration has changed."""
+    max_size = current_app.config.get('AUTH_CACHE_MAX_SIZE', 0)
+    ttl = current_app.config.get('AUTH_CACHE_TTL', 0)
+    if ttl <= 0:
+        max_size = 0
+    if (_AUTHORIZATION_CACHE.max_size, _AUTHORIZATION_CACHE.ttl) != (max_size, ttl):
+        _AUTHORIZATION_CACHE.clear()
+        _AUTHORIZATION_CACHE.max_size = max_size
+        _AUTHORIZATION_CACHE.ttl = ttl
+    return _AUTHORIZATION_CACHE
+
+
+def clear_authorization_cache(*args):  # pylint: disable=unused-argument
+    """Drop all cached authorizations for this request and this process."""
+    if has_app_context():
+        g.pop('authorization_cache', None)
+    _AUTHORIZATION_CACHE.clear()
+
+
+def _mark_authorizations_changed(mapper, connection, target):  # pylint: disable=unused-argument
+    """Drop the request cache at flush, and have the shared cache dropped when the session commits.
+
+    Other requests can not see the change until it commits, so clearing the shared cache earlier would let them cache
+    the old authorizations again. Core statements such as bulk_insert do not fire these events; their callers clear
+    the cache themselves.
+    """
+    if has_app_context():
+        g.pop('authorization_cache', None)
+    session = object_session(target)
+    if session is not None:
+        session.info[_AUTHORIZATIONS_CHANGED] = True
+
+
+def _clear_after_commit(session):
+    if session.info.pop(_AUTHORIZATIONS_CHANGED, False):
+        clear_authorization_cache()
+
+
+def _clear_after_rollback(session):
+    """Drop the caches when changed authorizations roll back, as lookups since the flush saw the uncommitted rows."""
+    if session.info.pop(_AUTHORIZATIONS_CHANGED, False):
+        clear_authorization_cache()
+
+
+for _model in (MembershipModel, AffiliationModel):
+    for _event in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event, _mark_authorizations_changed)
+event.listen(Session, 'after_commit', _clear_after_commit)
+event.listen(Session, 'after_rollback', _clear_after_rollback)
+
+
 def _check_for_roles(role: str, kwargs):
     is_authorized: bool = False
     # If role is found
@@ -0,0 +1,242 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Bulk User Job service.
+
+This module provisions large bulk user requests in the background and reports their progress.
+"""
+import datetime
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Dict, List
+
+from flask import current_app, g, has_app_context
+
+from auth_api.exceptions import BusinessException
+from auth_api.exceptions.errors import Error
+from auth_api.models import BulkUserJob as BulkUserJobModel
+from auth_api.models import db
+from auth_api.utils.enums import BulkUserJobStatus
+from auth_api.utils.polling_worker import PollingWorker
+from auth_api.utils.roles import ADMIN, OWNER
+
+from .authorization import check_auth
+from .user import User as UserService
+
+
+class InlineExecutor(Executor):
+    """Executor which runs each task in the calling thread; used when no background workers are configured."""
+
+    def submit(self, fn, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Run the task now and return its completed future."""
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+        return future
+
+
+class BulkUserJob:
+    """Manages bulk user jobs.
+
+    A job is saved with the requested users and provisioned in chunks by a background worker pool; progress and the
+    per user results are saved after every chunk. The passwords are never saved, so they only live in the process
+    which was handed the job, and the sweeper thread of that process renews the heartbeat of its jobs while they are
+    queued or running. A job whose process goes away cannot be finished; the sweeper of another process fails it,
+    with a result for each user it had not processed, so those users can be submitted again.
+    """
+
+    _executor: Executor = None
+    _executor_lock = threading.Lock()
+    _worker: PollingWorker = None
+    _lock = threading.Lock()
+    _owner: str = None
+    _held_jobs = set()
+
+    def __init__(self, model):
+        """Return a Bulk User Job service."""
+        self._model = model
+
+    @property
+    def identifier(self):
+        """Return the identifier for this job."""
+        return self._model.id
+
+    def as_dict(self):
+        """Return the job status, progress and the results of the users processed so far."""
+        return {
+            'id': self._model.id,
+            'orgId': self._model.org_id,
+            'status': self._model.status,
+            'total': self._model.total,
+            'processed': self._model.processed,
+            'users': self._model.results or []
+        }
+
+    @staticmethod
+    def submit(request_json: dict, token_info: Dict = None):
+        """Validate the bulk user request, save it as a job and queue it for the background workers."""
+        users = request_json['users']
+        org_id = request_json['orgId']
+        UserService.validate_bulk_users(users, org_id, token_info)
+
+        executor = BulkUserJob._get_executor()
+
+        passwords = [user.get('password') for user in users]
+        job = BulkUserJobModel(org_id=org_id, status=BulkUserJobStatus.PENDING.value, total=len(users), processed=0,
+                               users=[{key: value for key, value in user.items() if key != 'password'}
+                                      for user in users],
+                               results=[], owner=BulkUserJob._get_owner(), heartbeat=datetime.datetime.now())
+        job.save()
+        job_id = job.id
+
+        with BulkUserJob._lock:
+            BulkUserJob._held_jobs.add(job_id)
+        BulkUserJob._queue(executor, job_id, passwords)
+        return BulkUserJob(BulkUserJobModel.find_by_id(job_id))
+
+    @staticmethod
+    def find_by_id(job_id: int, token_info: Dict = None):
+        """Return the job if the token user is an admin or owner of its org."""
+        job = BulkUserJobModel.find_by_id(job_id)
+        if job is None:
+            raise BusinessException(Error.DATA_NOT_FOUND, None)
+        check_auth(token_info, org_id=job.org_id, one_of_roles=(ADMIN, OWNER))
+        return BulkUserJob(job)
+
+    @staticmethod
+    def sweep(batch_size: int) -> int:
+        """Renew the heartbeat of the jobs this process holds, then fail abandoned jobs; return how many failed."""
+        with BulkUserJob._lock:
+            job_ids = list(BulkUserJob._held_jobs)
+        BulkUserJobModel.renew_heartbeats(job_ids, BulkUserJob._get_owner())
+        return BulkUserJob.fail_abandoned_jobs(batch_size)
+
+    @staticmethod
+    def fail_abandoned_jobs(batch_size: int) -> int:
+        """Fail up to batch_size unfinished jobs whose process has stopped renewing them; return how many.
+
+        The users which were not provisioned are reported as not processed, so they can be submitted again.
+        """
+        owner = BulkUserJob._get_owner()
+        job_ids = BulkUserJobModel.claim_abandoned(batch_size,
+                                                   current_app.config.get('BULK_USER_JOB_STALE_SECONDS', 600), owner)
+        for job_id in job_ids:
+            current_app.logger.info(f'Failing abandoned bulk user job {job_id}')
+            job = BulkUserJobModel.find_by_id(job_id)
+            interrupted = [{'username': user['username'], 'http_status': Error.BULK_USER_JOB_INTERRUPTED.value[1],
+                            'error': Error.BULK_USER_JOB_INTERRUPTED.value[0]}
+                           for user in (job.users or [])[job.processed:]]
+            BulkUserJobModel.update_if_owner(job_id, owner, status=BulkUserJobStatus.FAILED.value,
+                                             processed=job.total, results=(job.results or []) + interrupted,
+                                             users=None)
+        return len(job_ids)
+
+    @classmethod
+    def start(cls, app):
+        """Start the sweeper thread of this process, which also keeps the jobs of the process alive."""
+        with cls._lock:
+            if cls._worker is None:
+                cls._worker = PollingWorker('bulk-user-job-sweeper', BulkUserJob.sweep,
+                                            app.config.get('BULK_USER_JOB_SWEEPER_BATCH_SIZE', 10),
+                                            app.config.get('BULK_USER_JOB_SWEEPER_POLL_SECONDS', 60))
+        cls._worker.start(app)
+
+    @classmethod
+    def stop(cls, timeout: float = None):
+        """Stop the sweeper thread after its current batch."""
+        if cls._worker is not None:
+            cls._worker.stop(timeout)
+
+    @classmethod
+    def set_executor(cls, executor: Executor):
+        """Replace the executor used to run jobs, shutting down the current one."""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False)
+            cls._executor = executor
+
+    @classmethod
+    def _get_executor(cls) -> Executor:
+        """Return the executor, creating it on first use in this process."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                workers = current_app.config.get('BULK_USER_JOB_WORKERS', 2)
+                cls._executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else InlineExecutor()
+        return cls._executor
+
+    @classmethod
+    def _get_owner(cls) -> str:
+        """Return the name this process holds jobs under; unique to the process, even if it restarts with its pid."""
+        if cls._owner is None:
+            cls._owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        return cls._owner
+
+    @staticmethod
+    def _queue(executor: Executor, job_id: int, passwords: List[str]):
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        executor.submit(BulkUserJob._run, app, job_id, passwords)
+
+    @staticmethod
+    def _run(app, job_id: int, passwords: List[str]):
+        """Run the job in an app context; the inline executor reuses the caller's context."""
+        try:
+            if has_app_context() and current_app._get_current_object() is app:  # pylint: disable=protected-access
+                BulkUserJob._process(job_id, passwords)
+            else:
+                with app.app_context():
+                    BulkUserJob._process(job_id, passwords)
+        finally:
+            with BulkUserJob._lock:
+                BulkUserJob._held_jobs.discard(job_id)
+
+    @staticmethod
+    def _process(job_id: int, passwords: List[str]):
+        """Provision the users of the job chunk by chunk, saving the progress after each chunk.
+
+        Every save is conditional on this process still owning the job, so a job failed by the sweeper while a slow
+        chunk was running is not touched again.
+        """
+        owner = BulkUserJob._get_owner()
+        job = BulkUserJobModel.find_by_id(job_id)
+        if job is None or job.status not in (BulkUserJobStatus.PENDING.value, BulkUserJobStatus.RUNNING.value) or \
+                not BulkUserJobModel.update_if_owner(job_id, owner, status=BulkUserJobStatus.RUNNING.value):
+            return
+
+        # Audit columns of the new users and memberships point to the user who submitted the job.
+        if not g.get('jwt_oidc_token_info', None) and job.created_by and job.created_by.keycloak_guid:
+            g.jwt_oidc_token_info = {'sub': str(job.created_by.keycloak_guid)}
+
+        chunk_size = current_app.config.get('BULK_USER_JOB_CHUNK_SIZE', 50)
+        users, processed, results = job.users, job.processed, job.results or []
+        status = BulkUserJobStatus.FAILED.value
+        try:
+            while processed < job.total:
+                chunk = [dict(user, password=password) for user, password in
+                         zip(users[processed:processed + chunk_size], passwords[processed:processed + chunk_size])]
+                results = results + UserService.provision_users(chunk, job.org_id)['users']
+                processed = processed + len(chunk)
+                if not BulkUserJobModel.update_if_owner(job_id, owner, processed=processed, results=results):
+                    current_app.logger.error(f'Bulk user job {job_id} was taken over by another worker')
+                    return
+            status = BulkUserJobStatus.COMPLETED.value
+        except Exception as e:  # pylint: disable=broad-except
+            current_app.logger.error('Bulk user job {} failed : {}'.format(job_id, e))
+            db.session.rollback()
+
+        # The users are not kept once the job has finished, whether it succeeded or not.
+        BulkUserJobModel.update_if_owner(job_id, owner, status=status, users=None)
@@ -13,19 +13,25 @@
 # limitations under the License.
 """Service for retrieving the codes."""
 import importlib
+import threading
 
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
-from auth_api.models import db
-from auth_api.models.base_model import BaseCodeModel
+from auth_api.models.code_registry import CodeRegistry
+from auth_api.utils.representation import Representation
 
 
 class Codes:
     """Retrieving the codes in DB.
 
     This service manages retrieving the values from code, type or status tables.
+    The serialized codes of each table are kept until the code registry is reloaded.
     """
 
+    _snapshots = {}
+    _snapshots_version = None
+    _snapshots_lock = threading.Lock()
+
     def __init__(self):
         """Return a code service instance."""
 
@@ -36,37 +42,67 @@ class Codes:
         :param table_fullname: String with fullname of table.
         :return: Class reference or None.
         """
-        for model_class in db.Model._decl_class_registry.values():  # pylint:disable=protected-access
-            if hasattr(model_class, '__table__') and model_class.__table__.fullname == code_type:
-                if issubclass(model_class, BaseCodeModel):
-                    return model_class
-
-        return None
+        return CodeRegistry.code_model_for_table(code_type)
 
     @classmethod
     def fetch_codes(cls, code_type: str = None) -> []:
         """Return values from code table."""
+        representation = cls.fetch_codes_representation(code_type)
+        return representation.data if representation else None
+
+    @classmethod
+    def fetch_codes_representation(cls, code_type: str = None) -> Representation:
+        """Return the serialized values from code table, or None if it is not a code, type or status table."""
         try:
-            data: [] = None
             if code_type:
                 code_model = Codes.fetch_data_model(code_type.lower())
 
                 if code_model:
-                    codes = code_model.query.all()
-
-                    data = []
-                    # transform each of entry to a dictionary base on schema.
-                    for entry in codes:
-                        module_name = f'auth_api.schemas.{entry.__tablename__}'
-                        class_name = f'{entry.__class__.__name__}Schema'
-                        try:
-                            schema = getattr(importlib.import_module(module_name), class_name)
-                        except ModuleNotFoundError:
-                            schema = getattr(importlib.import_module('auth_api.schemas.basecode_type'),
-                                             'BaseCodeSchema')
-                        code_schema = schema()
-                        data.append(code_schema.dump(entry, many=False))
-                return data
+                    return cls._get_snapshot(code_model)
             return None
         except Exception as exception:
             raise BusinessException(Error.UNDEFINED_ERROR, exception)
+
+    @classmethod
+    def reload(cls):
+        """Read the code tables again and drop the serialized codes."""
+        CodeRegistry.reload()
+        with cls._snapshots_lock:
+            cls._snapshots = {}
+
+    @classmethod
+    def _get_snapshot(cls, code_model) -> Representation:
+        """Return the serialized codes of the table, serializing them on first use."""
+        if not CodeRegistry.load():
+            return cls._serialize(code_model, code_model.query.all())
+
+        version = CodeRegistry.version()
+        snapshots = cls._snapshots
+        if cls._snapshots_version == version and code_model in snapshots:
+            return snapshots[code_model]
+
+        data = cls._serialize(code_model, CodeRegistry.rows(code_model))
+        with cls._snapshots_lock:
+            if version != CodeRegistry.version():
+                # The tables were read again while serializing; do not keep the old rows.
+                return data
+            if cls._snapshots_version != version:
+                cls._snapshots = {}
+                cls._snapshots_version = version
+            cls._snapshots[code_model] = data
+        return data
+
+    @classmethod
+    def _serialize(cls, code_model, codes) -> Representation:
+        # transform each of entry to a dictionary base on schema.
+        code_schema = cls._get_schema(code_model)()
+        return Representation([code_schema.dump(entry, many=False) for entry in codes])
+
+    @staticmethod
+    def _get_schema(code_model):
+        module_name = f'auth_api.schemas.{code_model.__tablename__}'
+        class_name = f'{code_model.__name__}Schema'
+        try:
+            return getattr(importlib.import_module(module_name), class_name)
+        except ModuleNotFoundError:
+            return getattr(importlib.import_module('auth_api.schemas.basecode_type'), 'BaseCodeSchema')
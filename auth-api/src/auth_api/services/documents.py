@@ -13,15 +13,16 @@
 # limitations under the License.
 """Service for managing the documents."""
 
-from jinja2 import Environment, FileSystemLoader
+from flask import current_app
 from sbc_common_components.tracing.service_tracing import ServiceTracing  # noqa: I001
 
 from auth_api.models import Documents as DocumentsModel
 from auth_api.schemas import DocumentSchema
+from auth_api.utils.cache import TTLCache
+from auth_api.utils.representation import Representation
 from config import get_named_config
 
 
-ENV = Environment(loader=FileSystemLoader('.'), autoescape=True)
 CONFIG = get_named_config()
 
 
@@ -32,6 +33,8 @@ class Documents:
     This service manages retrieving the documents.
     """
 
+    _cache: TTLCache = None
+
     def __init__(self, model):
         """Return an invitation service instance."""
         self._model = model
@@ -53,3 +56,22 @@ class Documents:
         if doc:
             return Documents(doc)
         return None
+
+    @classmethod
+    def fetch_latest_document_representation(cls, document_type) -> Representation:
+        """Return the serialized latest document of the type, kept for DOCUMENTS_CACHE_TTL seconds."""
+        cache = cls._get_cache()
+        representation = cache.get(document_type)
+        if representation is None:
+            doc = cls.fetch_latest_document(document_type)
+            if doc is None:
+                return None
+            representation = Representation(doc.as_dict())
+            cache.set(document_type, representation)
+        return representation
+
+    @classmethod
+    def _get_cache(cls) -> TTLCache:
+        if cls._cache is None:
+            cls._cache = TTLCache(max_size=100, ttl=current_app.config.get('DOCUMENTS_CACHE_TTL', 300))
+        return cls._cache
@@ -0,0 +1,100 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Email Dispatcher service.
+
+This module sends the emails saved to the outbox to notify-api in batches, retrying failed emails with backoff.
+"""
+import datetime
+import threading
+
+from flask import current_app
+
+from auth_api.models import EmailOutbox as EmailOutboxModel
+from auth_api.models import Invitation as InvitationModel
+from auth_api.models import db
+from auth_api.utils.polling_worker import PollingWorker
+
+from .notification import deliver_email
+
+
+class EmailDispatcher:
+    """Drains the email outbox.
+
+    Each process runs one background dispatcher thread; dispatchers in other processes skip the emails leased by
+    this one, so any number of them can drain the outbox together.
+    """
+
+    _worker: PollingWorker = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def dispatch_pending(batch_size: int = None) -> int:
+        """Send a batch of due emails and return how many were attempted.
+
+        The batch is claimed with a lease and committed before notify-api is called, and the result of each email is
+        committed on its own, so no row lock is held while waiting on notify-api. The lease of each email is renewed
+        just before it is sent, so a slow batch cannot outlive it; an email whose lease was taken over by another
+        dispatcher is left to that dispatcher.
+        """
+        config = current_app.config
+        batch_size = batch_size or config.get('EMAIL_OUTBOX_BATCH_SIZE', 20)
+        max_attempts = config.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        retry_seconds = config.get('EMAIL_OUTBOX_RETRY_SECONDS', 30)
+
+        lease_seconds = config.get('EMAIL_OUTBOX_LEASE_SECONDS', 120)
+
+        emails = EmailOutboxModel.claim_due(batch_size, lease_seconds)
+        for email in emails:
+            lease = EmailOutboxModel.renew_lease(email.id, email.next_attempt_at, lease_seconds)
+            if lease is None:
+                current_app.logger.info(f'Email {email.id} was taken over by another dispatcher')
+                continue
+
+            error = None
+            try:
+                sent = deliver_email(email.subject, email.recipients, email.body)
+            except Exception as e:  # pylint: disable=broad-except
+                sent, error = False, str(e)
+
+            attempts = email.attempts + 1
+            if sent:
+                EmailOutboxModel.mark_sent(email.id, lease)
+            else:
+                current_app.logger.error(f'Email {email.id} could not be sent, attempt {attempts} : {error}')
+                next_attempt_at = None
+                if attempts < max_attempts:
+                    delay = retry_seconds * 2 ** (attempts - 1)
+                    next_attempt_at = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+                failed = EmailOutboxModel.mark_failed(email.id, lease, next_attempt_at,
+                                                      error or 'notify-api did not accept the email')
+                if failed and next_attempt_at is None and email.invitation_id:
+                    InvitationModel.mark_failed(email.invitation_id)
+            db.session.commit()
+        return len(emails)
+
+    @classmethod
+    def start(cls, app):
+        """Start the dispatcher thread of this process, unless it is already running."""
+        with cls._lock:
+            if cls._worker is None:
+                cls._worker = PollingWorker('email-dispatcher', EmailDispatcher.dispatch_pending,
+                                            app.config.get('EMAIL_OUTBOX_BATCH_SIZE', 20),
+                                            app.config.get('EMAIL_OUTBOX_POLL_SECONDS', 5))
+        cls._worker.start(app)
+
+    @classmethod
+    def stop(cls, timeout: float = None):
+        """Stop the dispatcher thread after its current batch."""
+        if cls._worker is not None:
+            cls._worker.stop(timeout)
@@ -24,6 +24,7 @@ from auth_api.models import Contact as ContactModel
 from auth_api.models import ContactLink as ContactLinkModel
 from auth_api.models.entity import Entity as EntityModel
 from auth_api.schemas import EntitySchema
+from auth_api.schemas import serializers
 from auth_api.utils.enums import CorpType
 from auth_api.utils.passcode import passcode_hash
 from auth_api.utils.util import camelback2snake
@@ -70,9 +71,7 @@ class Entity:
 
         None fields are not included in the dictionary.
         """
-        entity_schema = EntitySchema()
-        obj = entity_schema.dump(self._model, many=False)
-        return obj
+        return serializers.dump(self._model, EntitySchema)
 
     @classmethod
     def find_by_business_identifier(cls, business_identifier: str = None, token_info: Dict = None,
@@ -18,19 +18,21 @@ from typing import Dict
 
 from flask import current_app
 from itsdangerous import URLSafeTimedSerializer
-from jinja2 import Environment, FileSystemLoader
 from sbc_common_components.tracing.service_tracing import ServiceTracing  # noqa: I001
 
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
+from auth_api.models import LoaderProfile, loader_options
 from auth_api.models import Invitation as InvitationModel
 from auth_api.models import InvitationStatus as InvitationStatusModel
 from auth_api.models import Membership as MembershipModel
 from auth_api.models import OrgSettings as OrgSettingsModel
 from auth_api.models.org import Org as OrgModel
 from auth_api.schemas import InvitationSchema
+from auth_api.schemas import serializers
 from auth_api.services.user import User as UserService
 from auth_api.utils.constants import InvitationStatus
+from auth_api.utils.email_templates import EmailTemplates
 from auth_api.utils.roles import ADMIN, MEMBER, OWNER, Status, InvitationType, STAFF_ADMIN, AccessType
 from config import get_named_config
 
@@ -38,7 +40,6 @@ from .authorization import check_auth
 from .membership import Membership as MembershipService
 from .notification import send_email
 
-ENV = Environment(loader=FileSystemLoader('.'), autoescape=True)
 CONFIG = get_named_config()
 
 
@@ -55,9 +56,7 @@ class Invitation:
     @ServiceTracing.disable_tracing
     def as_dict(self):
         """Return the internal Invitation model as a dictionary."""
-        invitation_schema = InvitationSchema()
-        obj = invitation_schema.dump(self._model, many=False)
-        return obj
+        return serializers.dump(self._model, InvitationSchema)
 
     @staticmethod
     def create_invitation(invitation_info: Dict, user, token_info: Dict, invitation_origin):
@@ -125,9 +124,12 @@ class Invitation:
         if status:
             status = InvitationStatus[status]
 
+        # Load the memberships and orgs which InvitationSchema dumps along with the invitations.
+        options = loader_options(LoaderProfile.INVITATIONS)
+
         # If staff return full list
         if 'staff' in token_info.get('realm_access').get('roles'):
-            return InvitationModel.find_pending_invitations_by_org(org_id)
+            return InvitationModel.find_pending_invitations_by_org(org_id, options)
 
         current_user: UserService = UserService.find_by_jwt_token(token_info)
         current_user_membership: MembershipModel = \
@@ -142,7 +144,7 @@ class Invitation:
         if current_user_membership.membership_type_code == MEMBER:
             return []
 
-        return InvitationModel.find_invitations_by_org(org_id=org_id, status=status)
+        return InvitationModel.find_invitations_by_org(org_id=org_id, status=status, options=options)
 
     @staticmethod
     def find_invitation_by_id(invitation_id, token_info: Dict = None):
@@ -168,17 +170,12 @@ class Invitation:
             format(user['firstname'], user['firstname'], org_name)
         sender = CONFIG.MAIL_FROM_ID
         try:
-            template = ENV.get_template('email_templates/admin_notification_email.html')
+            html_body = EmailTemplates.render('admin_notification_email.html', url=url, user=user, org_name=org_name,
+                                              logo_url=f'{url}/{CONFIG.REGISTRIES_LOGO_IMAGE_NAME}')
         except Exception:
             raise BusinessException(Error.FAILED_INVITATION, None)
 
-        sent_response = send_email(subject, sender, recipient_email_list,
-                                   template.render(url=url, user=user, org_name=org_name,
-                                                   logo_url=f'{url}/{CONFIG.REGISTRIES_LOGO_IMAGE_NAME}'))
-        if not sent_response:
-            # invitation.invitation_status_code = 'FAILED'
-            # invitation.save()
-            raise BusinessException(Error.FAILED_INVITATION, None)
+        send_email(subject, sender, recipient_email_list, html_body)
 
     @staticmethod
     def send_invitation(invitation: InvitationModel, org_name, user, app_url):
@@ -189,19 +186,16 @@ class Invitation:
         sender = CONFIG.MAIL_FROM_ID
         recipient = invitation.recipient_email
         token_confirm_url = '{}/{}/{}'.format(app_url, mail_configs.get('token_confirm_path'), invitation.token)
-        template = ENV.get_template(f"email_templates/{mail_configs.get('template_name')}.html")
-
-        sent_response = send_email(subject, sender, recipient,
-                                   template.render(invitation=invitation,
-                                                   url=token_confirm_url,
-                                                   user=user,
-                                                   org_name=org_name,
-                                                   logo_url=f'{app_url}/{CONFIG.REGISTRIES_LOGO_IMAGE_NAME}'))
-        if not sent_response:
-            invitation.invitation_status_code = 'FAILED'
-            invitation.save()
-            current_app.logger.debug('>send_invitation failed')
-            raise BusinessException(Error.FAILED_INVITATION, None)
+        html_body = EmailTemplates.render(f"{mail_configs.get('template_name')}.html",
+                                          invitation=invitation,
+                                          url=token_confirm_url,
+                                          user=user,
+                                          org_name=org_name,
+                                          logo_url=f'{app_url}/{CONFIG.REGISTRIES_LOGO_IMAGE_NAME}')
+
+        # Queued to the outbox; the email dispatcher retries a notify-api failure, and marks the invitation FAILED
+        # if the email is finally given up on.
+        send_email(subject, sender, recipient, html_body, invitation_id=invitation.id)
         current_app.logger.debug('>send_invitation')
 
     @staticmethod
@@ -0,0 +1,142 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Keycloak admin REST client which reuses admin tokens, group ids and pooled connections per realm."""
+import threading
+import time
+from typing import Dict
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from auth_api.utils.enums import ContentType
+
+
+# Refresh the admin token this many seconds before keycloak expires it
+TOKEN_EXPIRY_MARGIN = 30
+
+
+class KeycloakAdminClient:
+    """Admin client for a single keycloak realm.
+
+    Use get_instance to get the shared client for the realm; tokens, group ids and connections are shared across
+    requests and threads of the process.
+    """
+
+    _instances: Dict[tuple, 'KeycloakAdminClient'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, base_url: str, realm: str, client_id: str,  # pylint: disable=too-many-arguments
+                 client_secret: str, pool_size: int = 10, timeout: float = None):
+        """Create a client for the realm."""
+        self.base_url = base_url
+        self.realm = realm
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._timeout = timeout
+        self._access_token = None
+        self._token_expires_at = 0
+        self._token_lock = threading.Lock()
+        self._group_ids: Dict[str, str] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def get_instance(cls, upstream: bool = False) -> 'KeycloakAdminClient':
+        """Return the shared admin client for the auth realm, or the upstream (BCROS) realm."""
+        config = current_app.config
+        base_url = config.get('KEYCLOAK_BCROS_BASE_URL') if upstream else config.get('KEYCLOAK_BASE_URL')
+        realm = config.get('KEYCLOAK_BCROS_REALMNAME') if upstream else config.get('KEYCLOAK_REALMNAME')
+        client_id = config.get('KEYCLOAK_BCROS_ADMIN_CLIENTID') if upstream else config.get(
+            'KEYCLOAK_ADMIN_USERNAME')
+        client_secret = config.get('KEYCLOAK_BCROS_ADMIN_SECRET') if upstream else config.get('KEYCLOAK_ADMIN_SECRET')
+
+        key = (base_url, realm, client_id)
+        with cls._instances_lock:
+            client = cls._instances.get(key, None)
+            if client is None:
+                client = KeycloakAdminClient(base_url, realm, client_id, client_secret,
+                                             pool_size=config.get('KEYCLOAK_CONNECTION_POOL_SIZE', 10),
+                                             timeout=config.get('KEYCLOAK_REQUEST_TIMEOUT', 30))
+                cls._instances[key] = client
+        return client
+
+    @classmethod
+    def reset_instances(cls):
+        """Drop all shared clients, closing their connections."""
+        with cls._instances_lock:
+            for client in cls._instances.values():
+                client.session.close()
+            cls._instances.clear()
+
+    @property
+    def admin_url(self):
+        """Return the admin REST url for the realm."""
+        return f'{self.base_url}/auth/admin/realms/{self.realm}'
+
+    def get_admin_token(self) -> str:
+        """Return a cached admin token, requesting a new one shortly before the current one expires."""
+        if self._access_token and time.monotonic() < self._token_expires_at:
+            return self._access_token
+
+        with self._token_lock:
+            # Another thread may have refreshed the token while this one waited on the lock.
+            if self._access_token and time.monotonic() < self._token_expires_at:
+                return self._access_token
+
+            token_url = f'{self.base_url}/auth/realms/{self.realm}/protocol/openid-connect/token'
+            response = self.session.post(token_url,
+                                         data='client_id={}&grant_type=client_credentials&client_secret={}'.format(
+                                             self._client_id, self._client_secret),
+                                         headers={'Content-Type': ContentType.FORM_URL_ENCODED.value},
+                                         timeout=self._timeout)
+            token = response.json()
+            self._access_token = token.get('access_token')
+            expires_in = token.get('expires_in', 0) or 0
+            self._token_expires_at = time.monotonic() + max(expires_in - TOKEN_EXPIRY_MARGIN, 0)
+            return self._access_token
+
+    def invalidate_token(self):
+        """Forget the cached admin token so the next call requests a new one."""
+        with self._token_lock:
+            self._access_token = None
+            self._token_expires_at = 0
+
+    def request(self, method: str, path: str, **kwargs):
+        """Send an authorized request to the admin REST api, retrying once with a new token on 401."""
+        url = f'{self.admin_url}{path}'
+        kwargs.setdefault('timeout', self._timeout)
+        response = self.session.request(method, url, headers=self._headers(), **kwargs)
+        if response.status_code == 401:
+            self.invalidate_token()
+            response = self.session.request(method, url, headers=self._headers(), **kwargs)
+        return response
+
+    def get_group_id(self, group_name: str) -> str:
+        """Return the id for the group name, looking it up only the first time."""
+        group_id = self._group_ids.get(group_name, None)
+        if group_id is None:
+            response = self.request('GET', '/groups', params={'search': group_name})
+            group_id = response.json()[0].get('id')
+            self._group_ids[group_name] = group_id
+        return group_id
+
+    def _headers(self):
+        return {
+            'Content-Type': ContentType.JSON.value,
+            'Authorization': f'Bearer {self.get_admin_token()}'
+        }
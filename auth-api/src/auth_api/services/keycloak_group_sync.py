@@ -0,0 +1,113 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Keycloak Group Sync service.
+
+This module records the keycloak group memberships users should have, and applies them to keycloak in the
+background, so that account management requests do not wait on keycloak.
+"""
+import datetime
+import threading
+from typing import Dict
+
+from flask import current_app, g
+
+from auth_api.models import KeycloakGroupSync as KeycloakGroupSyncModel
+from auth_api.models import db
+from auth_api.utils.constants import GROUP_ACCOUNT_HOLDERS
+from auth_api.utils.polling_worker import PollingWorker
+from auth_api.utils.roles import Role
+
+from .keycloak import KeycloakService
+
+
+class KeycloakGroupSync:
+    """Keeps the keycloak group memberships of users in step with auth.
+
+    Changes are saved as the desired membership of the user in the group, in the transaction of the change which
+    causes them; repeated changes for a user replace each other, and changes back to the membership already applied
+    are dropped. A background reconciler in each process applies the rest in batches and retries the failures.
+    """
+
+    _worker: PollingWorker = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def join_account_holders_group(keycloak_guid: str = None):
+        """Add the user, or the user of the token, to the account holders group."""
+        if not keycloak_guid:
+            token_info: Dict = g.get('jwt_oidc_token_info', None) or {}
+            # Cannot check the group from token, so check if the role 'account_holder' is already present.
+            if Role.ACCOUNT_HOLDER.value in token_info.get('realm_access', {}).get('roles', []):
+                return
+            keycloak_guid = token_info.get('sub', None)
+
+        KeycloakGroupSync.set_membership(keycloak_guid, GROUP_ACCOUNT_HOLDERS, True)
+
+    @staticmethod
+    def remove_from_account_holders_group(keycloak_guid: str = None):
+        """Remove the user, or the user of the token, from the account holders group."""
+        if not keycloak_guid:
+            keycloak_guid = (g.get('jwt_oidc_token_info', None) or {}).get('sub', None)
+
+        KeycloakGroupSync.set_membership(keycloak_guid, GROUP_ACCOUNT_HOLDERS, False)
+
+    @staticmethod
+    def set_membership(keycloak_guid, group_name: str, member: bool):
+        """Record the desired membership of the user in the group, to be applied once the transaction commits."""
+        if not keycloak_guid:
+            # Users without a keycloak account, e.g. created by bulk upload, have no groups to sync.
+            return
+        KeycloakGroupSyncModel.set_membership(keycloak_guid, group_name, member)
+
+    @staticmethod
+    def reconcile(batch_size: int = None) -> int:
+        """Apply a batch of desired memberships to keycloak and return how many were attempted."""
+        config = current_app.config
+        batch_size = batch_size or config.get('KEYCLOAK_GROUP_SYNC_BATCH_SIZE', 50)
+        max_attempts = config.get('KEYCLOAK_GROUP_SYNC_MAX_ATTEMPTS', 10)
+        retry_seconds = config.get('KEYCLOAK_GROUP_SYNC_RETRY_SECONDS', 10)
+
+        rows = KeycloakGroupSyncModel.claim_due(batch_size, config.get('KEYCLOAK_GROUP_SYNC_LEASE_SECONDS', 60))
+        for row in rows:
+            try:
+                if row.member:
+                    KeycloakService.add_user_to_group(str(row.keycloak_guid), row.group_name)
+                else:
+                    KeycloakService.remove_user_from_group(str(row.keycloak_guid), row.group_name)
+                KeycloakGroupSyncModel.mark_applied(row.id, row.version, row.member)
+            except Exception as e:  # pylint: disable=broad-except
+                attempts = row.attempts + 1
+                current_app.logger.error(
+                    f'Keycloak group sync of {row.keycloak_guid} to {row.group_name} failed, attempt {attempts} : {e}')
+                next_attempt_at = None if attempts >= max_attempts else \
+                    datetime.datetime.now() + datetime.timedelta(seconds=retry_seconds * 2 ** (attempts - 1))
+                KeycloakGroupSyncModel.mark_failed(row.id, row.version, next_attempt_at, str(e))
+        db.session.commit()
+        return len(rows)
+
+    @classmethod
+    def start(cls, app):
+        """Start the reconciler thread of this process, unless it is already running."""
+        with cls._lock:
+            if cls._worker is None:
+                cls._worker = PollingWorker('keycloak-group-sync', KeycloakGroupSync.reconcile,
+                                            app.config.get('KEYCLOAK_GROUP_SYNC_BATCH_SIZE', 50),
+                                            app.config.get('KEYCLOAK_GROUP_SYNC_POLL_SECONDS', 2))
+        cls._worker.start(app)
+
+    @classmethod
+    def stop(cls, timeout: float = None):
+        """Stop the reconciler thread after its current batch."""
+        if cls._worker is not None:
+            cls._worker.stop(timeout)
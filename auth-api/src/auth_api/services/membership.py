@@ -18,27 +18,28 @@ This module manages the Membership Information between an org and a user.
 from typing import Dict
 
 from flask import current_app
-from jinja2 import Environment, FileSystemLoader
 from sbc_common_components.tracing.service_tracing import ServiceTracing  # noqa: I001
 
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
+from auth_api.models import LoaderProfile, loader_options
 from auth_api.models import Membership as MembershipModel
 from auth_api.models import MembershipStatusCode as MembershipStatusCodeModel
 from auth_api.models import MembershipType as MembershipTypeModel
 from auth_api.models import Org as OrgModel
 from auth_api.schemas import MembershipSchema
+from auth_api.schemas import serializers
+from auth_api.utils.email_templates import EmailTemplates
 from auth_api.utils.enums import NotificationType
 from auth_api.utils.roles import ADMIN, ALL_ALLOWED_ROLES, OWNER, Status
 from config import get_named_config
 
 from .authorization import check_auth
-from .keycloak import KeycloakService
+from .keycloak_group_sync import KeycloakGroupSync
 from .notification import send_email
 from .org import Org as OrgService
 from .user import User as UserService
 
-ENV = Environment(loader=FileSystemLoader('.'), autoescape=True)
 CONFIG = get_named_config()
 
 
@@ -60,9 +61,7 @@ class Membership:  # pylint: disable=too-many-instance-attributes,too-few-public
 
         None fields are not included in the dict.
         """
-        membership_schema = MembershipSchema()
-        obj = membership_schema.dump(self._model, many=False)
-        return obj
+        return serializers.dump(self._model, MembershipSchema)
 
     @staticmethod
     def get_membership_type_by_code(type_code):
@@ -96,9 +95,12 @@ class Membership:  # pylint: disable=too-many-instance-attributes,too-few-public
         status = Status.ACTIVE.value if status is None else Status[status].value
         membership_roles = ALL_ALLOWED_ROLES if membership_roles is None else membership_roles
 
+        # Load the users and contacts which MembershipSchema dumps along with the members.
+        options = loader_options(LoaderProfile.MEMBERS)
+
         # If staff return full list
         if 'staff' in token_info.get('realm_access').get('roles'):
-            return MembershipModel.find_members_by_org_id_by_status_by_roles(org_id, membership_roles, status)
+            return MembershipModel.find_members_by_org_id_by_status_by_roles(org_id, membership_roles, status, options)
 
         current_user: UserService = UserService.find_by_jwt_token(token_info)
         current_user_membership: MembershipModel = \
@@ -118,10 +120,12 @@ class Membership:  # pylint: disable=too-many-instance-attributes,too-few-public
         if current_user_membership.status == Status.ACTIVE.value:
             if current_user_membership.membership_type_code == OWNER or \
                     current_user_membership.membership_type_code == ADMIN:
-                return MembershipModel.find_members_by_org_id_by_status_by_roles(org_id, membership_roles, status)
+                return MembershipModel.find_members_by_org_id_by_status_by_roles(org_id, membership_roles, status,
+                                                                                 options)
 
-            return MembershipModel.find_members_by_org_id_by_status_by_roles(org_id, membership_roles, status) \
-                if status == Status.ACTIVE.value else []
+            if status != Status.ACTIVE.value:
+                return []
+            return MembershipModel.find_members_by_org_id_by_status_by_roles(org_id, membership_roles, status, options)
 
         return []
 
@@ -160,18 +164,14 @@ class Membership:  # pylint: disable=too-many-instance-attributes,too-few-public
             template_name = 'membership_approved_notification_email.html'
             params = {'org_name': org_name}
         sender = CONFIG.MAIL_FROM_ID
-        template = ENV.get_template(f'email_templates/{template_name}')
         context_path = CONFIG.AUTH_WEB_TOKEN_CONFIRM_PATH
         app_url = '{}/{}'.format(origin_url, context_path)
 
         try:
-            sent_response = send_email(subject, sender, self._model.user.contacts[0].contact.email,
-                                       template.render(url=app_url, params=params,
-                                                       logo_url=f'{app_url}/{CONFIG.REGISTRIES_LOGO_IMAGE_NAME}'))
+            send_email(subject, sender, self._model.user.contacts[0].contact.email,
+                       EmailTemplates.render(template_name, url=app_url, params=params,
+                                             logo_url=f'{app_url}/{CONFIG.REGISTRIES_LOGO_IMAGE_NAME}'))
             current_app.logger.debug('<send_approval_notification_to_member')
-            if not sent_response:
-                current_app.logger.error('<send_notification_to_member failed')
-                raise BusinessException(Error.FAILED_NOTIFICATION, None)
         except:  # noqa=B901
             current_app.logger.error('<send_notification_to_member failed')
             raise BusinessException(Error.FAILED_NOTIFICATION, None)
@@ -233,11 +233,11 @@ class Membership:  # pylint: disable=too-many-instance-attributes,too-few-public
     def _add_or_remove_group(model: MembershipModel):
         """Add or remove the user from/to account holders group."""
         if model.membership_status.id == Status.ACTIVE.value:
-            KeycloakService.join_account_holders_group(model.user.keycloak_guid)
+            KeycloakGroupSync.join_account_holders_group(model.user.keycloak_guid)
         elif model.membership_status.id == Status.INACTIVE.value and len(
                 MembershipModel.find_orgs_for_user(model.user.id)) == 0:
             # Check if the user has any other active org membership, if none remove from the group
-            KeycloakService.remove_from_account_holders_group(model.user.keycloak_guid)
+            KeycloakGroupSync.remove_from_account_holders_group(model.user.keycloak_guid)
 
     @staticmethod
     def get_membership_for_org_and_user(org_id, user_id):
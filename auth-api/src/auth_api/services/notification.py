@@ -11,17 +11,30 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Service for managing Invitation data."""
+"""Service for sending the email notifications."""
 import json
 
 from flask import current_app
 
+from auth_api.models import EmailOutbox as EmailOutboxModel
+
 from .rest_service import RestService
 
 
-def send_email(subject: str, sender: str, recipients: str, html_body: str):  # pylint:disable=unused-argument
-    """Send the email asynchronously, using the given details."""
+def send_email(subject: str, sender: str, recipients: str, html_body: str,  # pylint:disable=unused-argument
+               invitation_id: int = None):
+    """Send the email asynchronously, using the given details.
+
+    The email is saved to the outbox in the current transaction; the email dispatcher sends it once committed, and
+    records on the outbox email whether it could be delivered. The invitation the email is for, if any, is marked
+    FAILED when the email is given up on.
+    """
     current_app.logger.info(f'send_email {recipients}')
+    EmailOutboxModel(recipients=recipients, subject=subject, body=html_body, invitation_id=invitation_id).save()
+
+
+def deliver_email(subject: str, recipients: str, html_body: str):
+    """Post the email to notify-api, returning True if it was accepted."""
     notify_url = current_app.config.get('NOTIFY_API_URL') + '/notify/'
     notify_body = {
         'recipients': recipients,
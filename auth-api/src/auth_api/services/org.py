@@ -29,12 +29,13 @@ from auth_api.models import Membership as MembershipModel
 from auth_api.models import Org as OrgModel
 from auth_api.models import User as UserModel
 from auth_api.schemas import OrgSchema
+from auth_api.schemas import serializers
 from auth_api.utils.enums import PaymentType, OrgType, ChangeType
 from auth_api.utils.roles import OWNER, VALID_STATUSES, Status, AccessType
 from auth_api.utils.util import camelback2snake
 from .authorization import check_auth
 from .contact import Contact as ContactService
-from .keycloak import KeycloakService
+from .keycloak_group_sync import KeycloakGroupSync
 from .rest_service import RestService
 
 
@@ -54,9 +55,7 @@ class Org:
 
         None fields are not included.
         """
-        org_schema = OrgSchema()
-        obj = org_schema.dump(self._model, many=False)
-        return obj
+        return serializers.dump(self._model, OrgSchema)
 
     @staticmethod
     def create_org(org_info: dict, user_id,  # pylint: disable=too-many-locals, too-many-statements
@@ -108,7 +107,7 @@ class Org:
             membership.add_to_session()
 
             # Add the user to account_holders group
-            KeycloakService.join_account_holders_group()
+            KeycloakGroupSync.join_account_holders_group()
 
         Org.add_payment_settings(org.id, bcol_account_number, bcol_user_id)
 
@@ -268,7 +267,7 @@ class Org:
         # Remove user from thr group if the user doesn't have any other orgs membership
         user = UserModel.find_by_jwt_token(token=token_info)
         if len(MembershipModel.find_orgs_for_user(user.id)) == 0:
-            KeycloakService.remove_from_account_holders_group(user.keycloak_guid)
+            KeycloakGroupSync.remove_from_account_holders_group(user.keycloak_guid)
         current_app.logger.debug('org Inactivated>')
 
     @staticmethod
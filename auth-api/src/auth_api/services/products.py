@@ -24,6 +24,8 @@ from auth_api.models import ProductRoleCode as ProductRoleCodeModel
 from auth_api.models import ProductSubscription as ProductSubscriptionModel
 from auth_api.models import ProductSubscriptionRole as ProductSubscriptionRoleModel
 from auth_api.models import Org as OrgModel
+from auth_api.models.code_registry import CodeRegistry
+from auth_api.utils.representation import Representation
 
 
 class Product:
@@ -32,6 +34,8 @@ class Product:
     This service manages creating, updating, and retrieving products and product subscriptions.
     """
 
+    _products = None
+
     @staticmethod
     def create_product_subscription(org_id, subscription_data: Tuple[Dict[str, Any]]):
         """Create product subscription for the user.
@@ -68,7 +72,7 @@ class Product:
                                                             product_role_id=role.id))
 
                 db.session.bulk_save_objects(obj)
-                db.session.commit()
+                ProductSubscriptionRoleModel.commit()
 
         # TODO return something better/useful.may be return the whole model from db
         return subscriptions_model_list
@@ -76,12 +80,29 @@ class Product:
     @staticmethod
     def get_products():
         """Get a list of all products."""
-        products = ProductCodeModel.get_all_products()
+        return Product.get_products_representation().data
+
+    @classmethod
+    def get_products_representation(cls) -> Representation:
+        """Return the serialized list of all products, built once per load of the code tables."""
+        products_config = current_app.config.get('PRODUCT_CONFIG')
+        cached = cls._products
+        if cached and cached[0] == CodeRegistry.version() and cached[1] is products_config:
+            return cached[2]
 
+        loaded = CodeRegistry.load()
+        version = CodeRegistry.version()
+        products = CodeRegistry.rows(ProductCodeModel) if loaded else ProductCodeModel.get_all_products()
+        representation = Representation(Product._merge_product_config(products, products_config))
+        if loaded:
+            cls._products = (version, products_config, representation)
+        return representation
+
+    @staticmethod
+    def _merge_product_config(products, products_config):
         # We only want to return products that have content configured,
         # so read configuration and merge
         merged_product_infos = []
-        products_config = current_app.config.get('PRODUCT_CONFIG')
         if products_config:
             for product in products:
                 product_config = products_config.get(product.code)
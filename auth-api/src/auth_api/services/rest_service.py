@@ -11,8 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Service to invoke Rest services."""
+"""Service to invoke Rest services.
+
+Calls share a pooled keep-alive session per downstream host, and each host has a circuit breaker which fails fast
+with ServiceUnavailableException while the host is unhealthy.
+"""
 import json
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict
+from urllib.parse import urlsplit
 
 import requests
 from flask import current_app
@@ -23,14 +32,73 @@ from requests.exceptions import ConnectTimeout, HTTPError
 from urllib3.util.retry import Retry
 
 from auth_api.exceptions import ServiceUnavailableException
+from auth_api.utils.circuit_breaker import CircuitBreaker
 from auth_api.utils.enums import AuthHeaderType, ContentType
 
-RETRY_ADAPTER = HTTPAdapter(max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[404]))
+RETRY = Retry(total=5, backoff_factor=1, status_forcelist=[404])
+
+
+class _HostClient:  # pylint: disable=too-few-public-methods
+    """Pooled sessions, circuit breaker and call counters for one downstream host."""
+
+    def __init__(self, pool_size: int, failure_threshold: int, reset_timeout: float):
+        self.session = self._create_session(pool_size)
+        self.retry_session = self._create_session(pool_size, RETRY)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_session(pool_size: int, max_retries=0):
+        session = requests.Session()
+        # The session is shared by all users of the api, so cookies set by a response must not be replayed.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def record(self, latency: float, failed: bool):
+        """Count a completed call."""
+        with self._lock:
+            self.calls += 1
+            self.errors += 1 if failed else 0
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def record_rejected(self):
+        """Count a call rejected by the open circuit."""
+        with self._lock:
+            self.rejected += 1
+
+    def metrics(self) -> Dict:
+        """Return the counters for the host."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'rejected': self.rejected,
+                'averageLatency': self.total_latency / self.calls if self.calls else 0,
+                'maxLatency': self.max_latency,
+                'circuitState': self.breaker.state.value
+            }
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+        self.retry_session.close()
 
 
 class RestService:
     """Service to invoke Rest services which uses OAuth 2.0 implementation."""
 
+    _hosts: Dict[str, _HostClient] = {}
+    _hosts_lock = threading.Lock()
+
     @staticmethod
     def post(endpoint, token=None,  # pylint: disable=too-many-arguments
              auth_header_type: AuthHeaderType = AuthHeaderType.BEARER,
@@ -50,8 +118,7 @@ class RestService:
         # current_app.logger.debug('data : {}'.format(data))
         response = None
         try:
-            response = requests.post(endpoint, data=data, headers=headers,
-                                     timeout=current_app.config.get('CONNECT_TIMEOUT'))
+            response = RestService._send('POST', endpoint, data=data, headers=headers)
             if raise_for_status:
                 response.raise_for_status()
         except (ReqConnectionError, ConnectTimeout) as exc:
@@ -86,12 +153,9 @@ class RestService:
 
         current_app.logger.debug('Endpoint : {}'.format(endpoint))
         current_app.logger.debug('headers : {}'.format(headers))
-        session = requests.Session()
-        if retry_on_failure:
-            session.mount(endpoint, RETRY_ADAPTER)
         response = None
         try:
-            response = session.get(endpoint, headers=headers, timeout=current_app.config.get('CONNECT_TIMEOUT'))
+            response = RestService._send('GET', endpoint, retry_on_failure=retry_on_failure, headers=headers)
             response.raise_for_status()
         except (ReqConnectionError, ConnectTimeout) as exc:
             current_app.logger.error('---Error on POST---')
@@ -109,3 +173,75 @@ class RestService:
 
         current_app.logger.debug('>GET')
         return response
+
+    @staticmethod
+    def get_metrics() -> Dict[str, Dict]:
+        """Return the call, error and latency counters and the circuit state for each downstream host."""
+        with RestService._hosts_lock:
+            hosts = dict(RestService._hosts)
+        return {host: client.metrics() for host, client in hosts.items()}
+
+    @staticmethod
+    def reset():
+        """Close all pooled connections and forget the circuit state and counters of every host."""
+        with RestService._hosts_lock:
+            for client in RestService._hosts.values():
+                client.close()
+            RestService._hosts.clear()
+
+    @staticmethod
+    def _send(method: str, endpoint: str, retry_on_failure: bool = False, **kwargs):
+        """Send the request through the pooled session of the host, unless the circuit of the host is open."""
+        host = RestService._get_host(endpoint)
+        client = RestService._get_host_client(host)
+        if not client.breaker.allow_request():
+            client.record_rejected()
+            current_app.logger.error('Circuit open for {}, failing fast'.format(host))
+            raise ServiceUnavailableException('{} is unavailable'.format(host))
+
+        session = client.retry_session if retry_on_failure else client.session
+        started = time.monotonic()
+        try:
+            response = session.request(method, endpoint, timeout=RestService._get_timeout(endpoint), **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            # Any error counts against the host, so that a failed trial call opens the circuit again rather than
+            # leaving it half open.
+            client.record(time.monotonic() - started, failed=True)
+            client.breaker.record_failure()
+            raise
+
+        failed = response.status_code >= 500
+        client.record(time.monotonic() - started, failed=failed)
+        if failed:
+            client.breaker.record_failure()
+        else:
+            client.breaker.record_success()
+        return response
+
+    @staticmethod
+    def _get_host(endpoint: str) -> str:
+        url = urlsplit(endpoint)
+        return '{}://{}'.format(url.scheme, url.netloc)
+
+    @staticmethod
+    def _get_host_client(host: str) -> _HostClient:
+        client = RestService._hosts.get(host, None)
+        if client is None:
+            config = current_app.config
+            with RestService._hosts_lock:
+                client = RestService._hosts.get(host, None)
+                if client is None:
+                    client = _HostClient(config.get('REST_SERVICE_POOL_SIZE', 10),
+                                         config.get('REST_SERVICE_FAILURE_THRESHOLD', 5),
+                                         config.get('REST_SERVICE_RESET_TIMEOUT', 30))
+                    RestService._hosts[host] = client
+        return client
+
+    @staticmethod
+    def _get_timeout(endpoint: str):
+        """Return the timeout of the longest configured url prefix of the endpoint, or the default timeout."""
+        timeouts = current_app.config.get('REST_SERVICE_TIMEOUTS', None) or {}
+        prefixes = [prefix for prefix in timeouts if endpoint.startswith(prefix)]
+        if prefixes:
+            return timeouts[max(prefixes, key=len)]
+        return current_app.config.get('CONNECT_TIMEOUT')
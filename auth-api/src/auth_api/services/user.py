@@ -15,10 +15,10 @@
 
 This module manages the User Information.
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 from flask import current_app
-from requests import HTTPError
 from sbc_common_components.tracing.service_tracing import ServiceTracing  # noqa: I001
 
 from auth_api import status as http_status
@@ -33,7 +33,8 @@ from auth_api.models import Membership as MembershipModel
 from auth_api.models import Org as OrgModel
 from auth_api.models import User as UserModel
 from auth_api.schemas import UserSchema
-from auth_api.services.authorization import check_auth
+from auth_api.schemas import serializers
+from auth_api.services.authorization import check_auth, clear_authorization_cache
 from auth_api.services.keycloak_user import KeycloakUser
 from auth_api.utils.roles import CLIENT_ADMIN_ROLES, OWNER, OrgStatus, Status, UserStatus, ADMIN, AccessType
 from auth_api.utils.util import camelback2snake
@@ -41,6 +42,7 @@ from auth_api.utils.util import camelback2snake
 from .contact import Contact as ContactService
 
 from .keycloak import KeycloakService
+from .keycloak_group_sync import KeycloakGroupSync
 
 
 @ServiceTracing.trace(ServiceTracing.enable_tracing, ServiceTracing.should_be_tracing)
@@ -67,13 +69,10 @@ class User:  # pylint: disable=too-many-instance-attributes
 
         None fields are not included in the dict.
         """
-        user_schema = UserSchema()
-        obj = user_schema.dump(self._model, many=False)
-        return obj
+        return serializers.dump(self._model, UserSchema)
 
     @staticmethod
     def create_user_and_add_membership(memberships: List[dict], org_id, token_info: Dict = None,
-                                       # pylint: disable=too-many-locals, too-many-statements, too-many-branches
                                        single_mode: bool = False):
         """
         Create user(s) in the  DB and upstream keycloak.
@@ -82,68 +81,172 @@ class User:  # pylint: disable=too-many-instance-attributes
         single_mode can be used if called method already perfomed the authenticaiton
         single_mode= true is used now incase of invitation for admin users scenarion
         other cases should be invoked with single_mode=false
+
+        Users are provisioned in stages: existing users are loaded in one query, keycloak calls run in parallel on a
+        bounded thread pool and all new users and memberships are written in one transaction.
+        The result for each user is returned in the order of the request.
         """
         User._validate_and_throw_exception(memberships, org_id, single_mode, token_info)
+        return User.provision_users(memberships, org_id)
+
+    @staticmethod
+    def validate_bulk_users(memberships: List[dict], org_id, token_info: Dict = None):
+        """Check that the token user can add the users to the org; raises if not."""
+        User._validate_and_throw_exception(memberships, org_id, False, token_info)
 
+    @staticmethod
+    def provision_users(memberships: List[dict], org_id):
+        """Create the users in keycloak and DB and add them to the org, without any authorization checks.
+
+        Callers must have validated the request with validate_bulk_users first.
+        """
         current_app.logger.debug('create_user')
-        users = []
-        for membership in memberships:
+        users = [None] * len(memberships)
+
+        # Stage 1 : Find the users already in DB with a single query and decide what has to be done for each user.
+        pending = User._find_pending_users(memberships, org_id, users)
+
+        # Stage 2 : Create or re-enable the users in keycloak in parallel.
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        with ThreadPoolExecutor(max_workers=current_app.config.get('BULK_USER_KEYCLOAK_WORKERS', 5)) as executor:
+            pending = list(executor.map(lambda item: User._provision_in_keycloak(app, item), pending))
+
+            provisioned = []
+            for item in pending:
+                if item['error']:
+                    users[item['index']] = User._get_error_dict(item['username'], item['error'])
+                else:
+                    provisioned.append(item)
+
+            # Stage 3 : Save all users and memberships together, undoing the keycloak changes if it fails.
+            try:
+                User._save_users_and_memberships(provisioned, org_id)
+                db.session.commit()  # commit is for session ;need not to invoke for every object
+                # The memberships are bulk inserted, which does not fire the events that clear the cache.
+                clear_authorization_cache()
+            except Exception as e:  # pylint: disable=broad-except
+                current_app.logger.error('Error on  create_user_and_add_membership: {}', e)
+                db.session.rollback()
+                list(executor.map(lambda item: User._undo_keycloak_changes(app, item), provisioned))
+                for item in provisioned:
+                    users[item['index']] = User._get_error_dict(item['username'], Error.FAILED_ADDING_USER_ERROR)
+                provisioned = []
+
+        saved_users = {user.username: user for user in
+                       UserModel.find_by_usernames([item['db_username'] for item in provisioned])}
+        for item in provisioned:
+            user_dict = User(saved_users[item['db_username']]).as_dict()
+            user_dict.update({'http_status': http_status.HTTP_201_CREATED, 'error': ''})
+            users[item['index']] = user_dict
+
+        return {'users': users}
+
+    @staticmethod
+    def _find_pending_users(memberships: List[dict], org_id, users: List):
+        """Return the users to provision, filling users with an error for usernames which are already taken."""
+        db_usernames = [IdpHint.BCROS.value + '/' + membership['username'] for membership in memberships]
+        existing_users = {user.username: user for user in UserModel.find_by_usernames(db_usernames)}
+
+        pending = []
+        seen_usernames = set()
+        for index, membership in enumerate(memberships):
             username = membership['username']
+            db_username = db_usernames[index]
             current_app.logger.debug(f'create user username: {username}')
-            create_user_request = User._create_kc_user(membership)
-            db_username = IdpHint.BCROS.value + '/' + username
-            user_model = UserModel.find_by_username(db_username)
-            re_enable_user = False
-            existing_kc_user = KeycloakService.get_user_by_username(username)
-            enabled_in_kc = getattr(existing_kc_user, 'enabled', True)
-            if getattr(user_model, 'status', None) == Status.INACTIVE.value and not enabled_in_kc:
+            user_model = existing_users.get(db_username, None)
+            membership_model = None
+            if user_model and user_model.status == Status.INACTIVE.value:
                 membership_model = MembershipModel.find_membership_by_userid(user_model.id)
-                re_enable_user = membership_model.org_id == org_id
-            if user_model and not re_enable_user:
+            if db_username in seen_usernames or (user_model and not membership_model):
                 current_app.logger.debug('Existing users found in DB')
-                users.append(User._get_error_dict(username, Error.USER_ALREADY_EXISTS))
+                users[index] = User._get_error_dict(username, Error.USER_ALREADY_EXISTS)
                 continue
+            seen_usernames.add(db_username)
 
+            create_user_request = User._create_kc_user(membership)
             if membership.get('update_password_on_login', True):  # by default , reset needed
                 create_user_request.update_password_on_login()
+            pending.append({
+                'index': index,
+                'username': username,
+                'db_username': db_username,
+                'membership': membership,
+                'user_model': user_model,
+                'membership_model': membership_model,
+                # only an inactive user of this org can be re-enabled; keycloak decides whether it is disabled
+                'can_re_enable': membership_model is not None and membership_model.org_id == org_id,
+                'create_user_request': create_user_request,
+                're_enable_user': False,
+                'kc_user': None,
+                'error': None
+            })
+        return pending
+
+    @staticmethod
+    def _provision_in_keycloak(app, item: dict):
+        """Create the user in keycloak, or re-enable it; runs on a worker thread and must not use the DB session."""
+        with app.app_context():
+            create_user_request = item['create_user_request']
             try:
-                if re_enable_user:
-                    kc_user = KeycloakService.update_user(create_user_request)
+                if item['user_model']:
+                    existing_kc_user = KeycloakService.get_user_by_username(item['username'])
+                    enabled_in_kc = getattr(existing_kc_user, 'enabled', True)
+                    if enabled_in_kc or not item['can_re_enable']:
+                        item['error'] = Error.USER_ALREADY_EXISTS
+                        return item
+                    item['re_enable_user'] = True
+                if item['re_enable_user']:
+                    item['kc_user'] = KeycloakService.update_user(create_user_request)
                 else:
-                    kc_user = KeycloakService.add_user(create_user_request, throw_error_if_exists=True)
+                    item['kc_user'] = KeycloakService.add_user(create_user_request, throw_error_if_exists=True)
             except BusinessException as err:
                 current_app.logger.error('create_user in keycloak failed :duplicate user {}', err)
-                users.append(User._get_error_dict(username, Error.USER_ALREADY_EXISTS))
-                continue
-            except HTTPError as err:
+                item['error'] = Error.USER_ALREADY_EXISTS
+            except Exception as err:  # pylint: disable=broad-except
+                # Any error fails only this user, so that the other users are saved, or undone, as usual.
                 current_app.logger.error('create_user in keycloak failed {}', err)
-                users.append(User._get_error_dict(username, Error.FAILED_ADDING_USER_ERROR))
-                continue
-            try:
-                if re_enable_user:
-                    user_model.status = Status.ACTIVE.value
-                    user_model.flush()
-                    membership_model.status = Status.ACTIVE.value
-                    membership_model.membership_type_code = membership['membershipType']
-                    membership_model.flush()
-                else:
-                    user_model = User._create_new_user_and_membership(db_username, kc_user, membership, org_id)
+                item['error'] = Error.FAILED_ADDING_USER_ERROR
+        return item
 
-                db.session.commit()  # commit is for session ;need not to invoke for every object
-                user_dict = User(user_model).as_dict()
-                user_dict.update({'http_status': http_status.HTTP_201_CREATED, 'error': ''})
-                users.append(user_dict)
-            except Exception as e:  # pylint: disable=broad-except
-                current_app.logger.error('Error on  create_user_and_add_membership: {}', e)
-                db.session.rollback()
-                if re_enable_user:
-                    User._update_user_in_kc(create_user_request)
-                else:
-                    KeycloakService.delete_user_by_username(create_user_request.user_name)
-                users.append(User._get_error_dict(username, Error.FAILED_ADDING_USER_ERROR))
-                continue
+    @staticmethod
+    def _undo_keycloak_changes(app, item: dict):
+        """Disable a re-enabled user or delete a newly created user in keycloak."""
+        with app.app_context():
+            if item['re_enable_user']:
+                User._update_user_in_kc(item['create_user_request'])
+            else:
+                KeycloakService.delete_user_by_username(item['create_user_request'].user_name)
 
-        return {'users': users}
+    @staticmethod
+    def _save_users_and_memberships(items: List[dict], org_id):
+        """Re-activate existing users and insert all new users and their memberships with one statement each."""
+        new_items = []
+        for item in items:
+            if item['re_enable_user']:
+                item['user_model'].status = Status.ACTIVE.value
+                item['user_model'].flush()
+                item['membership_model'].status = Status.ACTIVE.value
+                item['membership_model'].membership_type_code = item['membership']['membershipType']
+                item['membership_model'].flush()
+            else:
+                new_items.append(item)
+
+        user_ids = dict(UserModel.bulk_insert([{
+            'username': item['db_username'],
+            'is_terms_of_use_accepted': False,
+            'status': Status.ACTIVE.value,
+            'type': AccessType.ANONYMOUS.value,
+            'email': item['membership'].get('email', None),
+            'firstname': item['kc_user'].first_name,
+            'lastname': item['kc_user'].last_name
+        } for item in new_items], returning=(UserModel.username, UserModel.id)))
+
+        MembershipModel.bulk_insert([{
+            'org_id': org_id,
+            'user_id': user_ids[item['db_username']],
+            'membership_type_code': item['membership']['membershipType'],
+            'status': Status.ACTIVE.value
+        } for item in new_items])
 
     @staticmethod
     def _update_user_in_kc(create_user_request):
@@ -164,21 +267,6 @@ class User:  # pylint: disable=too-many-instance-attributes
         if not org or org.access_type != AccessType.ANONYMOUS.value:
             raise BusinessException(Error.INVALID_INPUT, None)
 
-    @staticmethod
-    def _create_new_user_and_membership(db_username, kc_user, membership, org_id):
-        user_model: UserModel = UserModel(username=db_username,
-                                          is_terms_of_use_accepted=False, status=Status.ACTIVE.value,
-                                          type=AccessType.ANONYMOUS.value,
-                                          email=membership.get('email', None),
-                                          firstname=kc_user.first_name, lastname=kc_user.last_name)
-        user_model.flush()
-        membership_model = MembershipModel(org_id=org_id, user_id=user_model.id,
-                                           membership_type_code=membership['membershipType'],
-                                           membership_type_status=Status.ACTIVE.value)
-
-        membership_model.flush()
-        return user_model
-
     @staticmethod
     def delete_anonymous_user(user_name, token_info: Dict = None):
         """
@@ -368,9 +456,27 @@ class User:  # pylint: disable=too-many-instance-attributes
         return None
 
     @staticmethod
-    def find_users(first_name='', last_name='', email=''):
-        """Return a list of users matching either the given username or the given email."""
-        return UserModel.find_users(first_name=first_name, last_name=last_name, email=email)
+    def find_users(first_name='', last_name='', email='',  # pylint: disable=too-many-arguments
+                   search_text: str = None, after_id: int = None, limit: int = None):
+        """Return a page of users matching either the given first name, last name or email, ordered by id."""
+        return UserModel.find_users(first_name=first_name, last_name=last_name, email=email,
+                                    search_text=search_text, after_id=after_id, limit=limit)
+
+    @staticmethod
+    def iter_users(first_name='', last_name='', email='', search_text: str = None, batch_size: int = 500):
+        """Yield every matching user as a dict, reading batch_size users at a time.
+
+        Used to stream large results without holding all of the users in memory.
+        """
+        after_id = None
+        while True:
+            users = UserModel.find_users(first_name=first_name, last_name=last_name, email=email,
+                                         search_text=search_text, after_id=after_id, limit=batch_size)
+            for user in users:
+                yield User(user).as_dict()
+            if len(users) < batch_size:
+                return
+            after_id = users[-1].id
 
     @classmethod
     def find_by_jwt_token(cls, token: dict = None):
@@ -451,7 +557,7 @@ class User:  # pylint: disable=too-many-instance-attributes
         user.save()
 
         # Remove user from account_holders group
-        KeycloakService.remove_from_account_holders_group(user.keycloak_guid)
+        KeycloakGroupSync.remove_from_account_holders_group(user.keycloak_guid)
 
         current_app.logger.debug('<delete_user')
 
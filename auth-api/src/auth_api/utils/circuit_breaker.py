@@ -0,0 +1,68 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A thread safe circuit breaker for calls to a downstream service."""
+import threading
+import time
+
+from auth_api.utils.enums import CircuitState
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures and fails fast until reset_timeout seconds have passed.
+
+    Once the timeout has passed a single trial call is let through; it closes the circuit on success and opens it
+    again on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """Create a closed circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state of the circuit."""
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be made now."""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Let a single trial call through; the other callers keep failing fast until it finishes.
+                self._state = CircuitState.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit once the threshold is reached or the trial call failed."""
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.HALF_OPEN or \
+                    (self.failure_threshold > 0 and self._failures >= self.failure_threshold):
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
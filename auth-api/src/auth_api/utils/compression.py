@@ -0,0 +1,129 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Response compression negotiated on the Accept-Encoding request header.
+
+JSON, HTML and text responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes are compressed with the first of the
+RESPONSE_COMPRESSION_ENCODINGS the client accepts, as long as no other content encoding has been applied already.
+Bodies of at least RESPONSE_COMPRESSION_STREAM_SIZE bytes, and streamed bodies, are compressed chunk by chunk as they
+are sent, so the compressed body is never held in memory as a whole.
+"""
+import zlib
+from typing import Iterable
+
+import brotli
+from flask import request
+
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/javascript', 'text/html', 'text/plain', 'text/css'}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _GzipEncoder:
+    """Incremental gzip compression."""
+
+    def __init__(self, config):
+        """Create the compressor at the configured level."""
+        self._compressor = zlib.compressobj(config.get('RESPONSE_COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED,
+                                            16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Return the compressed output available so far."""
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        """Return the rest of the compressed output."""
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    """Incremental brotli compression."""
+
+    def __init__(self, config):
+        """Create the compressor at the configured quality."""
+        self._compressor = brotli.Compressor(quality=config.get('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4))
+
+    def compress(self, data: bytes) -> bytes:
+        """Return the compressed output available so far."""
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        """Return the rest of the compressed output."""
+        return self._compressor.finish()
+
+
+ENCODERS = {'br': _BrotliEncoder, 'gzip': _GzipEncoder}
+
+
+def init_app(app):
+    """Compress the responses of the app, if RESPONSE_COMPRESSION is on.
+
+    Call this before registering any other after request function on the app, so that the compression runs after all
+    of them.
+    """
+    if not app.config.get('RESPONSE_COMPRESSION', True):
+        return
+
+    encodings = [encoding.strip() for encoding in app.config.get('RESPONSE_COMPRESSION_ENCODINGS', ('br', 'gzip'))
+                 if encoding.strip() in ENCODERS]
+    min_size = app.config.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+    stream_size = app.config.get('RESPONSE_COMPRESSION_STREAM_SIZE', 256 * 1024)
+
+    @app.after_request
+    def compress_response(response):  # pylint: disable=unused-variable
+        return compress(response, encodings, min_size, stream_size, app.config)
+
+
+def compress(response, encodings, min_size: int, stream_size: int, config):  # pylint: disable=too-many-arguments
+    """Compress the response with the best of the encodings the client accepts; returns the response."""
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough or \
+            response.status_code < 200 or response.status_code in (204, 304) or \
+            'Content-Encoding' in response.headers:
+        return response
+
+    # The body depends on the Accept-Encoding header from here on, even when it is not compressed.
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None or request.method == 'HEAD':
+        return response
+
+    streamed = response.is_streamed
+    if not streamed:
+        length = response.calculate_content_length()
+        if length is None or length < min_size:
+            return response
+
+    encoder = ENCODERS[encoding](config)
+    if streamed or length >= stream_size:
+        response.response = _compress_chunks(encoder, response.iter_encoded())
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(encoder.compress(response.get_data()) + encoder.finish())
+    response.headers['Content-Encoding'] = encoding
+
+    # The compressed body is not byte for byte the representation the entity tag was computed for.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _compress_chunks(encoder, body: Iterable[bytes]):
+    """Compress the body as it is sent, in chunks of at most CHUNK_SIZE bytes."""
+    for data in body:
+        for start in range(0, len(data), CHUNK_SIZE):
+            chunk = encoder.compress(data[start:start + CHUNK_SIZE])
+            if chunk:
+                yield chunk
+    yield encoder.finish()
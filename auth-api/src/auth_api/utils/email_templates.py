@@ -0,0 +1,152 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The shared environment which renders the email templates.
+
+The templates are compiled once per process, when the app is created, and their bytecode is kept in a directory of the
+app user shared by the worker processes so that only the first worker compiles them. Render counts and times are kept
+per template.
+"""
+import os
+import stat
+import threading
+import time
+from typing import Dict
+
+from flask import current_app
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+
+class _TemplateMetrics:  # pylint: disable=too-few-public-methods
+    """Render counters for a single template."""
+
+    def __init__(self):
+        """Create empty counters."""
+        self.renders = 0
+        self.errors = 0
+        self.total_time = 0
+        self.max_time = 0
+
+
+class EmailTemplates:
+    """Renders the templates in the email_templates directory from a single, precompiled environment."""
+
+    _env: Environment = None
+    _env_lock = threading.Lock()
+    _metrics: Dict[str, _TemplateMetrics] = {}
+    _metrics_lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        """Create the environment from the app config and compile every template."""
+        env = cls._create_environment(app)
+        with cls._env_lock:
+            cls._env = env
+        for name in env.list_templates(filter_func=lambda name: name.endswith('.html')):
+            env.get_template(name)
+
+    @classmethod
+    def get_template(cls, name: str) -> Template:
+        """Return the compiled template by its file name, e.g. admin_notification_email.html."""
+        return cls._get_environment().get_template(name)
+
+    @classmethod
+    def render(cls, name: str, **context) -> str:
+        """Render the template; the logo_url and web_app_url globals may be overridden by the context."""
+        template = cls.get_template(name)
+        start = time.perf_counter()
+        failed = True
+        try:
+            html = template.render(**context)
+            failed = False
+            return html
+        finally:
+            cls._record(name, time.perf_counter() - start, failed)
+
+    @classmethod
+    def get_metrics(cls) -> Dict[str, Dict]:
+        """Return the render count, error count and render times in seconds for each template rendered so far."""
+        with cls._metrics_lock:
+            return {name: {
+                'renders': metrics.renders,
+                'errors': metrics.errors,
+                'averageTime': metrics.total_time / metrics.renders if metrics.renders else 0,
+                'maxTime': metrics.max_time
+            } for name, metrics in cls._metrics.items()}
+
+    @classmethod
+    def reset(cls):
+        """Drop the environment and the metrics; the next render creates the environment again."""
+        with cls._env_lock:
+            cls._env = None
+        with cls._metrics_lock:
+            cls._metrics = {}
+
+    @classmethod
+    def _get_environment(cls) -> Environment:
+        with cls._env_lock:
+            if cls._env is None:
+                app = current_app._get_current_object()  # pylint: disable=protected-access
+                cls._env = cls._create_environment(app)
+            return cls._env
+
+    @staticmethod
+    def _create_bytecode_cache(app):
+        """Return the bytecode cache, or None if it is turned off or its directory could be written by others.
+
+        Bytecode read from the cache is executed, so the directory must belong to this user and no one else may
+        write to it. Without the cache each worker compiles the templates itself, which is slower but works.
+        """
+        config = app.config
+        if not config.get('EMAIL_TEMPLATE_BYTECODE_CACHE', True):
+            return None
+        cache_dir = config.get('EMAIL_TEMPLATE_BYTECODE_CACHE_DIR', None)
+        try:
+            if not cache_dir:
+                # Jinja creates a directory of this user in the temp directory with mode 0700, and checks its owner.
+                return FileSystemBytecodeCache(pattern='auth_api_%s.cache')
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            cache_dir_stat = os.lstat(cache_dir)
+            if not stat.S_ISDIR(cache_dir_stat.st_mode) or cache_dir_stat.st_uid != os.getuid() or \
+                    cache_dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                app.logger.warning(f'Email template bytecode cache {cache_dir} is not a directory only this user can '
+                                   'write to; it is not used')
+                return None
+            return FileSystemBytecodeCache(cache_dir, pattern='auth_api_%s.cache')
+        except (OSError, RuntimeError) as e:
+            app.logger.warning(f'Email template bytecode cache {cache_dir} is not available : {e}')
+            return None
+
+    @staticmethod
+    def _create_environment(app) -> Environment:
+        config = app.config
+
+        # The templates do not change while the app runs, so they are not checked for changes on each render.
+        env = Environment(loader=FileSystemLoader(config.get('EMAIL_TEMPLATE_DIR')), autoescape=True,
+                          auto_reload=False, bytecode_cache=EmailTemplates._create_bytecode_cache(app))
+
+        web_app_url = config.get('WEB_APP_URL', None)
+        env.globals['web_app_url'] = web_app_url
+        env.globals['logo_url'] = f"{web_app_url}/{config.get('REGISTRIES_LOGO_IMAGE_NAME')}" if web_app_url else None
+        return env
+
+    @classmethod
+    def _record(cls, name: str, elapsed: float, failed: bool):
+        with cls._metrics_lock:
+            metrics = cls._metrics.get(name, None)
+            if metrics is None:
+                metrics = cls._metrics[name] = _TemplateMetrics()
+            metrics.renders += 1
+            metrics.errors += 1 if failed else 0
+            metrics.total_time += elapsed
+            metrics.max_time = max(metrics.max_time, elapsed)
@@ -77,3 +77,28 @@ class DocumentType(Enum):
 
     TERMS_OF_USE = 'termsofuse'
     TERMS_OF_USE_DIRECTOR_SEARCH = 'termsofuse_directorsearch'
+
+
+class BulkUserJobStatus(Enum):
+    """Bulk user job statuses."""
+
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    COMPLETED = 'COMPLETED'
+    FAILED = 'FAILED'
+
+
+class EmailOutboxStatus(Enum):
+    """Email outbox statuses."""
+
+    PENDING = 'PENDING'
+    SENT = 'SENT'
+    FAILED = 'FAILED'
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
@@ -0,0 +1,75 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""JSON encoding of the API responses, with orjson when it is installed and the json module otherwise.
+
+JSON_ENCODER_BACKEND selects the backend. Whatever the backend, datetimes and dates are encoded in ISO 8601, UUIDs
+as strings and Decimals as strings, so that no precision is lost. Data orjson cannot encode, such as dicts with keys
+other than strings, is encoded with the json module instead.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from flask import current_app, has_app_context, make_response
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+BACKENDS = ('orjson', 'json')
+
+
+def default(obj):
+    """Return a value the backends can encode, for the types they do not encode themselves."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (uuid.UUID, decimal.Decimal)):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def get_backend() -> str:
+    """Return the configured backend, or json if orjson is configured but not installed."""
+    backend = current_app.config.get('JSON_ENCODER_BACKEND', 'orjson') if has_app_context() else 'orjson'
+    return 'orjson' if backend == 'orjson' and orjson is not None else 'json'
+
+
+def dumps(data, backend: str = None) -> bytes:
+    """Return the compact JSON encoding of the data as UTF-8 bytes."""
+    if (backend or get_backend()) == 'orjson' and orjson is not None:
+        try:
+            return orjson.dumps(data, default=default)
+        except TypeError:
+            # orjson.JSONEncodeError is a TypeError; the json module may still encode the data.
+            pass
+    return json.dumps(data, default=default, separators=(',', ':')).encode('utf-8')
+
+
+def output_json(data, code, headers=None):
+    """Make a flask_restplus response with the JSON encoded body, replacing its default representation."""
+    settings = current_app.config.get('RESTPLUS_JSON', {})
+    if settings or current_app.debug:
+        # Formatting options, and the indented output in debug mode, are those of the json module.
+        settings = {'indent': 4, **settings} if current_app.debug else settings
+        body = json.dumps(data, default=default, **settings).encode('utf-8')
+    else:
+        body = dumps(data)
+
+    response = make_response(body + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
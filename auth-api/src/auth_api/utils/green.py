@@ -0,0 +1,40 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Support for serving the app from green thread (gevent) gunicorn workers.
+
+The gevent worker of gunicorn monkey patches the standard library before it loads the app, so sockets, locks and the
+threads of the background workers all become cooperative. psycopg2 talks to Postgres in C, which the patching does
+not reach; init_app registers a wait callback so that a query yields to other requests rather than blocking the
+worker. Nothing is imported from gevent unless it has already been loaded, so the sync workers are not affected.
+"""
+import sys
+
+
+def is_monkey_patched() -> bool:
+    """Return True if gevent has patched the socket module of this process."""
+    if 'gevent' not in sys.modules:
+        return False
+    from gevent import monkey  # pylint: disable=import-outside-toplevel
+    return monkey.is_module_patched('socket')
+
+
+def init_app(app):
+    """Make psycopg2 cooperative when the app runs in a monkey patched process."""
+    if not is_monkey_patched():
+        return False
+
+    from psycogreen.gevent import patch_psycopg  # pylint: disable=import-outside-toplevel
+    patch_psycopg()
+    app.logger.info('Running in a gevent worker; psycopg2 made cooperative.')
+    return True
@@ -0,0 +1,74 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A background thread which processes a table of pending work in batches."""
+import threading
+from typing import Callable
+
+from auth_api.models import db
+
+
+class PollingWorker:
+    """Calls a batch function in a daemon thread, inside an app context, until stopped.
+
+    The batch function processes at most batch_size items and returns how many it processed. While it returns full
+    batches it is called again at once; otherwise the worker waits poll_seconds, or until woken.
+    """
+
+    def __init__(self, name: str, batch_function: Callable[[int], int], batch_size: int, poll_seconds: float):
+        """Create a stopped worker."""
+        self.name = name
+        self.batch_function = batch_function
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._thread: threading.Thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, app):
+        """Start the thread, unless it is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(app,), name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the thread after its current batch."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def wake(self):
+        """Run the next batch now rather than after the poll interval."""
+        self._wake.set()
+
+    def _run(self, app):
+        while not self._stop.is_set():
+            processed = 0
+            with app.app_context():
+                try:
+                    processed = self.batch_function(self.batch_size)
+                except Exception as e:  # pylint: disable=broad-except
+                    app.logger.error(f'{self.name} failed : {e}')
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            # Keep going while there is a backlog, otherwise wait for new work.
+            if processed < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
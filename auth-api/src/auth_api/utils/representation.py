@@ -0,0 +1,46 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Serialized JSON representations with strong ETags, and conditional GET responses for them.
+
+Build a Representation once per change of the data it serializes and keep it; conditional_response then answers
+requests carrying its ETag in If-None-Match with 304 Not Modified, without serializing or reading the data again.
+"""
+import hashlib
+
+from flask import Response, request
+
+from auth_api import status as http_status
+from auth_api.utils import fast_json
+
+
+class Representation:  # pylint: disable=too-few-public-methods
+    """The JSON body of the data and a strong ETag computed from the body."""
+
+    def __init__(self, data):
+        """Serialize the data and hash the body."""
+        self.data = data
+        self.body = fast_json.dumps(data)
+        self.etag = hashlib.sha256(self.body).hexdigest()
+
+
+def conditional_response(representation: Representation, cache_control: str = None) -> Response:
+    """Return the representation, or 304 Not Modified if the request already has it."""
+    if request.if_none_match.contains_weak(representation.etag):
+        response = Response(status=http_status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(representation.body, status=http_status.HTTP_200_OK, mimetype='application/json')
+    response.set_etag(representation.etag)
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    return response
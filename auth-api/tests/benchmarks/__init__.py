@@ -0,0 +1,27 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service level micro-benchmarks of the auth api hot paths.
+
+They use the fixtures of the unit tests, so they run against the same disposable Postgres database. The files are
+named bench_*.py so that the unit test run does not pick them up; run them with
+
+    pytest tests/benchmarks -o python_files='bench_*.py'
+
+The timings are written to benchmark.json, or the file named by BENCHMARK_JSON; compare two runs with
+
+    python -m benchmarks.compare before.json after.json
+
+The authorization benchmarks run on top of a synthetic dataset from benchmarks.datagen, a hundredth of production
+size unless BENCHMARK_SCALE says otherwise.
+"""
@@ -0,0 +1,80 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks of the authorization checks.
+
+Times check_auth down each role branch, with the request cache cleared before each call so that the lookups reach the
+database, and each AuthorizationView lookup, on top of a synthetic dataset.
+"""
+from auth_api.models.views.authorization import Authorization as AuthorizationView
+from auth_api.services.authorization import check_auth, clear_authorization_cache
+from auth_api.utils.roles import OWNER, STAFF
+from tests.utilities.factory_utils import (
+    factory_affiliation_model, factory_entity_model, factory_membership_model, factory_org_model, factory_user_model)
+
+
+def _setup():
+    """Return the keycloak guid of a user who owns an org, the org id and the identifier of an entity it affiliates.
+
+    The values are read once here, as the models expire whenever the session commits.
+    """
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    entity = factory_entity_model()
+    factory_affiliation_model(entity.id, org.id)
+    return user.keycloak_guid, org.id, entity.business_identifier
+
+
+def test_check_auth(session, synthetic_data, bench):  # pylint:disable=unused-argument
+    """Time check_auth for the staff admin, staff, system and public user branches."""
+    keycloak_guid, org_id, business = _setup()
+    sub = str(keycloak_guid)
+    staff_admin = {'realm_access': {'roles': ['staff_admin']}, 'sub': sub}
+    staff = {'realm_access': {'roles': ['staff']}, 'sub': sub}
+    system = {'realm_access': {'roles': ['system']}, 'sub': sub, 'corp_type': 'CP'}
+    public = {'realm_access': {'roles': ['public']}, 'sub': sub}
+    cases = {
+        'staff_admin': lambda: check_auth(staff_admin, one_of_roles=[STAFF]),
+        'staff': lambda: check_auth(staff, one_of_roles=[STAFF]),
+        'system business': lambda: check_auth(system, business_identifier=business),
+        'system org': lambda: check_auth(system, org_id=org_id),
+        'public business': lambda: check_auth(public, one_of_roles=[OWNER], business_identifier=business),
+        'public org': lambda: check_auth(public, one_of_roles=[OWNER], org_id=org_id)
+    }
+    for name, case in cases.items():
+        def uncached(case=case):
+            clear_authorization_cache()
+            case()
+        bench(f'check_auth {name}', uncached)
+
+    # A second check in the same request is answered by the request cache.
+    bench('check_auth public org (request cache)', cases['public org'], number=1000)
+
+
+def test_authorization_view(session, synthetic_data, bench):  # pylint:disable=unused-argument
+    """Time the lookups of the authorization view."""
+    keycloak_guid, org_id, business = _setup()
+    cases = {
+        'by business number':
+            lambda: AuthorizationView.find_user_authorization_by_business_number(business, keycloak_guid),
+        'by business number and corp type':
+            lambda: AuthorizationView.find_user_authorization_by_business_number_and_corp_type(business, 'CP'),
+        'by org id': lambda: AuthorizationView.find_user_authorization_by_org_id(keycloak_guid, org_id),
+        'by org id and corp type':
+            lambda: AuthorizationView.find_user_authorization_by_org_id_and_corp_type(org_id, 'CP'),
+        'all for user': lambda: AuthorizationView.find_all_authorizations_for_user(keycloak_guid)
+    }
+    for name, case in cases.items():
+        assert case()
+        bench(f'AuthorizationView {name}', case)
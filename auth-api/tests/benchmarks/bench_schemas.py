@@ -0,0 +1,73 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks of validating requests and dumping responses.
+
+Times schema_utils.validate for a valid and an invalid payload of each request schema, and OrgSchema and
+MembershipSchema dumps of an org with fifty members, with the schema itself and with the compiled dumpers.
+"""
+import uuid
+
+from auth_api.models import Membership as MembershipModel
+from auth_api.schemas import MembershipSchema, OrgSchema
+from auth_api.schemas import serializers
+from auth_api.schemas import utils as schema_utils
+from tests.utilities.factory_scenarios import (
+    TestAffliationInfo, TestContactInfo, TestEntityInfo, TestOrgProductsInfo)
+from tests.utilities.factory_utils import factory_membership_model, factory_org_model, factory_user_model
+
+
+PAYLOADS = {
+    'affiliation': TestAffliationInfo.affiliation3,
+    'anonymous_user': {'username': 'director', 'password': 'Password@1234'},
+    'bconline_credential': {'userId': 'PA12345', 'password': 'password'},
+    'bulk_user': {'orgId': 1, 'users': [{'username': f'user{i}', 'password': 'Password@1234'} for i in range(20)]},
+    'contact': TestContactInfo.contact1,
+    'entity': TestEntityInfo.entity1,
+    'invitation': {'recipientEmail': 'abc123@email.com', 'sentDate': '2020-05-25 10:00:00',
+                   'membership': [{'membershipType': 'MEMBER', 'orgId': 1}]},
+    'org': {'name': 'My Test Org', 'accessType': 'ANONYMOUS',
+            'mailingAddress': {'street': '123 Main St', 'city': 'Victoria', 'region': 'BC',
+                               'postalCode': 'V8W 1A1', 'country': 'CA'}},
+    'org_product_subscription': TestOrgProductsInfo.org_products2,
+    'termsofuse': {'termsversion': '1', 'istermsaccepted': True}
+}
+
+
+def test_validate(session, bench):  # pylint:disable=unused-argument
+    """Time validating a valid and an invalid payload of each request schema."""
+    for schema_id, payload in PAYLOADS.items():
+        assert schema_utils.validate(payload, schema_id)[0]
+        assert not schema_utils.validate({'unexpected': 1}, schema_id)[0]
+        bench(f'validate {schema_id}', lambda: schema_utils.validate(payload, schema_id))  # noqa: B023
+        bench(f'validate {schema_id} (invalid)',
+              lambda: schema_utils.validate({'unexpected': 1}, schema_id))  # noqa: B023
+
+
+def test_dump(session, bench):  # pylint:disable=unused-argument
+    """Time dumping an org and its memberships."""
+    org = factory_org_model()
+    for index in range(50):
+        user = factory_user_model(user_info={'username': f'member{index}', 'firstname': 'Member',
+                                             'lastname': str(index), 'roles': '{edit}',
+                                             'keycloak_guid': uuid.uuid4()})
+        factory_membership_model(user.id, org.id, member_type='OWNER' if index == 0 else 'MEMBER')
+    memberships = MembershipModel.find_members_by_org_id(org.id)
+    for membership in memberships:  # load the relationships once, as the listing endpoints do
+        serializers.dump(membership, MembershipSchema, exclude=['org'])
+
+    bench('OrgSchema dump', lambda: OrgSchema().dump(org))
+    bench('OrgSchema compiled dump', lambda: serializers.dump(org, OrgSchema))
+    bench('MembershipSchema dump 50', lambda: MembershipSchema(exclude=['org']).dump(memberships, many=True))
+    bench('MembershipSchema compiled dump 50',
+          lambda: serializers.dump(memberships, MembershipSchema, many=True, exclude=['org']))
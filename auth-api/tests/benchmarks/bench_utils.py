@@ -0,0 +1,39 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks of the request helpers in auth_api.utils.
+
+Times camelback2snake on a typical org payload, and hashing and validating a passcode with bcrypt, which
+dominates the affiliation and passcode reset endpoints.
+"""
+from auth_api.utils.passcode import passcode_hash, validate_passcode
+from auth_api.utils.util import camelback2snake
+
+
+ORG_PAYLOAD = {'name': 'My Test Org', 'accessType': 'REGULAR', 'typeCode': 'PREMIUM', 'bcOnlineCredential': {},
+               'mailingAddress': {}, 'paymentInfo': {}, 'productSubscriptions': [], 'businessType': 'LAW',
+               'businessSize': '0-1', 'isBusinessAccount': True, 'branchName': 'Main', 'createdBy': 'user'}
+
+
+def test_camelback2snake(bench):
+    """Time converting the keys of an org payload to snake case."""
+    bench('camelback2snake', lambda: camelback2snake(ORG_PAYLOAD), number=10000)
+
+
+def test_passcode(bench):
+    """Time hashing a passcode and validating a right and a wrong one against the hash."""
+    hashed = passcode_hash('111111111')
+
+    bench('passcode_hash', lambda: passcode_hash('111111111'), number=5)
+    bench('validate_passcode.valid', lambda: validate_passcode('111111111', hashed), number=5)
+    bench('validate_passcode.invalid', lambda: validate_passcode('222222222', hashed), number=5)
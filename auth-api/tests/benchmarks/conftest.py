@@ -0,0 +1,68 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fixtures which time the benchmarks and save their results."""
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import timeit
+
+import pytest
+
+from benchmarks.datagen import generate
+
+
+def _commit():
+    """Return the commit the benchmarks ran on, if it can be found."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@pytest.fixture(scope='session')
+def benchmark_results():
+    """Collect the results of the session and write them to BENCHMARK_JSON at its end."""
+    results = []
+    yield results
+    with open(os.getenv('BENCHMARK_JSON', 'benchmark.json'), 'w') as results_file:
+        json.dump({'created': datetime.datetime.now().isoformat(), 'commit': _commit(),
+                   'python': platform.python_version(), 'results': results}, results_file, indent=2)
+
+
+@pytest.fixture
+def bench(request, benchmark_results):  # pylint: disable=redefined-outer-name
+    """Return a function which times a callable and records the result under the name."""
+    def run(name: str, func, number: int = 100, repeat: int = 5):
+        func()  # warm up caches and connections, as a running service would have
+        timings = [total / number * 1e6 for total in timeit.repeat(func, number=number, repeat=repeat)]
+        result = {'name': name, 'group': request.module.__name__.rsplit('.', 1)[-1],
+                  'median_us': statistics.median(timings), 'min_us': min(timings), 'max_us': max(timings),
+                  'number': number, 'repeat': repeat}
+        benchmark_results.append(result)
+        return result
+
+    return run
+
+
+@pytest.fixture
+def synthetic_data(session):  # pylint: disable=redefined-outer-name
+    """Load a synthetic dataset into the test transaction, so lookups run against tables of a realistic size.
+
+    BENCHMARK_SCALE sets its size, a hundredth of production (ten thousand users) by default; it is rolled back
+    with the session.
+    """
+    return generate(session.connection().connection, scale=float(os.getenv('BENCHMARK_SCALE', '0.01')))
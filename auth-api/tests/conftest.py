@@ -173,3 +173,7 @@ def keycloak_mock(monkeypatch):
                         lambda *args, **kwargs: None)
     monkeypatch.setattr('auth_api.services.keycloak.KeycloakService.remove_from_account_holders_group',
                         lambda *args, **kwargs: None)
+    monkeypatch.setattr('auth_api.services.keycloak_group_sync.KeycloakGroupSync.join_account_holders_group',
+                        lambda *args, **kwargs: None)
+    monkeypatch.setattr('auth_api.services.keycloak_group_sync.KeycloakGroupSync.remove_from_account_holders_group',
+                        lambda *args, **kwargs: None)
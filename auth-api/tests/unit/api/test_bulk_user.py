@@ -113,3 +113,50 @@ def test_add_user_admin_valid_bcros(client, jwt, session, keycloak_mock):  # pyl
     assert rv.json['users'][1]['http_status'] == 409
     assert rv.json['users'][0]['error'] == 'The username is already taken'
     assert rv.json['users'][1]['error'] == 'The username is already taken'
+
+
+def test_add_user_job(client, jwt, session, keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that bulk users can be submitted as a job and the job polled for the results."""
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.staff_admin_role)
+    client.post('/api/v1/users', headers=headers, content_type='application/json')
+    rv = client.post('/api/v1/orgs', data=json.dumps(TestOrgInfo.org_anonymous),
+                     headers=headers, content_type='application/json')
+    org_id = rv.json['id']
+    rv = client.post('/api/v1/invitations', data=json.dumps(factory_invitation_anonymous(org_id=org_id)),
+                     headers=headers, content_type='application/json')
+    invitation_token = rv.json.get('token')
+
+    user = {
+        'username': 'testuser{}'.format(randint(0, 1000)),
+        'password': 'Password@1234',
+    }
+    client.post('/api/v1/users/bcros', data=json.dumps(user),
+                headers={'invitation_token': invitation_token}, content_type='application/json')
+    invited_user_token = {
+        'iss': CONFIG.JWT_OIDC_TEST_ISSUER,
+        'sub': str(uuid.uuid4()),
+        'firstname': 'Test',
+        'lastname': 'User',
+        'preferred_username': 'bcros/{}'.format(user.get('username')),
+        'realm_access': {
+            'roles': []
+        },
+        'roles': [],
+        'accessType': 'ANONYMOUS'
+    }
+    headers = factory_auth_header(jwt=jwt, claims=invited_user_token)
+    client.post('/api/v1/users', headers=headers, content_type='application/json')
+
+    user_input = BulkUserTestScenario.get_bulk_user1_for_org(org_id)
+    rv = client.post('/api/v1/bulk/users/jobs', headers=headers,
+                     data=json.dumps(user_input),
+                     content_type='application/json')
+    assert rv.status_code == http_status.HTTP_202_ACCEPTED
+    assert rv.json['total'] == 2
+
+    rv = client.get('/api/v1/bulk/users/jobs/{}'.format(rv.json['id']), headers=headers)
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert rv.json['status'] == 'COMPLETED'
+    assert rv.json['processed'] == 2
+    assert rv.json['users'][0]['http_status'] == 201
+    assert rv.json['users'][1]['username'] == IdpHint.BCROS.value + '/' + user_input['users'][1]['username']
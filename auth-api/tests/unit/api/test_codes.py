@@ -35,6 +35,23 @@ def test_get_codes(client, jwt, session):  # pylint:disable=unused-argument
     assert rv.status_code == http_status.HTTP_200_OK
 
 
+def test_get_codes_not_modified(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert that the codes are not sent again when the client has the current ETag."""
+    rv = client.get('/api/v1/codes/membership_type', content_type='application/json')
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert rv.headers['Cache-Control']
+    etag = rv.headers['ETag']
+
+    rv = client.get('/api/v1/codes/membership_type', headers={'If-None-Match': etag})
+    assert rv.status_code == http_status.HTTP_304_NOT_MODIFIED
+    assert rv.headers['ETag'] == etag
+    assert not rv.data
+
+    rv = client.get('/api/v1/codes/membership_type', headers={'If-None-Match': '"other"'})
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert rv.json
+
+
 def test_get_codes_404(client, jwt, session):  # pylint:disable=unused-argument
     """Assert that the code type can not be fetched."""
     rv = client.get('/api/v1/codes/{}'.format('aaaaaaa'), content_type='application/json')
@@ -46,6 +63,7 @@ def test_get_codes_404(client, jwt, session):  # pylint:disable=unused-argument
 
 def test_get_codes_returns_exception(client, jwt, session):  # pylint:disable=unused-argument
     """Assert that the code type can not be fetched and with expcetion."""
-    with patch.object(CodesService, 'fetch_codes', side_effect=BusinessException(Error.UNDEFINED_ERROR, None)):
+    with patch.object(CodesService, 'fetch_codes_representation',
+                      side_effect=BusinessException(Error.UNDEFINED_ERROR, None)):
         rv = client.get('/api/v1/codes/{}'.format('membership_type'), content_type='application/json')
         assert rv.status_code == http_status.HTTP_400_BAD_REQUEST
@@ -37,6 +37,22 @@ def test_documents_returns_200(client, jwt, session):  # pylint:disable=unused-a
     assert rv.json.get('version_id') == 'd1'
 
 
+def test_documents_not_modified(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert that the document is not sent again when the client has the current ETag for the token."""
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.public_user_role)
+    rv = client.get('/api/v1/documents/termsofuse', headers=headers, content_type='application/json')
+    etag = rv.headers['ETag']
+
+    rv = client.get('/api/v1/documents/termsofuse', headers={**headers, 'If-None-Match': etag})
+    assert rv.status_code == http_status.HTTP_304_NOT_MODIFIED
+
+    # Anonymous users get a different document for the same url
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.anonymous_bcros_role)
+    rv = client.get('/api/v1/documents/termsofuse', headers={**headers, 'If-None-Match': etag})
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert rv.json.get('version_id') == 'd1'
+
+
 def test_invalid_documents_returns_404(client, jwt, session):  # pylint:disable=unused-argument
     """Assert get documents endpoint returns 404."""
     headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.public_user_role)
@@ -23,6 +23,7 @@ from unittest.mock import patch
 from auth_api import status as http_status
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
+from auth_api.models import ContactLink as ContactLinkModel
 from auth_api.services import Affiliation as AffiliationService
 from auth_api.services import Invitation as InvitationService
 from auth_api.services import Org as OrgService
@@ -30,7 +31,9 @@ from auth_api.services import User as UserService
 from auth_api.utils.enums import OrgType
 from tests.utilities.factory_scenarios import (
     TestAffliationInfo, TestContactInfo, TestEntityInfo, TestJwtClaims, TestOrgInfo)
-from tests.utilities.factory_utils import factory_auth_header, factory_invitation
+from tests.utilities.factory_utils import (
+    factory_auth_header, factory_contact_model, factory_invitation, factory_membership_model, factory_user_model)
+from tests.utilities.query_count import assert_max_queries
 
 
 def test_add_org(client, jwt, session, keycloak_mock):  # pylint:disable=unused-argument
@@ -686,6 +689,31 @@ def test_get_members(client, jwt, session, keycloak_mock):  # pylint:disable=unu
     assert dictionary['members'][0]['membershipTypeCode'] == 'OWNER'
 
 
+def test_get_members_query_count(client, jwt, session, keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that listing members does not run more queries as the org gets more members."""
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.public_user_role)
+    client.post('/api/v1/users', headers=headers, content_type='application/json')
+    rv = client.post('/api/v1/orgs', data=json.dumps(TestOrgInfo.org1),
+                     headers=headers, content_type='application/json')
+    org_id = rv.json['id']
+
+    with assert_max_queries(50) as counter:
+        rv = client.get('/api/v1/orgs/{}/members'.format(org_id), headers=headers, content_type='application/json')
+    assert len(rv.json['members']) == 1
+
+    for i in range(10):
+        user = factory_user_model(user_info={'username': 'member{}'.format(i), 'firstname': 'Test',
+                                             'lastname': 'Member', 'roles': '{edit, uma_authorization, basic}'})
+        contact_link = ContactLinkModel(user=user, contact=factory_contact_model())
+        contact_link.save()
+        factory_membership_model(user.id, org_id, member_type='MEMBER')
+
+    with assert_max_queries(counter.count):
+        rv = client.get('/api/v1/orgs/{}/members'.format(org_id), headers=headers, content_type='application/json')
+    assert len(rv.json['members']) == 11
+    assert all(member['user']['contacts'] for member in rv.json['members'][1:])
+
+
 def test_delete_org(client, jwt, session, keycloak_mock):  # pylint:disable=unused-argument
     """Assert that an org can be deleted."""
     headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.public_user_role)
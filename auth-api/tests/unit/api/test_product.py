@@ -18,6 +18,8 @@ Test suite to ensure that the Product api endpoints are working as expected.
 
 import json
 
+from auth_api import status as http_status
+
 
 def test_get_all_products(client, session):  # pylint:disable=unused-argument
     """Assert that an org can be retrieved via GET."""
@@ -26,3 +28,14 @@ def test_get_all_products(client, session):  # pylint:disable=unused-argument
     # assert the structure is correct by checking for name, description properties in each element
     for item in item_list:
         assert item['name'] and item['description']
+
+
+def test_get_all_products_not_modified(client, session):  # pylint:disable=unused-argument
+    """Assert that the products are not sent again when the client has the current ETag."""
+    rv = client.get('/api/v1/products')
+    etag = rv.headers['ETag']
+    assert rv.headers['Cache-Control']
+
+    rv = client.get('/api/v1/products', headers={'If-None-Match': etag})
+    assert rv.status_code == http_status.HTTP_304_NOT_MODIFIED
+    assert rv.headers['ETag'] == etag
@@ -295,6 +295,35 @@ def test_staff_search_users(client, jwt, session):  # pylint:disable=unused-argu
     assert len(users) == 1
 
 
+def test_staff_search_users_paged(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert that a staff user can page through users with a cursor and search on the start of a name."""
+    for claims in (TestJwtClaims.public_user_role, TestJwtClaims.no_role):
+        headers = factory_auth_header(jwt=jwt, claims=claims)
+        rv = client.post('/api/v1/users', headers=headers, content_type='application/json')
+        assert rv.status_code == http_status.HTTP_201_CREATED
+
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.staff_role)
+    rv = client.get('/api/v1/users?limit=1', headers=headers, content_type='application/json')
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert len(rv.json['users']) == 1
+    first_user = rv.json['users'][0]
+
+    rv = client.get('/api/v1/users?limit=1&cursor={}'.format(rv.json['nextCursor']),
+                    headers=headers, content_type='application/json')
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert len(rv.json['users']) == 1
+    assert rv.json['users'][0]['username'] != first_user['username']
+
+    rv = client.get('/api/v1/users?limit=10&search={}'.format(TestJwtClaims.no_role['lastname'][:3]),
+                    headers=headers, content_type='application/json')
+    assert rv.status_code == http_status.HTTP_200_OK
+    assert any(user['lastname'] == TestJwtClaims.no_role['lastname'] for user in rv.json['users'])
+    assert 'nextCursor' not in rv.json
+
+    rv = client.get('/api/v1/users?limit=0', headers=headers, content_type='application/json')
+    assert rv.status_code == http_status.HTTP_400_BAD_REQUEST
+
+
 def test_get_user(client, jwt, session):  # pylint:disable=unused-argument
     """Assert that a user can retrieve their own profile."""
     # POST a test user
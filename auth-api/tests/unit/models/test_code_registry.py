@@ -0,0 +1,75 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the code registry.
+
+Test suite to ensure that the code, type and status lookups are answered from memory.
+"""
+from sqlalchemy.exc import ProgrammingError
+
+from auth_api.models import InvitationStatus as InvitationStatusModel
+from auth_api.models import OrgStatus as OrgStatusModel
+from auth_api.models import OrgType as OrgTypeModel
+from auth_api.models import ProductRoleCode as ProductRoleCodeModel
+from auth_api.models.code_registry import CodeRegistry
+from tests.utilities.query_count import assert_max_queries
+
+
+def test_lookups_from_memory(session):  # pylint: disable=unused-argument
+    """Assert that the lookups run no queries once the registry is loaded."""
+    assert CodeRegistry.reload()
+
+    with assert_max_queries(0):
+        org_type = OrgTypeModel.get_default_type()
+        org_status = OrgStatusModel.get_default_status()
+        invitation_status = InvitationStatusModel.get_default_status()
+        assert OrgTypeModel.get_type_for_code(org_type.code) is org_type
+        assert CodeRegistry.code_model_for_table('org_type') is OrgTypeModel
+        assert CodeRegistry.code_model_for_table('user') is None
+
+    assert org_type.default
+    assert org_status.default
+    assert invitation_status.default
+    assert org_type in session
+
+
+def test_lookup_falls_back_to_table(session):  # pylint: disable=unused-argument
+    """Assert that rows inserted after the registry was loaded are found in the table."""
+    CodeRegistry.reload()
+    version = CodeRegistry.version()
+    org_type = OrgTypeModel(code='TEST', desc='Test')
+    org_type.save()
+
+    assert OrgTypeModel.get_type_for_code('TEST').code == 'TEST'
+    assert OrgTypeModel.get_type_for_code('MISSING') is None
+    assert ProductRoleCodeModel.find_by_code_and_product_code('MISSING', 'MISSING') is None
+    assert 'TEST' not in [row.code for row in CodeRegistry.rows(OrgTypeModel)]
+    assert CodeRegistry.version() == version
+
+
+def test_failed_load_keeps_session(session, monkeypatch):  # pylint: disable=unused-argument
+    """Assert that a failed load leaves the changes pending in the caller's session alone."""
+    org_type = OrgTypeModel(code='TEST', desc='Test')
+    session.add(org_type)
+    session.flush()
+
+    def fail(*args, **kwargs):
+        raise ProgrammingError('SELECT', {}, Exception('relation does not exist'))
+
+    monkeypatch.setattr('sqlalchemy.orm.Query.all', fail)
+    assert not CodeRegistry.reload()
+    monkeypatch.undo()
+
+    assert org_type in session
+    assert OrgTypeModel.query.filter_by(code='TEST').one() is org_type
+    assert CodeRegistry.reload()
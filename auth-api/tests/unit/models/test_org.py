@@ -92,6 +92,20 @@ def test_update_org_from_dict(session):  # pylint:disable=unused-argument
     assert org.name == update_dictionary['name']
 
 
+def test_find_similar_org_by_name(session):  # pylint:disable=unused-argument
+    """Assert that orgs with the same normalized name or a name containing the given name are found."""
+    org = factory_org_model(name='My  Test Org', session=session)
+    assert org.normalized_name == 'my test org'
+
+    assert OrgModel.find_similar_org_by_name(' my test   ORG ').id == org.id
+    assert OrgModel.find_similar_org_by_name('test org').id == org.id
+    assert OrgModel.find_similar_org_by_name('test org', org_id=org.id) is None
+    assert OrgModel.find_similar_org_by_name('t%g') is None
+
+    org.update_org_from_dict({'name': 'Renamed Org'})
+    assert org.normalized_name == 'renamed org'
+
+
 def test_count_org_from_dict(session):  # pylint:disable=unused-argument
     """Assert that an Org can be updated from a dictionary."""
     user = factory_user_model()
@@ -0,0 +1,69 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the unit of work.
+
+Test suite to ensure that the models commit once per unit of work, and roll back together.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from auth_api.models import Contact as ContactModel
+from auth_api.models import db
+from auth_api.models.unit_of_work import is_active, transactional, unit_of_work
+
+
+def _save_contact(email):
+    return ContactModel(email=email).save()
+
+
+def test_unit_of_work_commits_once(session):  # pylint:disable=unused-argument
+    """Assert that the saves in a unit of work flush, and are committed once at its end."""
+    with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+        with unit_of_work():
+            assert is_active()
+            first = _save_contact('first@mail.com')
+            second = _save_contact('second@mail.com')
+            second.delete()
+            assert first.id is not None
+            assert commit.call_count == 0
+        assert commit.call_count == 1
+    assert not is_active()
+    assert ContactModel.query.get(first.id) is not None
+
+
+def test_unit_of_work_rolls_back_on_error(session):  # pylint:disable=unused-argument
+    """Assert that nothing saved in a unit of work is kept if it raises."""
+    with pytest.raises(ValueError):
+        with unit_of_work():
+            contact_id = _save_contact('rollback@mail.com').id
+            raise ValueError()
+    assert not is_active()
+    assert ContactModel.query.get(contact_id) is None
+
+
+def test_transactional_rolls_back_error_response(session):  # pylint:disable=unused-argument
+    """Assert that a resource method returning an error status keeps none of its changes."""
+    saved = {}
+
+    @transactional
+    def post():
+        saved['id'] = _save_contact('error@mail.com').id
+        with unit_of_work():
+            # Joins the unit of work of the request rather than committing on its own.
+            _save_contact('nested@mail.com')
+        return {'message': 'error'}, 400
+
+    assert post()[1] == 400
+    assert ContactModel.query.get(saved['id']) is None
@@ -16,8 +16,10 @@
 
 Test-Suite to ensure that the User Class is working as expected.
 """
+from flask import g
 
-from auth_api.models import User
+from auth_api.models import Org, User
+from tests.utilities.query_count import assert_max_queries
 
 
 def test_user(session):
@@ -62,6 +64,30 @@ def test_user_find_by_jwt_token(session):
     assert u.id is not None
 
 
+def test_user_find_by_jwt_token_resolved_once(session):
+    """Assert that the user of a token is looked up once and then shared, including by the audit columns."""
+    user = User(username='CP1234567',
+                roles='{edit, uma_authorization, staff}',
+                keycloak_guid='1b20db59-19a0-4727-affe-c6f64309fd04')
+    session.add(user)
+    session.commit()
+
+    token = {'sub': '1b20db59-19a0-4727-affe-c6f64309fd04'}
+    assert User.find_by_jwt_token(token).id == user.id
+
+    with assert_max_queries(0):
+        assert User.find_by_jwt_token(token).id == user.id
+        assert User.find_id_by_jwt_token(token) == user.id
+
+    g.jwt_oidc_token_info = token
+    with assert_max_queries(2) as counter:
+        org = Org(name='Audited Org', type_code='BASIC', status_code='ACTIVE')
+        session.add(org)
+        session.flush()
+    assert not any('FROM "user"' in statement for statement in counter.statements)
+    assert org.created_by_id == user.id
+
+
 def test_create_from_jwt_token(session):  # pylint: disable=unused-argument
     """Assert User is created from the JWT fields."""
     token = {
@@ -15,12 +15,19 @@
 
 Test suite to ensure that the Authorizations view routines are working as expected.
 """
+import threading
+import time
 import uuid
 
+from sqlalchemy import text
+
+from auth_api.models import db
 from auth_api.models.views.authorization import Authorization
+from auth_api.utils.roles import Status
 from tests.utilities.factory_scenarios import TestUserInfo
 from tests.utilities.factory_utils import (
-    factory_affiliation_model, factory_entity_model, factory_membership_model, factory_org_model, factory_user_model)
+    factory_affiliation_model, factory_entity_model, factory_membership_model, factory_org_model, factory_product_model,
+    factory_user_model)
 
 
 def test_find_user_authorization_by_business_number(session):  # pylint:disable=unused-argument
@@ -195,3 +202,146 @@ def test_find_all_user_authorizations_for_empty(session):  # pylint:disable=unus
     authorizations = Authorization.find_all_authorizations_for_user(str(user.keycloak_guid))
     assert authorizations is not None
     assert authorizations[0].business_identifier is None
+
+
+def test_authorizations_index_consistent_with_view(session):  # pylint:disable=unused-argument
+    """Assert that the authorizations index has the same rows as the authorizations view."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    entity = factory_entity_model()
+    factory_affiliation_model(entity.id, org.id)
+    factory_product_model(org.id)
+
+    assert Authorization.find_inconsistencies() == []
+
+
+def test_authorizations_index_follows_membership_changes(session):  # pylint:disable=unused-argument
+    """Assert that the authorizations index is refreshed when the membership changes."""
+    user = factory_user_model()
+    org = factory_org_model()
+    membership = factory_membership_model(user.id, org.id)
+
+    membership.membership_type_code = 'ADMIN'
+    membership.save()
+    authorization = Authorization.find_user_authorization_by_org_id(str(user.keycloak_guid), org.id)
+    assert authorization.org_membership == 'ADMIN'
+
+    membership.status = Status.INACTIVE.value
+    membership.save()
+    authorization = Authorization.find_user_authorization_by_org_id(str(user.keycloak_guid), org.id)
+    assert authorization is None
+    assert Authorization.find_inconsistencies() == []
+
+
+def test_authorizations_index_follows_entity_changes(session):  # pylint:disable=unused-argument
+    """Assert that the authorizations index is refreshed when the affiliated entity changes."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    entity = factory_entity_model()
+    factory_affiliation_model(entity.id, org.id)
+
+    entity.folio_number = 'FOLIO-1'
+    entity.save()
+    authorization = Authorization.find_user_authorization_by_business_number(entity.business_identifier,
+                                                                             str(user.keycloak_guid))
+    assert authorization.folio_number == 'FOLIO-1'
+
+
+def test_authorizations_refresh_locks_org(session):  # pylint:disable=unused-argument
+    """Assert that refreshing an org holds its advisory lock until commit, so concurrent refreshes serialize."""
+    org = factory_org_model()
+
+    Authorization.rebuild(org.id)
+    locks = session.execute(text("SELECT classid, objid, mode FROM pg_locks WHERE locktype = 'advisory' "
+                                 'AND pid = pg_backend_pid()')).fetchall()
+    assert (5172002, org.id, 'ExclusiveLock') in [tuple(lock) for lock in locks]
+    assert (5172001, 0, 'ShareLock') in [tuple(lock) for lock in locks]
+
+
+def test_authorizations_index_follows_affiliation_and_product_changes(session):  # pylint:disable=unused-argument
+    """Assert that the rows refreshed for an affiliation, a product or a rename keep the index matching the view."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    entity = factory_entity_model()
+
+    affiliation = factory_affiliation_model(entity.id, org.id)
+    assert Authorization.find_inconsistencies() == []
+
+    factory_product_model(org.id)
+    assert Authorization.find_inconsistencies() == []
+
+    org.name = 'Renamed Org'
+    org.save()
+    entity.business_identifier = 'CP7654321'
+    entity.save()
+    assert Authorization.find_inconsistencies() == []
+    authorization = Authorization.find_user_authorization_by_business_number('CP7654321', str(user.keycloak_guid))
+    assert authorization.org_name == 'Renamed Org'
+
+    affiliation.delete()
+    assert Authorization.find_inconsistencies() == []
+
+
+def test_entity_changes_lock_orgs_in_order(session):  # pylint:disable=unused-argument
+    """Assert that two transactions changing entities of the same two orgs wait for each other rather than deadlock.
+
+    The second transaction changes an entity affiliated to both orgs, the second org first, while the first
+    transaction holds the first org; the first transaction then changes an entity of the second org.
+    """
+    engine = db.engine
+    with engine.connect() as setup:
+        type_code = setup.execute(text('SELECT code FROM org_type LIMIT 1')).scalar()
+        status_code = setup.execute(text('SELECT code FROM org_status LIMIT 1')).scalar()
+
+        def insert(sql, **params):
+            return setup.execute(text(sql + ' RETURNING id'), params).scalar()
+
+        first_org, second_org = [insert('INSERT INTO org (name, type_code, status_code, billable) '
+                                        'VALUES (:name, :type_code, :status_code, true)',
+                                        name=name, type_code=type_code, status_code=status_code)
+                                 for name in ('Lock Order 1', 'Lock Order 2')]
+        entities = [insert("INSERT INTO entity (business_identifier, corp_type_code, name, pass_code_claimed) "
+                           "VALUES (:identifier, 'CP', 'Entity', false)", identifier=identifier)
+                    for identifier in ('CP7000001', 'CP7000002')]
+        for entity_id, org_id in ((entities[0], second_org), (entities[1], second_org), (entities[1], first_org)):
+            insert('INSERT INTO affiliation (entity_id, org_id) VALUES (:entity_id, :org_id)',
+                   entity_id=entity_id, org_id=org_id)
+
+    errors = []
+    first = engine.connect()
+    second = engine.connect()
+    try:
+        first_transaction = first.begin()
+        first.execute(text("UPDATE org SET name = 'Lock Order 1a' WHERE id = :id"), {'id': first_org})
+        second_pid = second.execute(text('SELECT pg_backend_pid()')).scalar()
+
+        def change_shared_entity():
+            try:
+                with second.begin():
+                    second.execute(text("UPDATE entity SET name = 'Shared' WHERE id = :id"), {'id': entities[1]})
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+
+        thread = threading.Thread(target=change_shared_entity)
+        thread.start()
+        deadline = time.time() + 10
+        while not first.execute(text("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND NOT granted "
+                                     'AND pid = :pid'), {'pid': second_pid}).scalar():
+            assert time.time() < deadline, 'the second transaction did not wait for the first org'
+            time.sleep(0.05)
+
+        first.execute(text("UPDATE entity SET name = 'Second org only' WHERE id = :id"), {'id': entities[0]})
+        first_transaction.commit()
+        thread.join(10)
+        assert not thread.is_alive()
+        assert errors == []
+    finally:
+        first.close()
+        second.close()
+        with engine.connect() as cleanup:
+            cleanup.execute(text('DELETE FROM affiliation WHERE entity_id IN :ids'), {'ids': tuple(entities)})
+            cleanup.execute(text('DELETE FROM entity WHERE id IN :ids'), {'ids': tuple(entities)})
+            cleanup.execute(text('DELETE FROM org WHERE id IN :ids'), {'ids': (first_org, second_org)})
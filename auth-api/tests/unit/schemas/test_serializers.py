@@ -0,0 +1,55 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared schemas and compiled dumpers.
+
+Test-Suite to ensure that the compiled dumpers produce the same output as dumping with the schemas.
+"""
+from auth_api.models import ContactLink as ContactLinkModel
+from auth_api.schemas import EntitySchema, MembershipSchema, OrgSchema, UserSchema
+from auth_api.schemas import serializers
+from tests.utilities.factory_utils import (
+    factory_contact_model, factory_entity_model, factory_membership_model, factory_org_model, factory_user_model)
+
+
+def test_schema_instances_reused():
+    """Assert that the schema is created once for each combination of options."""
+    schema = serializers.get_schema(MembershipSchema, exclude=['org'])
+    assert serializers.get_schema(MembershipSchema, exclude=('org',)) is schema
+    assert serializers.get_schema(MembershipSchema) is not schema
+    assert serializers.get_schema(MembershipSchema, many=True, exclude=['org']) is not schema
+    assert serializers.get_dumper(MembershipSchema, exclude=['org']) is \
+        serializers.get_dumper(MembershipSchema, exclude=['org'])
+
+
+def test_dumpers_match_schemas(session):  # pylint:disable=unused-argument
+    """Assert that the org, membership, user and entity dumpers return the same dicts as their schemas."""
+    user = factory_user_model()
+    contact = factory_contact_model()
+    contact_link = ContactLinkModel(contact=contact, user=user)
+    contact_link.save()
+    org = factory_org_model(user_id=user.id)
+    membership = factory_membership_model(user.id, org.id)
+    entity = factory_entity_model(user_id=user.id)
+    session.expire_all()
+
+    for obj, schema_class, exclude in ((org, OrgSchema, None), (membership, MembershipSchema, ['org']),
+                                       (membership, MembershipSchema, None), (user, UserSchema, None),
+                                       (entity, EntitySchema, None)):
+        expected = schema_class(exclude=exclude or ()).dump(obj)
+        assert serializers.dump(obj, schema_class, exclude=exclude) == expected
+        assert serializers.dump([obj, obj], schema_class, many=True, exclude=exclude) == [expected, expected]
+
+    dumped = serializers.dump(membership, MembershipSchema, exclude=['org'])
+    assert dumped['user']['contacts'][0]['email'] == contact.email
+    assert 'org' not in dumped
@@ -0,0 +1,63 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the JSON schema utilities.
+
+Test-Suite to ensure that the schema store and validators are cached and validate as expected.
+"""
+from unittest.mock import patch
+
+import gevent
+
+from auth_api.schemas import utils as schema_utils
+
+
+def test_schema_store_loaded_once():
+    """Assert that the schema files are read only once."""
+    schema_utils.get_schema_store()
+    with patch('auth_api.schemas.utils.listdir') as mock_listdir:
+        store = schema_utils.get_schema_store()
+        assert mock_listdir.call_count == 0
+    assert f'{schema_utils.BASE_URI}/org' in store
+
+
+def test_validator_cached():
+    """Assert that the compiled validator is reused and resolves references to other schemas."""
+    with schema_utils.checkout_validator('org') as validator:
+        with schema_utils.checkout_validator('org') as in_use:
+            assert in_use is not validator
+    with schema_utils.checkout_validator('org') as reused:
+        assert reused in (validator, in_use)
+
+    valid, errors = schema_utils.validate({'name': 'My Test Org', 'mailingAddress': {'city': 'Victoria'}}, 'org')
+    assert valid
+    assert errors is None
+
+    valid, errors = schema_utils.validate({'name': 'My Test Org', 'mailingAddress': {'foo': 'bar'}}, 'org')
+    assert not valid
+    assert schema_utils.serialize(errors)
+
+
+def test_validator_reused_across_greenlets(monkeypatch):
+    """Assert that a validator compiled for one greenlet is reused by the next, as each request has its own greenlet."""
+    monkeypatch.setattr(schema_utils, '_VALIDATOR_POOLS', {})
+    results = []
+
+    def validate_org():
+        results.append(schema_utils.validate({'name': 'My Test Org'}, 'org'))
+
+    with patch('auth_api.schemas.utils.get_validator', wraps=schema_utils.get_validator) as mock_compile:
+        gevent.spawn(validate_org).join()
+        gevent.spawn(validate_org).join()
+        assert mock_compile.call_count == 1
+    assert results == [(True, None), (True, None)]
@@ -17,10 +17,14 @@ Test suite to ensure that the Authorization service routines are working as expe
 """
 
 import uuid
+from unittest.mock import patch
 
 import pytest
 from werkzeug.exceptions import HTTPException
 
+from auth_api.models import Membership as MembershipModel
+from auth_api.models.views.authorization import Authorization as AuthorizationView
+from auth_api.services import authorization as authorization_service
 from auth_api.services.authorization import Authorization, check_auth
 from auth_api.utils.roles import MEMBER, OWNER, STAFF, STAFF_ADMIN
 from tests.utilities.factory_utils import (
@@ -276,3 +280,72 @@ def test_get_account_authorizations_for_product(session):  # pylint:disable=unus
     assert len(authorization.get('roles')) == 2
     assert 'search' in authorization.get('roles')
     assert 'register' in authorization.get('roles')
+
+
+def test_check_auth_is_cached_per_request(session):  # pylint:disable=unused-argument
+    """Assert that repeated check_auth calls for the same user and org query the authorizations only once."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    token_info = {'realm_access': {'roles': ['public']}, 'sub': str(user.keycloak_guid)}
+
+    with patch.object(AuthorizationView, 'find_user_authorization_by_org_id',
+                      wraps=AuthorizationView.find_user_authorization_by_org_id) as mock_find:
+        check_auth(token_info, one_of_roles=[OWNER], org_id=org.id)
+        check_auth(token_info, one_of_roles=[OWNER], org_id=org.id)
+        assert mock_find.call_count == 1
+
+
+def test_check_auth_cache_invalidated_on_membership_change(session):  # pylint:disable=unused-argument
+    """Assert that a membership change is seen by the next check_auth call in the same request."""
+    user = factory_user_model()
+    org = factory_org_model()
+    membership = factory_membership_model(user.id, org.id)
+    token_info = {'realm_access': {'roles': ['public']}, 'sub': str(user.keycloak_guid)}
+
+    check_auth(token_info, one_of_roles=[OWNER], org_id=org.id)
+
+    membership.membership_type_code = MEMBER
+    membership.save()
+
+    with pytest.raises(HTTPException) as excinfo:
+        check_auth(token_info, one_of_roles=[OWNER], org_id=org.id)
+    assert excinfo.value.code == 403
+
+
+def test_cache_cleared_on_commit(session, app, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that a membership change clears the shared cache when it commits, not when it is flushed."""
+    user = factory_user_model()
+    org = factory_org_model()
+    monkeypatch.setitem(app.config, 'AUTH_CACHE_TTL', 60)
+    shared_cache = authorization_service._get_shared_cache()  # pylint: disable=protected-access
+    shared_cache.set('key', 'value')
+
+    membership = MembershipModel(user_id=user.id, org_id=org.id, membership_type_code=MEMBER,
+                                 membership_type_status=1)
+    session.add(membership)
+    session.flush()
+    assert shared_cache.get('key', None) == 'value'
+
+    session.commit()
+    assert shared_cache.get('key', None) is None
+
+
+def test_uncommitted_changes_are_not_shared(session, app, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that lookups after an uncommitted membership change skip the shared cache, which a rollback clears."""
+    user = factory_user_model()
+    org = factory_org_model()
+    monkeypatch.setitem(app.config, 'AUTH_CACHE_TTL', 60)
+    shared_cache = authorization_service._get_shared_cache()  # pylint: disable=protected-access
+    shared_cache.set('key', 'value')
+
+    session.add(MembershipModel(user_id=user.id, org_id=org.id, membership_type_code=MEMBER,
+                                membership_type_status=1))
+    session.flush()
+    assert authorization_service._get_cached_authorization(  # pylint: disable=protected-access
+        ('uncommitted',), lambda: 'loaded') == 'loaded'
+    assert shared_cache.get(('uncommitted',), None) is None
+
+    session.rollback()
+    assert shared_cache.get('key', None) is None
+    assert not session.info.get(authorization_service._AUTHORIZATIONS_CHANGED)  # pylint: disable=protected-access
@@ -0,0 +1,129 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to verify the Bulk User Job Service.
+
+Test-Suite to ensure that the Bulk User Job Service is working as expected.
+"""
+import datetime
+
+import pytest
+
+from auth_api.exceptions import BusinessException
+from auth_api.exceptions.errors import Error
+from auth_api.models import BulkUserJob as BulkUserJobModel
+from auth_api.models import Membership as MembershipModel
+from auth_api.services import BulkUserJob as BulkUserJobService
+from auth_api.services.bulk_user_job import InlineExecutor
+from auth_api.utils.constants import IdpHint
+from auth_api.utils.enums import BulkUserJobStatus
+from auth_api.utils.roles import MEMBER
+
+from tests.utilities.factory_scenarios import TestAnonymousMembership, TestOrgInfo
+from tests.utilities.factory_utils import factory_org_model
+
+
+@pytest.fixture()
+def bulk_auth_mock(monkeypatch):
+    """Mock check_auth for the bulk user services."""
+    monkeypatch.setattr('auth_api.services.user.check_auth', lambda *args, **kwargs: None)
+    monkeypatch.setattr('auth_api.services.bulk_user_job.check_auth', lambda *args, **kwargs: None)
+    BulkUserJobService.set_executor(InlineExecutor())
+
+
+def test_submit_job(app, session, bulk_auth_mock, keycloak_mock, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that a submitted job provisions all users in chunks and keeps the results in request order."""
+    monkeypatch.setitem(app.config, 'BULK_USER_JOB_CHUNK_SIZE', 2)
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    users = [TestAnonymousMembership.generate_random_user(MEMBER) for _ in range(3)]
+
+    job = BulkUserJobService.submit({'users': users, 'orgId': org.id})
+    dictionary = BulkUserJobService.find_by_id(job.identifier).as_dict()
+
+    assert dictionary['status'] == BulkUserJobStatus.COMPLETED.value
+    assert dictionary['total'] == 3
+    assert dictionary['processed'] == 3
+    assert [user['username'] for user in dictionary['users']] == \
+        [IdpHint.BCROS.value + '/' + user['username'] for user in users]
+    assert all(user['http_status'] == 201 for user in dictionary['users'])
+    assert len(MembershipModel.find_members_by_org_id(org.id)) == 3
+    # The users are not kept once the job has finished.
+    assert BulkUserJobModel.find_by_id(job.identifier).users is None
+
+
+def test_submit_job_does_not_save_passwords(app, session, bulk_auth_mock, keycloak_mock,
+                                            monkeypatch):  # pylint:disable=unused-argument
+    """Assert that the users saved with a job have no passwords, and that a failed job does not keep them."""
+    saved_users = []
+    monkeypatch.setattr('auth_api.services.user.User.provision_users', lambda *args: (
+        saved_users.extend(BulkUserJobModel.query.one().users), 1 / 0))
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    users = [TestAnonymousMembership.generate_random_user(MEMBER) for _ in range(2)]
+
+    job = BulkUserJobService.submit({'users': users, 'orgId': org.id})
+
+    assert [user['username'] for user in saved_users] == [user['username'] for user in users]
+    assert all('password' not in user for user in saved_users)
+    job = BulkUserJobModel.find_by_id(job.identifier)
+    assert job.status == BulkUserJobStatus.FAILED.value
+    assert job.users is None
+
+
+def test_fail_abandoned_job(session, bulk_auth_mock, keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that a job left running by a worker which went away is failed by the sweeper, not resumed by a poll."""
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    users = [{'username': 'first'}, {'username': 'second'}]
+    job = BulkUserJobModel(org_id=org.id, status=BulkUserJobStatus.RUNNING.value, total=2, processed=1,
+                           users=users, results=[{'username': 'bcros/first', 'http_status': 201, 'error': ''}],
+                           owner='gone:1', heartbeat=datetime.datetime.now() - datetime.timedelta(days=1))
+    job.save()
+
+    assert BulkUserJobService.find_by_id(job.id).as_dict()['status'] == BulkUserJobStatus.RUNNING.value
+
+    assert BulkUserJobService.fail_abandoned_jobs(10) == 1
+    dictionary = BulkUserJobService.find_by_id(job.id).as_dict()
+    assert dictionary['status'] == BulkUserJobStatus.FAILED.value
+    assert dictionary['processed'] == 2
+    assert dictionary['users'][0]['http_status'] == 201
+    assert dictionary['users'][1] == {'username': 'second',
+                                      'http_status': Error.BULK_USER_JOB_INTERRUPTED.value[1],
+                                      'error': Error.BULK_USER_JOB_INTERRUPTED.value[0]}
+    assert BulkUserJobModel.find_by_id(job.id).users is None
+    # The job is claimed only once.
+    assert BulkUserJobService.fail_abandoned_jobs(10) == 0
+
+
+def test_sweep_renews_held_jobs(session, bulk_auth_mock):  # pylint:disable=unused-argument
+    """Assert that the sweeper keeps the jobs still queued in this process alive rather than failing them."""
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    stale = datetime.datetime.now() - datetime.timedelta(days=1)
+    job = BulkUserJobModel(org_id=org.id, status=BulkUserJobStatus.PENDING.value, total=1, processed=0,
+                           users=[{'username': 'queued'}], results=[],
+                           owner=BulkUserJobService._get_owner(), heartbeat=stale)  # pylint: disable=protected-access
+    job.save()
+    BulkUserJobService._held_jobs.add(job.id)  # pylint: disable=protected-access
+    try:
+        assert BulkUserJobService.sweep(10) == 0
+    finally:
+        BulkUserJobService._held_jobs.discard(job.id)  # pylint: disable=protected-access
+
+    job = BulkUserJobModel.find_by_id(job.id)
+    assert job.status == BulkUserJobStatus.PENDING.value
+    assert job.heartbeat > stale
+
+
+def test_find_job_not_found(session, bulk_auth_mock):  # pylint:disable=unused-argument
+    """Assert that polling an unknown job raises not found."""
+    with pytest.raises(BusinessException) as exception:
+        BulkUserJobService.find_by_id(0)
+    assert exception.value.code == Error.DATA_NOT_FOUND.name
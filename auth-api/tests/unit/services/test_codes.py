@@ -77,8 +77,23 @@ def test_fetch_codes_not_found(session):  # pylint: disable=unused-argument
 def test_fetch_codes_with_exception(session):  # pylint: disable=unused-argument
     """Assert that code type details can not be fetch by table name."""
     code_type = 'membership_type'
+    # Serialize the codes again, rather than returning the codes serialized by an earlier test.
+    CodesService.reload()
     with patch.object(importlib, 'import_module', side_effect=Exception(Error.UNDEFINED_ERROR, None)):
         with pytest.raises(BusinessException) as exception:
             CodesService.fetch_codes(code_type)
 
         assert exception.value.code == 'UNDEFINED_ERROR'
+
+
+def test_fetch_codes_snapshot(session):  # pylint: disable=unused-argument
+    """Assert that the codes are serialized once and served from memory until reloaded."""
+    code_type = 'membership_type'
+    CodesService.reload()
+    data = CodesService.fetch_codes(code_type)
+
+    with patch.object(importlib, 'import_module', side_effect=Exception(Error.UNDEFINED_ERROR, None)):
+        assert CodesService.fetch_codes(code_type) is data
+
+    CodesService.reload()
+    assert CodesService.fetch_codes(code_type) == data
@@ -0,0 +1,122 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Email Dispatcher service.
+
+Test suite to ensure that the emails saved to the outbox are sent, retried and given up on as expected.
+"""
+import datetime
+from unittest.mock import patch
+
+from auth_api.models import EmailOutbox as EmailOutboxModel
+from auth_api.models import db
+from auth_api.services import EmailDispatcher
+from auth_api.services import notification
+from auth_api.utils.enums import EmailOutboxStatus
+
+
+def _queue_email(recipients='recipient@gov.bc.ca'):
+    notification.send_email('Subject', 'sender@gov.bc.ca', recipients, '<html></html>')
+    return EmailOutboxModel.query.filter_by(recipients=recipients).one()
+
+
+def test_send_email_queues(session):  # pylint:disable=unused-argument
+    """Assert that send_email saves the email to the outbox rather than calling notify-api."""
+    with patch.object(notification, 'deliver_email') as deliver:
+        email = _queue_email()
+    deliver.assert_not_called()
+    assert email.status == EmailOutboxStatus.PENDING.value
+    assert email.attempts == 0
+
+
+def test_dispatch_sends_due_emails(session):  # pylint:disable=unused-argument
+    """Assert that the dispatcher sends the due emails and marks them sent."""
+    email = _queue_email()
+    with patch('auth_api.services.email_dispatcher.deliver_email', return_value=True) as deliver:
+        assert EmailDispatcher.dispatch_pending() == 1
+        assert EmailDispatcher.dispatch_pending() == 0
+    deliver.assert_called_once_with('Subject', 'recipient@gov.bc.ca', '<html></html>')
+    email = EmailOutboxModel.find_by_id(email.id)
+    assert email.status == EmailOutboxStatus.SENT.value
+    assert email.sent_at is not None
+
+
+def test_dispatch_retries_failed_emails(session, app):  # pylint:disable=unused-argument
+    """Assert that a failed email is retried later, and given up on after the maximum attempts."""
+    email = _queue_email()
+    with patch('auth_api.services.email_dispatcher.deliver_email', side_effect=Exception('notify-api is down')):
+        EmailDispatcher.dispatch_pending()
+        email = EmailOutboxModel.find_by_id(email.id)
+        assert email.status == EmailOutboxStatus.PENDING.value
+        assert email.attempts == 1
+        assert email.last_error == 'notify-api is down'
+        assert email.next_attempt_at > datetime.datetime.now()
+
+        # Not due again until the retry delay has passed
+        assert EmailDispatcher.dispatch_pending() == 0
+
+        email.attempts = app.config['EMAIL_OUTBOX_MAX_ATTEMPTS'] - 1
+        email.next_attempt_at = datetime.datetime.now()
+        email.save()
+        EmailDispatcher.dispatch_pending()
+
+    email = EmailOutboxModel.find_by_id(email.id)
+    assert email.status == EmailOutboxStatus.FAILED.value
+
+
+def test_claimed_emails_are_leased(session, app):  # pylint:disable=unused-argument
+    """Assert that claimed emails are hidden from other dispatchers until their lease runs out."""
+    email = _queue_email()
+    claimed = EmailOutboxModel.claim_due(10, app.config['EMAIL_OUTBOX_LEASE_SECONDS'])
+    assert [row.id for row in claimed] == [email.id]
+
+    with patch('auth_api.services.email_dispatcher.deliver_email', return_value=True) as deliver:
+        assert EmailDispatcher.dispatch_pending() == 0
+    deliver.assert_not_called()
+    email = EmailOutboxModel.find_by_id(email.id)
+    assert email.status == EmailOutboxStatus.PENDING.value
+    assert email.next_attempt_at > datetime.datetime.now()
+
+
+def test_dispatch_skips_emails_taken_over(session):  # pylint:disable=unused-argument
+    """Assert that an email whose lease ran out during the batch and was claimed again is left to its new dispatcher."""
+    first = _queue_email('first@gov.bc.ca')
+    second = _queue_email('second@gov.bc.ca')
+    table = EmailOutboxModel.__table__
+
+    def take_over_second(*args):  # pylint:disable=unused-argument
+        db.session.execute(table.update().where(table.c.id == second.id)
+                           .values(next_attempt_at=datetime.datetime.now() + datetime.timedelta(minutes=5)))
+        db.session.commit()
+        return True
+
+    with patch('auth_api.services.email_dispatcher.deliver_email', side_effect=take_over_second) as deliver:
+        EmailDispatcher.dispatch_pending()
+    deliver.assert_called_once_with('Subject', 'first@gov.bc.ca', '<html></html>')
+    assert EmailOutboxModel.find_by_id(first.id).status == EmailOutboxStatus.SENT.value
+    second = EmailOutboxModel.find_by_id(second.id)
+    assert second.status == EmailOutboxStatus.PENDING.value
+    assert second.attempts == 0
+
+
+def test_results_need_the_current_lease(session, app):  # pylint:disable=unused-argument
+    """Assert that a dispatcher whose lease was renewed by another cannot renew it or record a result."""
+    email = _queue_email()
+    lease_seconds = app.config['EMAIL_OUTBOX_LEASE_SECONDS']
+    stale_lease = EmailOutboxModel.claim_due(10, lease_seconds)[0].next_attempt_at
+
+    assert EmailOutboxModel.renew_lease(email.id, stale_lease, lease_seconds) is not None
+    assert EmailOutboxModel.renew_lease(email.id, stale_lease, lease_seconds) is None
+    assert not EmailOutboxModel.mark_sent(email.id, stale_lease)
+    assert not EmailOutboxModel.mark_failed(email.id, stale_lease, None, 'notify-api is down')
+    assert EmailOutboxModel.find_by_id(email.id).status == EmailOutboxStatus.PENDING.value
@@ -25,8 +25,10 @@ import auth_api.services.authorization as auth
 import auth_api.services.notification as notification
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
+from auth_api.models import EmailOutbox as EmailOutboxModel
 from auth_api.models import Invitation as InvitationModel
 from auth_api.models import InvitationStatus as InvitationStatusModel
+from auth_api.services import EmailDispatcher
 from auth_api.services import Invitation as InvitationService
 from auth_api.services import Membership as MembershipService
 from auth_api.services import Org as OrgService
@@ -253,8 +255,8 @@ def test_get_invitations_by_org_id(session, auth_mock, keycloak_mock):  # pylint
         assert len(invitations) == 1
 
 
-def test_send_invitation_exception(session, notify_mock, keycloak_mock):  # pylint:disable=unused-argument
-    """Send an existing invitation with exception."""
+def test_send_invitation_queues_email(session, keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that the invitation email is queued to the outbox, leaving the invitation pending."""
     user = factory_user_model(TestUserInfo.user_test)
     user_dictionary = User(user).as_dict()
     org = OrgService.create_org(TestOrgInfo.org1, user_id=user.id)
@@ -264,8 +266,28 @@ def test_send_invitation_exception(session, notify_mock, keycloak_mock):  # pyli
 
     invitation = InvitationModel.create_from_dict(invitation_info, user.id, 'STANDARD')
 
-    with patch.object(notification, 'send_email', return_value=False):
-        with pytest.raises(BusinessException) as exception:
-            InvitationService.send_invitation(invitation, org_dictionary['name'], user_dictionary, '')
+    with patch.object(notification, 'deliver_email') as deliver:
+        InvitationService.send_invitation(invitation, org_dictionary['name'], user_dictionary, '')
+
+    deliver.assert_not_called()
+    email = EmailOutboxModel.query.filter_by(recipients=invitation.recipient_email).one()
+    assert email.invitation_id == invitation.id
+    assert invitation.invitation_status_code == 'PENDING'
+
+
+def test_send_invitation_email_given_up_marks_failed(session, app, keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that the invitation is marked FAILED once the email dispatcher gives up on its email."""
+    user = factory_user_model(TestUserInfo.user_test)
+    org = OrgService.create_org(TestOrgInfo.org1, user_id=user.id)
+    org_dictionary = org.as_dict()
+
+    invitation = InvitationModel.create_from_dict(factory_invitation(org_dictionary['id']), user.id, 'STANDARD')
+    InvitationService.send_invitation(invitation, org_dictionary['name'], User(user).as_dict(), '')
+
+    email = EmailOutboxModel.query.filter_by(invitation_id=invitation.id).one()
+    email.attempts = app.config['EMAIL_OUTBOX_MAX_ATTEMPTS'] - 1
+    email.save()
+    with patch('auth_api.services.email_dispatcher.deliver_email', return_value=False):
+        EmailDispatcher.dispatch_pending()
 
-    assert exception.value.code == Error.FAILED_INVITATION.name
+    assert InvitationModel.find_invitation_by_id(invitation.id).invitation_status_code == 'FAILED'
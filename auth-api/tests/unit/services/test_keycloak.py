@@ -20,6 +20,7 @@ Test-Suite to ensure that the Business Service is working as expected.
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
 from auth_api.services.keycloak import KeycloakService
+from auth_api.services.keycloak_admin_client import KeycloakAdminClient
 from auth_api.utils.constants import BCSC, BCROS, GROUP_ACCOUNT_HOLDERS, GROUP_ANONYMOUS_USERS, GROUP_PUBLIC_USERS, \
     STAFF
 from auth_api.utils.roles import Role
@@ -222,3 +223,20 @@ def test_remove_from_account_holders_group(session):
     for group in user_groups:
         groups.append(group.get('name'))
     assert GROUP_ACCOUNT_HOLDERS not in groups
+
+
+def test_keycloak_admin_client_reuses_token_and_group_id(session):
+    """Assert that the admin client reuses the admin token and the group id between calls."""
+    client = KeycloakAdminClient.get_instance()
+    assert client is KeycloakAdminClient.get_instance()
+
+    admin_token = client.get_admin_token()
+    assert admin_token
+    assert client.get_admin_token() == admin_token
+
+    group_id = client.get_group_id(GROUP_ACCOUNT_HOLDERS)
+    assert group_id
+    assert client.get_group_id(GROUP_ACCOUNT_HOLDERS) == group_id
+
+    client.invalidate_token()
+    assert client.get_admin_token()
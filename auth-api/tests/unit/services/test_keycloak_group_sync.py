@@ -0,0 +1,87 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Keycloak Group Sync service.
+
+Test suite to ensure that keycloak group changes are recorded, deduplicated and applied in the background.
+"""
+import uuid
+from unittest.mock import patch
+
+from auth_api.models import KeycloakGroupSync as KeycloakGroupSyncModel
+from auth_api.services import KeycloakGroupSync
+from auth_api.services.keycloak import KeycloakService
+from auth_api.utils.constants import GROUP_ACCOUNT_HOLDERS
+
+
+def test_changes_are_deduplicated(session):  # pylint:disable=unused-argument
+    """Assert that repeated changes for a user leave only the last one to apply."""
+    keycloak_guid = uuid.uuid4()
+    KeycloakGroupSync.join_account_holders_group(keycloak_guid)
+    KeycloakGroupSync.remove_from_account_holders_group(keycloak_guid)
+    KeycloakGroupSync.join_account_holders_group(keycloak_guid)
+
+    row = KeycloakGroupSyncModel.find_by_guid(keycloak_guid, GROUP_ACCOUNT_HOLDERS)
+    assert row.member
+    assert row.version == 3
+
+    with patch.object(KeycloakService, 'add_user_to_group') as add, \
+            patch.object(KeycloakService, 'remove_user_from_group') as remove:
+        assert KeycloakGroupSync.reconcile() == 1
+        assert KeycloakGroupSync.reconcile() == 0
+    add.assert_called_once_with(str(keycloak_guid), GROUP_ACCOUNT_HOLDERS)
+    remove.assert_not_called()
+
+    session.expire_all()
+    row = KeycloakGroupSyncModel.find_by_guid(keycloak_guid, GROUP_ACCOUNT_HOLDERS)
+    assert row.applied_member
+    assert row.next_attempt_at is None
+
+
+def test_no_op_changes_are_skipped(session):  # pylint:disable=unused-argument
+    """Assert that a change back to the membership already applied is not sent to keycloak."""
+    keycloak_guid = uuid.uuid4()
+    KeycloakGroupSync.join_account_holders_group(keycloak_guid)
+    with patch.object(KeycloakService, 'add_user_to_group'):
+        KeycloakGroupSync.reconcile()
+
+    KeycloakGroupSync.join_account_holders_group(keycloak_guid)
+    KeycloakGroupSync.remove_from_account_holders_group(keycloak_guid)
+    KeycloakGroupSync.join_account_holders_group(keycloak_guid)
+
+    with patch.object(KeycloakService, 'add_user_to_group') as add:
+        assert KeycloakGroupSync.reconcile() == 0
+    add.assert_not_called()
+
+
+def test_failed_changes_are_retried(session, app):  # pylint:disable=unused-argument
+    """Assert that a change keycloak rejects is retried later, until the retries are used up."""
+    keycloak_guid = uuid.uuid4()
+    KeycloakGroupSync.remove_from_account_holders_group(keycloak_guid)
+
+    with patch.object(KeycloakService, 'remove_user_from_group', side_effect=Exception('keycloak is down')):
+        assert KeycloakGroupSync.reconcile() == 1
+        # Not due again until the retry delay has passed
+        assert KeycloakGroupSync.reconcile() == 0
+
+    session.expire_all()
+    row = KeycloakGroupSyncModel.find_by_guid(keycloak_guid, GROUP_ACCOUNT_HOLDERS)
+    assert row.attempts == 1
+    assert row.last_error == 'keycloak is down'
+    assert row.applied_member is None
+    assert row.next_attempt_at is not None
+
+    # Requesting the same change again does not reset a change which is still being retried
+    KeycloakGroupSync.remove_from_account_holders_group(keycloak_guid)
+    session.expire_all()
+    assert KeycloakGroupSyncModel.find_by_guid(keycloak_guid, GROUP_ACCOUNT_HOLDERS).attempts == 1
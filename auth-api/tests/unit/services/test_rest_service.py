@@ -0,0 +1,77 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to verify the Rest Service.
+
+Test-Suite to ensure that the Rest Service pools connections and fails fast for unhealthy hosts.
+"""
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import ConnectionError as ReqConnectionError
+from requests.exceptions import RetryError
+
+from auth_api.exceptions import ServiceUnavailableException
+from auth_api.services.rest_service import RestService
+
+
+def test_circuit_opens_for_unhealthy_host(app, monkeypatch):
+    """Assert that calls to a host fail fast once it has failed the configured number of times."""
+    monkeypatch.setitem(app.config, 'REST_SERVICE_FAILURE_THRESHOLD', 2)
+    with app.app_context():
+        RestService.reset()
+        with patch('requests.Session.request', side_effect=ReqConnectionError('refused')) as mock_request:
+            for _ in range(3):
+                with pytest.raises(ServiceUnavailableException):
+                    RestService.get('http://unhealthy.host/api/v1/resource')
+            assert mock_request.call_count == 2
+
+        metrics = RestService.get_metrics()['http://unhealthy.host']
+        assert metrics['errors'] == 2
+        assert metrics['rejected'] == 1
+        assert metrics['circuitState'] == 'OPEN'
+        RestService.reset()
+
+
+def test_failed_trial_call_reopens_circuit(app, monkeypatch):
+    """Assert that a trial call failing with any error opens the circuit again instead of leaving it half open."""
+    monkeypatch.setitem(app.config, 'REST_SERVICE_FAILURE_THRESHOLD', 1)
+    monkeypatch.setitem(app.config, 'REST_SERVICE_RESET_TIMEOUT', 0)
+    with app.app_context():
+        RestService.reset()
+        with patch('requests.Session.request', side_effect=ReqConnectionError('refused')):
+            with pytest.raises(ServiceUnavailableException):
+                RestService.get('http://flaky.host/api/v1/resource')
+        assert RestService.get_metrics()['http://flaky.host']['circuitState'] == 'OPEN'
+
+        with patch('requests.Session.request', side_effect=RetryError('too many 404 error responses')):
+            with pytest.raises(RetryError):
+                RestService.get('http://flaky.host/api/v1/resource', retry_on_failure=True)
+        assert RestService.get_metrics()['http://flaky.host']['circuitState'] == 'OPEN'
+
+        # With the circuit open again, the next trial call is let through once the reset timeout has passed.
+        with patch('requests.Session.request', side_effect=RetryError('too many 404 error responses')) as mock_request:
+            with pytest.raises(RetryError):
+                RestService.get('http://flaky.host/api/v1/resource', retry_on_failure=True)
+            assert mock_request.call_count == 1
+        RestService.reset()
+
+
+def test_endpoint_timeout(app, monkeypatch):
+    """Assert that the longest matching url prefix decides the timeout."""
+    monkeypatch.setitem(app.config, 'REST_SERVICE_TIMEOUTS', {'http://host': 5, 'http://host/slow': 30})
+    monkeypatch.setitem(app.config, 'CONNECT_TIMEOUT', 10)
+    with app.app_context():
+        assert RestService._get_timeout('http://host/slow/report') == 30
+        assert RestService._get_timeout('http://host/fast') == 5
+        assert RestService._get_timeout('http://other/fast') == 10
@@ -19,6 +19,7 @@ Test-Suite to ensure that the User Service is working as expected.
 from unittest.mock import patch
 
 import pytest
+from requests.exceptions import ConnectionError as ReqConnectionError
 
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
@@ -138,7 +139,7 @@ def test_create_user_and_add_transaction_membership(session, auth_mock,
     """Assert transactions works fine."""
     org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
     membership = [TestAnonymousMembership.generate_random_user(OWNER)]
-    with patch('auth_api.models.Membership.flush', side_effect=Exception('mocked error')):
+    with patch('auth_api.models.Membership.bulk_insert', side_effect=Exception('mocked error')):
         users = UserService.create_user_and_add_membership(membership, org.id, single_mode=True)
 
     user_name = IdpHint.BCROS.value + '/' + membership[0]['username']
@@ -162,7 +163,7 @@ def test_create_user_and_add_transaction_membership_1(session, auth_mock,
     """Assert transactions works fine."""
     org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
     membership = [TestAnonymousMembership.generate_random_user(OWNER)]
-    with patch('auth_api.models.User.flush', side_effect=Exception('mocked error')):
+    with patch('auth_api.models.User.bulk_insert', side_effect=Exception('mocked error')):
         users = UserService.create_user_and_add_membership(membership, org.id, single_mode=True)
 
     user_name = IdpHint.BCROS.value + '/' + membership[0]['username']
@@ -306,6 +307,56 @@ def test_create_user_and_add_membership_admin_bulk_mode_multiple(session, auth_m
     assert len(members) == 3
 
 
+def test_create_user_and_add_membership_admin_bulk_mode_duplicate(session, auth_mock,
+                                                                  keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that a username repeated in the same request is created once and reported as taken after that."""
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    user = factory_user_model()
+    factory_membership_model(user.id, org.id)
+    claims = TestJwtClaims.get_test_real_user(user.keycloak_guid)
+    new_member = TestAnonymousMembership.generate_random_user(MEMBER)
+    membership = [new_member, dict(new_member)]
+    users = UserService.create_user_and_add_membership(membership, org.id, token_info=claims)
+
+    assert len(users['users']) == 2
+    assert users['users'][0]['http_status'] == 201
+    assert users['users'][0]['username'] == IdpHint.BCROS.value + '/' + new_member['username']
+    assert users['users'][1]['http_status'] == 409
+    assert users['users'][1]['error'] == 'The username is already taken'
+
+    members = MembershipModel.find_members_by_org_id(org.id)
+    assert len(members) == 2
+
+
+def test_create_user_and_add_membership_admin_bulk_mode_keycloak_error(session, auth_mock,
+                                                                       keycloak_mock):  # pylint:disable=unused-argument
+    """Assert that a keycloak connection error fails only its own user and the other users are still added."""
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    user = factory_user_model()
+    factory_membership_model(user.id, org.id)
+    claims = TestJwtClaims.get_test_real_user(user.keycloak_guid)
+    membership = [TestAnonymousMembership.generate_random_user(MEMBER),
+                  TestAnonymousMembership.generate_random_user(MEMBER)]
+    add_user = KeycloakService.add_user
+
+    def add_user_or_fail(create_user_request, **kwargs):
+        if create_user_request.user_name == membership[1]['username']:
+            raise ReqConnectionError('keycloak unreachable')
+        return add_user(create_user_request, **kwargs)
+
+    with patch.object(KeycloakService, 'add_user', side_effect=add_user_or_fail):
+        users = UserService.create_user_and_add_membership(membership, org.id, token_info=claims)
+
+    assert len(users['users']) == 2
+    assert users['users'][0]['http_status'] == 201
+    assert users['users'][0]['username'] == IdpHint.BCROS.value + '/' + membership[0]['username']
+    assert users['users'][1]['http_status'] == 500
+    assert users['users'][1]['error'] == 'Adding User Failed'
+
+    members = MembershipModel.find_members_by_org_id(org.id)
+    assert len(members) == 2
+
+
 def test_create_user_and_add_membership_member_error_skip_auth_mode(session, auth_mock,
                                                                     keycloak_mock):  # pylint:disable=unused-argument
     """Assert that an member cannot be added as anonymous in single_mode mode."""
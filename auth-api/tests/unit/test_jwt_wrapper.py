@@ -0,0 +1,101 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the caching JwtManager.
+
+Test-Suite to ensure that verified claims are cached until the token expires and that a missing key refreshes the JWKS.
+"""
+import time
+
+from flask import Flask, g
+
+from auth_api.jwt_wrapper import CachingJwtManager
+from config import get_named_config
+from tests.utilities.factory_scenarios import JWT_HEADER, TestJwtClaims
+
+
+def _create_app(manager: CachingJwtManager):
+    """Return an app with one endpoint which requires a verified token."""
+    app = Flask(__name__)
+    app.config.from_object(get_named_config('testing'))
+    app.config['JWT_ROLE_CALLBACK'] = lambda claims: claims['realm_access']['roles']
+    manager.init_app(app)
+
+    @app.route('/claims')
+    @manager.requires_auth
+    def claims():  # pylint: disable=unused-variable
+        return dict(g.jwt_oidc_token_info)
+
+    return app
+
+
+def test_claims_cached():
+    """Assert that a token is verified once and its claims are then read from the cache."""
+    manager = CachingJwtManager()
+    client = _create_app(manager).test_client()
+    token = manager.create_jwt(claims=TestJwtClaims.public_user_role, header=JWT_HEADER)
+    headers = {'Authorization': 'Bearer ' + token}
+
+    first = client.get('/claims', headers=headers)
+    second = client.get('/claims', headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json == second.json
+    assert first.json['sub'] == TestJwtClaims.public_user_role['sub']
+    metrics = manager.get_metrics()
+    assert metrics['misses'] == 1
+    assert metrics['hits'] == 1
+    assert metrics['cachedTokens'] == 1
+
+
+def test_claims_cached_until_expiry():
+    """Assert that claims are not cached past the expiry of the token."""
+    manager = CachingJwtManager()
+    client = _create_app(manager).test_client()
+    claims = dict(TestJwtClaims.public_user_role, exp=int(time.time()) + 1)
+    headers = {'Authorization': 'Bearer ' + manager.create_jwt(claims=claims, header=JWT_HEADER)}
+
+    assert client.get('/claims', headers=headers).status_code == 200
+    time.sleep(2.5)
+
+    assert client.get('/claims', headers=headers).status_code == 401
+    assert manager.get_metrics()['hits'] == 0
+
+
+def test_invalid_token_not_cached():
+    """Assert that a token which fails verification is not cached."""
+    manager = CachingJwtManager()
+    client = _create_app(manager).test_client()
+    token = manager.create_jwt(claims=TestJwtClaims.public_user_role, header=JWT_HEADER)
+    headers = {'Authorization': 'Bearer ' + token[:-4] + 'abcd'}
+
+    assert client.get('/claims', headers=headers).status_code == 401
+    assert client.get('/claims', headers=headers).status_code == 401
+    assert manager.get_metrics()['cachedTokens'] == 0
+
+
+def test_jwks_refreshed_on_key_miss(monkeypatch):
+    """Assert that a token signed with a key which is not in the JWKS refreshes it in the background."""
+    manager = CachingJwtManager()
+    app = _create_app(manager)
+    jwks = app.config['JWT_OIDC_TEST_KEYS']
+    token = manager.create_jwt(claims=TestJwtClaims.public_user_role, header=JWT_HEADER)
+    manager.jwt_oidc_test_mode = False
+    manager.algorithms = ['RS256']
+    monkeypatch.setattr(manager, '_fetch_jwks_from_url', lambda: jwks)
+    manager._jwks = {'keys': []}  # pylint: disable=protected-access
+
+    response = app.test_client().get('/claims', headers={'Authorization': 'Bearer ' + token})
+
+    assert response.status_code == 200
+    assert manager.get_metrics()['jwksRefreshes'] == 1
@@ -0,0 +1,54 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the in-memory TTL cache.
+
+Test-Suite to ensure that the cache expires and evicts entries as expected.
+"""
+from auth_api.utils.cache import TTLCache
+
+
+def test_cache_get_set():
+    """Assert that a stored value can be read back."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    assert cache.get('b', 'missing') == 'missing'
+
+
+def test_cache_expiry():
+    """Assert that an expired entry is not returned."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 1, ttl=0)
+    assert cache.get('a') is None
+
+
+def test_cache_lru_eviction():
+    """Assert that the least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_cache_disabled():
+    """Assert that a cache with no size stores nothing."""
+    cache = TTLCache(max_size=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
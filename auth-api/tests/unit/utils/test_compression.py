@@ -0,0 +1,89 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the response compression.
+
+Test-Suite to ensure that responses are compressed with the negotiated encoding as expected.
+"""
+import gzip
+import json
+
+import brotli
+import pytest
+from flask import Flask, Response, jsonify
+
+from auth_api.utils import compression
+
+
+@pytest.fixture(name='compressed_client')
+def compressed_client_fixture():
+    """Return a test client for an app with a small, a large and a streamed JSON response."""
+    app = Flask(__name__)
+    app.config.update(RESPONSE_COMPRESSION_MIN_SIZE=1024, RESPONSE_COMPRESSION_STREAM_SIZE=64 * 1024)
+    compression.init_app(app)
+
+    @app.route('/small')
+    def small():  # pylint: disable=unused-variable
+        return jsonify({'members': []})
+
+    @app.route('/large')
+    def large():  # pylint: disable=unused-variable
+        response = jsonify({'members': [{'id': i, 'membershipTypeCode': 'MEMBER'} for i in range(100)]})
+        response.set_etag('members')
+        return response
+
+    @app.route('/huge')
+    def huge():  # pylint: disable=unused-variable
+        return jsonify({'members': [{'id': i, 'membershipTypeCode': 'MEMBER'} for i in range(10000)]})
+
+    @app.route('/stream')
+    def stream():  # pylint: disable=unused-variable
+        return Response((json.dumps({'id': i}) for i in range(100)), mimetype='application/json')
+
+    return app.test_client()
+
+
+def test_negotiated_encoding(compressed_client):
+    """Assert that the preferred encoding the client accepts is used, and the entity tag is made weak."""
+    rv = compressed_client.get('/large', headers={'Accept-Encoding': 'gzip, br'})
+    assert rv.headers['Content-Encoding'] == 'br'
+    assert rv.headers['ETag'] == 'W/"members"'
+    assert 'Accept-Encoding' in rv.headers['Vary']
+    assert len(json.loads(brotli.decompress(rv.data))['members']) == 100
+
+    rv = compressed_client.get('/large', headers={'Accept-Encoding': 'gzip;q=1.0, br;q=0.5'})
+    assert rv.headers['Content-Encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(rv.data))['members']) == 100
+
+    rv = compressed_client.get('/large', headers={'Accept-Encoding': 'br;q=0'})
+    assert 'Content-Encoding' not in rv.headers
+    assert rv.headers['ETag'] == '"members"'
+
+
+def test_small_response_not_compressed(compressed_client):
+    """Assert that a response below the minimum size is sent as is."""
+    rv = compressed_client.get('/small', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in rv.headers
+    assert rv.json == {'members': []}
+
+
+def test_large_and_streamed_responses_compressed_in_chunks(compressed_client):
+    """Assert that large and streamed responses are compressed as they are sent, without a content length."""
+    rv = compressed_client.get('/huge', headers={'Accept-Encoding': 'gzip'})
+    assert rv.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in rv.headers
+    assert len(json.loads(gzip.decompress(rv.data))['members']) == 10000
+
+    rv = compressed_client.get('/stream', headers={'Accept-Encoding': 'br'})
+    assert rv.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(rv.data).startswith(b'{"id": 0}{"id": 1}')
@@ -0,0 +1,65 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared email template environment.
+
+Test-Suite to ensure that the email templates are compiled once, rendered and measured as expected.
+"""
+import os
+
+from auth_api.utils.email_templates import EmailTemplates
+
+
+def test_init_app_compiles_templates(app, tmpdir):
+    """Assert that every template is compiled when the app is created and its bytecode is written to the cache."""
+    cache_dir = app.config['EMAIL_TEMPLATE_BYTECODE_CACHE_DIR']
+    app.config['EMAIL_TEMPLATE_BYTECODE_CACHE_DIR'] = str(tmpdir)
+    try:
+        EmailTemplates.init_app(app)
+        templates = [name for name in os.listdir(app.config['EMAIL_TEMPLATE_DIR']) if name.endswith('.html')]
+        assert len(os.listdir(str(tmpdir))) == len(templates)
+        assert EmailTemplates.get_template('admin_notification_email.html') is \
+            EmailTemplates.get_template('admin_notification_email.html')
+    finally:
+        app.config['EMAIL_TEMPLATE_BYTECODE_CACHE_DIR'] = cache_dir
+        EmailTemplates.reset()
+
+
+def test_writable_cache_dir_not_used(app, tmpdir):
+    """Assert that a bytecode cache directory which other users can write to is not used."""
+    os.chmod(str(tmpdir), 0o777)
+    cache_dir = app.config['EMAIL_TEMPLATE_BYTECODE_CACHE_DIR']
+    app.config['EMAIL_TEMPLATE_BYTECODE_CACHE_DIR'] = str(tmpdir)
+    try:
+        EmailTemplates.init_app(app)
+        assert not os.listdir(str(tmpdir))
+        assert 'First Last' in EmailTemplates.render('admin_notification_email.html', url='http://localhost',
+                                                     org_name='My Org', user={'firstname': 'First', 'lastname': 'Last'})
+    finally:
+        app.config['EMAIL_TEMPLATE_BYTECODE_CACHE_DIR'] = cache_dir
+        EmailTemplates.reset()
+
+
+def test_render_records_metrics(session):  # pylint:disable=unused-argument
+    """Assert that the rendered template has the context and that the render is counted."""
+    EmailTemplates.reset()
+    html = EmailTemplates.render('admin_notification_email.html', url='http://localhost', org_name='My Org',
+                                 user={'firstname': 'First', 'lastname': 'Last'},
+                                 logo_url='http://localhost/logo.png')
+    assert 'First Last' in html
+    assert 'My Org' in html
+
+    metrics = EmailTemplates.get_metrics()['admin_notification_email.html']
+    assert metrics['renders'] == 1
+    assert metrics['errors'] == 0
+    assert metrics['maxTime'] >= metrics['averageTime'] > 0
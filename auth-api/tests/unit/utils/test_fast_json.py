@@ -0,0 +1,70 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the JSON encoder backends.
+
+Test-Suite to ensure that both backends encode the API data types the same way.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+
+from auth_api.utils import fast_json
+
+
+DATA = {
+    'created': datetime.datetime(2020, 6, 1, 10, 30, 15),
+    'date': datetime.date(2020, 6, 1),
+    'keycloakGuid': uuid.UUID('6c4d7a1e-8f0b-4b4e-9b8a-2a1f1c3d5e7f'),
+    'amount': decimal.Decimal('10.25'),
+    'members': [{'id': 1, 'name': 'Ünïcode'}]
+}
+
+EXPECTED = {
+    'created': '2020-06-01T10:30:15',
+    'date': '2020-06-01',
+    'keycloakGuid': '6c4d7a1e-8f0b-4b4e-9b8a-2a1f1c3d5e7f',
+    'amount': '10.25',
+    'members': [{'id': 1, 'name': 'Ünïcode'}]
+}
+
+
+@pytest.mark.parametrize('backend', fast_json.BACKENDS)
+def test_backends_encode_api_types(backend):
+    """Assert that datetimes, dates, UUIDs and Decimals are encoded the same way by both backends."""
+    if backend == 'orjson' and fast_json.orjson is None:
+        pytest.skip('orjson is not installed')
+    assert json.loads(fast_json.dumps(DATA, backend=backend)) == EXPECTED
+
+
+def test_falls_back_for_data_orjson_cannot_encode():
+    """Assert that data with keys which are not strings is still encoded."""
+    assert json.loads(fast_json.dumps({1: 'one'}, backend='orjson')) == {'1': 'one'}
+
+
+def test_unknown_type_raises():
+    """Assert that objects of other types are not encoded silently."""
+    with pytest.raises(TypeError):
+        fast_json.dumps({'value': object()})
+
+
+def test_output_json(app):
+    """Assert that the restplus JSON representation encodes the API data types."""
+    with app.test_request_context():
+        response = fast_json.output_json(DATA, 200, {'X-Test': 'yes'})
+    assert response.status_code == 200
+    assert response.headers['X-Test'] == 'yes'
+    assert json.loads(response.get_data()) == EXPECTED
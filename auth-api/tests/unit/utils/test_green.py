@@ -0,0 +1,41 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the support for green thread workers.
+
+Test-Suite to ensure that psycopg2 is only made cooperative in a monkey patched process.
+"""
+import sys
+import types
+
+from auth_api.utils import green
+
+
+def test_not_monkey_patched(app):
+    """Assert that nothing is patched when the process is not monkey patched."""
+    assert not green.is_monkey_patched()
+    assert not green.init_app(app)
+
+
+def test_monkey_patched(app, monkeypatch):
+    """Assert that psycopg2 is made cooperative when the process is monkey patched."""
+    calls = []
+    psycogreen = types.ModuleType('psycogreen')
+    psycogreen.gevent = types.ModuleType('psycogreen.gevent')
+    psycogreen.gevent.patch_psycopg = lambda: calls.append('patched')
+    monkeypatch.setitem(sys.modules, 'psycogreen', psycogreen)
+    monkeypatch.setitem(sys.modules, 'psycogreen.gevent', psycogreen.gevent)
+    monkeypatch.setattr(green, 'is_monkey_patched', lambda: True)
+
+    assert green.init_app(app)
+    assert calls == ['patched']
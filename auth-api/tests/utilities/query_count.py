@@ -0,0 +1,53 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Query counting test helper.
+
+Test helper to assert that a block of code, e.g. a request to an endpoint, runs no more than a given number of queries.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:  # pylint: disable=too-few-public-methods
+    """Records the statements executed while it is active."""
+
+    def __init__(self):
+        """Start with no statements."""
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):  # pylint: disable=too-many-arguments
+        """Record the statement; registered as a before_cursor_execute listener."""
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        """Return the number of statements executed."""
+        return len(self.statements)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Assert that the block executes at most max_queries statements; yields the counter."""
+    counter = QueryCounter()
+    event.listen(Engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(Engine, 'before_cursor_execute', counter)
+    assert counter.count <= max_queries, \
+        '{} queries executed, expected at most {}:\n{}'.format(counter.count, max_queries,
+                                                               '\n'.join(counter.statements))
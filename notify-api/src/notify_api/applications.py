@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """ The Notify Serive. """
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
@@ -21,13 +21,15 @@ from sqlalchemy.engine import Connection, Engine, create_engine
 from starlette.exceptions import HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse
+from starlette.responses import HTMLResponse, JSONResponse, Response
 from starlette.routing import BaseRoute
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
 from notify_api.core import config as AppConfig
+from notify_api.core.compression import CompressionMiddleware
 from notify_api.core.errors import http_422_error_handler, http_error_handler, validation_exception_handler
 from notify_api.core.middleware import session_middleware
+from notify_api.core.responses import FastJSONResponse
 from notify_api.db.database import SESSION as db_session
 from notify_api.resources import ROUTER as api_router
 from notify_api.resources import ops
@@ -49,6 +51,7 @@ class NotifyAPI(FastAPI):
             openapi_prefix: str = '',
             docs_url: Optional[str] = '/docs',
             redoc_url: Optional[str] = '/redoc',
+            default_response_class: Type[Response] = FastJSONResponse,
             **extra: Dict[str, Any],
     ):  # pylint: disable=too-many-arguments
         super().__init__(
@@ -62,6 +65,7 @@ class NotifyAPI(FastAPI):
             openapi_prefix=openapi_prefix,
             docs_url=docs_url,
             redoc_url=redoc_url,
+            default_response_class=default_response_class,
             **extra
         )
         if bind is not None:
@@ -127,3 +131,13 @@ class NotifyAPI(FastAPI):
     def add_default_middleware(self) -> None:
         """ Add any default middleware """
         self.add_middleware(BaseHTTPMiddleware, dispatch=session_middleware)
+        if AppConfig.COMPRESSION_ENABLED:
+            # Added last, so it is the outermost middleware and sees the final response.
+            self.add_middleware(
+                CompressionMiddleware,
+                encodings=list(AppConfig.COMPRESSION_ENCODINGS),
+                minimum_size=AppConfig.COMPRESSION_MINIMUM_SIZE,
+                stream_size=AppConfig.COMPRESSION_STREAM_SIZE,
+                gzip_level=AppConfig.COMPRESSION_GZIP_LEVEL,
+                brotli_quality=AppConfig.COMPRESSION_BROTLI_QUALITY,
+            )
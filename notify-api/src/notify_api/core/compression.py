@@ -0,0 +1,189 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Response compression middleware, negotiated on the Accept-Encoding request header.
+
+JSON and text responses of at least minimum_size bytes are compressed with the first of the encodings the client
+accepts. Bodies below stream_size are compressed as a whole and sent with their compressed length; larger and streamed
+bodies are compressed chunk by chunk as they are sent.
+"""
+import zlib
+from typing import Optional, Sequence
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+COMPRESSIBLE_CONTENT_TYPES = ('application/json', 'text/')
+
+CHUNK_SIZE = 64 * 1024
+
+
+class GzipEncoder:
+    """Incremental gzip compression."""
+
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Return the compressed output available so far."""
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        """Return the rest of the compressed output."""
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Incremental brotli compression."""
+
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Return the compressed output available so far."""
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        """Return the rest of the compressed output."""
+        return self._compressor.finish()
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Return the encoding the client accepts with the highest quality, the first one of equal qualities."""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get('*', 0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:  # pylint: disable=too-few-public-methods
+    """ Compress the responses for clients which accept one of the encodings """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            encodings: Sequence[str] = ('br', 'gzip'),
+            minimum_size: int = 1024,
+            stream_size: int = 256 * 1024,
+            gzip_level: int = 6,
+            brotli_quality: int = 4,
+    ):  # pylint: disable=too-many-arguments
+        self.app = app
+        self.encodings = [encoding for encoding in encodings if encoding in ('br', 'gzip')]
+        self.minimum_size = minimum_size
+        self.stream_size = stream_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http' and scope.get('method') != 'HEAD':
+            encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''), self.encodings)
+            if encoding:
+                encoder = BrotliEncoder(self.brotli_quality) if encoding == 'br' else GzipEncoder(self.gzip_level)
+                responder = _CompressionResponder(self.app, encoding, encoder, self.minimum_size, self.stream_size)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:  # pylint: disable=too-many-instance-attributes
+    """ Compress the body messages of a single response """
+
+    def __init__(self, app: ASGIApp, encoding: str, encoder, minimum_size: int, stream_size: int):
+        # pylint: disable=too-many-arguments
+        self.app = app
+        self.encoding = encoding
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.stream_size = stream_size
+        self.send = None
+        self.initial_message = None
+        self.started = False
+        self.compressing = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        """ Hold the response start until the first body message shows whether to compress """
+        if message['type'] == 'http.response.start':
+            self.initial_message = message
+            return
+        if message['type'] != 'http.response.body':
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if self.started:
+            if self.compressing:
+                await self._send_chunks(body, more_body)
+            else:
+                await self.send(message)
+            return
+
+        self.started = True
+        headers = MutableHeaders(raw=self.initial_message['headers'])
+        if not self._compressible(headers) or (len(body) < self.minimum_size and not more_body):
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        self.compressing = True
+        headers['Content-Encoding'] = self.encoding
+        headers.add_vary_header('Accept-Encoding')
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            # The compressed body is not byte for byte the representation the entity tag was computed for.
+            headers['ETag'] = f'W/{etag}'
+
+        if not more_body and len(body) < self.stream_size:
+            body = self.encoder.compress(body) + self.encoder.finish()
+            headers['Content-Length'] = str(len(body))
+            await self.send(self.initial_message)
+            await self.send({'type': 'http.response.body', 'body': body})
+            return
+
+        del headers['Content-Length']
+        await self.send(self.initial_message)
+        await self._send_chunks(body, more_body)
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        content_type = headers.get('content-type', '')
+        return 'content-encoding' not in headers and content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+    async def _send_chunks(self, body: bytes, more_body: bool) -> None:
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = self.encoder.compress(body[start:start + CHUNK_SIZE])
+            if chunk:
+                await self.send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        if not more_body:
+            await self.send({'type': 'http.response.body', 'body': self.encoder.finish()})
@@ -15,7 +15,7 @@
 import random
 
 from starlette.config import Config
-from starlette.datastructures import Secret
+from starlette.datastructures import CommaSeparatedStrings, Secret
 
 
 # Config will be read from environment variables and/or '.env' files.
@@ -59,6 +59,17 @@ MAIL_FROM_ID = CONFIG('MAIL_FROM_ID', cast=str, default='abcabc@abcdabcd.com')
 # Sentry Config
 SENTRY_DSN = CONFIG('SENTRY_DSN', cast=str, default=None)
 
+# Encoder for the JSON responses: orjson, or json for the standard library module
+JSON_ENCODER_BACKEND = CONFIG('JSON_ENCODER_BACKEND', cast=str, default='orjson')
+
+# Compress JSON and text responses of at least COMPRESSION_MINIMUM_SIZE bytes for clients accepting the encodings
+COMPRESSION_ENABLED = CONFIG('COMPRESSION_ENABLED', cast=bool, default=True)
+COMPRESSION_ENCODINGS = CONFIG('COMPRESSION_ENCODINGS', cast=CommaSeparatedStrings, default='br,gzip')
+COMPRESSION_MINIMUM_SIZE = CONFIG('COMPRESSION_MINIMUM_SIZE', cast=int, default=1024)
+COMPRESSION_STREAM_SIZE = CONFIG('COMPRESSION_STREAM_SIZE', cast=int, default=262144)
+COMPRESSION_GZIP_LEVEL = CONFIG('COMPRESSION_GZIP_LEVEL', cast=int, default=6)
+COMPRESSION_BROTLI_QUALITY = CONFIG('COMPRESSION_BROTLI_QUALITY', cast=int, default=4)
+
 NATS_CLIENT_NAME = CONFIG('NATS_CLIENT_NAME', cast=str, default='notifiations.worker')
 NATS_CLUSTER_ID = CONFIG('NATS_CLUSTER_ID', cast=str, default='test-cluster')
 NATS_QUEUE = CONFIG('NATS_QUEUE', cast=str, default='notifiations-worker')
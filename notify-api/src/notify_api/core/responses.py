@@ -0,0 +1,57 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""JSON response rendered with orjson when it is installed and configured, and the json module otherwise."""
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+from notify_api.core import config as AppConfig
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def default(obj):
+    """Return a value the backends can encode, for the types they do not encode themselves."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (uuid.UUID, decimal.Decimal)):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(content: Any, backend: str = None) -> bytes:
+    """Return the compact JSON encoding of the content as UTF-8 bytes."""
+    if (backend or AppConfig.JSON_ENCODER_BACKEND) == 'orjson' and orjson is not None:
+        try:
+            return orjson.dumps(content, default=default)
+        except TypeError:
+            # orjson.JSONEncodeError is a TypeError; the json module may still encode the content.
+            pass
+    return json.dumps(content, default=default, ensure_ascii=False, allow_nan=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """ JSON response encoded with the configured encoder backend """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,93 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the response compression middleware.
+
+Test-Suite to ensure that responses are compressed with the negotiated encoding as expected.
+"""
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.testclient import TestClient
+
+from notify_api.core.compression import CompressionMiddleware, negotiate_encoding
+
+
+@pytest.fixture(name='compressed_client')
+def compressed_client_fixture():
+    """Return a test client for an app with a small, a large and a streamed JSON response."""
+    app = Starlette()
+    app.add_middleware(CompressionMiddleware, encodings=['br', 'gzip'], minimum_size=1024, stream_size=64 * 1024)
+
+    @app.route('/small')
+    async def small(_request):  # pylint: disable=unused-variable
+        return JSONResponse({'notifications': []})
+
+    @app.route('/large')
+    async def large(_request):  # pylint: disable=unused-variable
+        return JSONResponse({'notifications': [{'id': i, 'statusCode': 'PENDING'} for i in range(100)]},
+                            headers={'ETag': '"notifications"'})
+
+    @app.route('/huge')
+    async def huge(_request):  # pylint: disable=unused-variable
+        return JSONResponse({'notifications': [{'id': i, 'statusCode': 'PENDING'} for i in range(10000)]})
+
+    @app.route('/stream')
+    async def stream(_request):  # pylint: disable=unused-variable
+        return StreamingResponse((json.dumps({'id': i}) for i in range(100)), media_type='application/json')
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, br', 'br'),
+    ('gzip;q=1.0, br;q=0.5', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('*', 'br'),
+    ('identity', None),
+    ('', None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    """Assert that the accepted encoding with the highest quality is chosen."""
+    assert negotiate_encoding(accept_encoding, ['br', 'gzip']) == expected
+
+
+def test_large_response_compressed(compressed_client):
+    """Assert that a large response is compressed, with its length and a weak entity tag."""
+    rv = compressed_client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert rv.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' in rv.headers
+    assert rv.headers['ETag'] == 'W/"notifications"'
+    assert 'Accept-Encoding' in rv.headers['Vary']
+    assert len(rv.json()['notifications']) == 100
+
+
+def test_small_response_not_compressed(compressed_client):
+    """Assert that a response below the minimum size is sent as is."""
+    rv = compressed_client.get('/small', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in rv.headers
+    assert rv.json() == {'notifications': []}
+
+
+def test_huge_and_streamed_responses_compressed_in_chunks(compressed_client):
+    """Assert that huge and streamed responses are compressed as they are sent, without a content length."""
+    rv = compressed_client.get('/huge', headers={'Accept-Encoding': 'gzip'})
+    assert rv.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in rv.headers
+    assert len(rv.json()['notifications']) == 10000
+
+    rv = compressed_client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+    assert rv.headers['Content-Encoding'] == 'gzip'
+    assert rv.text.startswith('{"id": 0}{"id": 1}')
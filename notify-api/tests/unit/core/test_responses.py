@@ -0,0 +1,53 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the JSON response encoder.
+
+Test-Suite to ensure that both encoder backends encode the notification data the same way.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+
+from notify_api.core import responses
+
+
+CONTENT = {
+    'requestDate': datetime.datetime(2020, 6, 1, 10, 30, 15),
+    'id': uuid.UUID('6c4d7a1e-8f0b-4b4e-9b8a-2a1f1c3d5e7f'),
+    'amount': decimal.Decimal('10.25'),
+    'recipients': 'Ünïcode@example.com'
+}
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'json'])
+def test_backends_encode_the_same(backend):
+    """Assert that datetimes, UUIDs and Decimals are encoded the same way by both backends."""
+    if backend == 'orjson' and responses.orjson is None:
+        pytest.skip('orjson is not installed')
+    assert json.loads(responses.dumps(CONTENT, backend=backend)) == {
+        'requestDate': '2020-06-01T10:30:15',
+        'id': '6c4d7a1e-8f0b-4b4e-9b8a-2a1f1c3d5e7f',
+        'amount': '10.25',
+        'recipients': 'Ünïcode@example.com'
+    }
+
+
+def test_response_renders_content():
+    """Assert that the response body is the compact JSON encoding of the content."""
+    response = responses.FastJSONResponse({'notifications': [{'id': 1}]})
+    assert response.body == b'{"notifications":[{"id":1}]}'
+    assert response.media_type == 'application/json'